@@ -0,0 +1,5 @@
+"""Benchmark suite of the solvers
+
+    python -m benchmarks.run --output current.json
+    python -m benchmarks.compare baseline.json current.json
+"""
@@ -0,0 +1,229 @@
+"""Generated models and the registry of benchmarked operations
+
+Every case is a setup function that builds a model of n nodes (or beams,
+spans, ...) and returns the operation to time, so model generation is never
+part of the measurement.
+"""
+import subprocess
+import sys
+
+import numpy as np
+
+from structural_analysis import PointLoad, UniformlyDistributedLoad
+from structural_analysis.beam import Beam, Node
+from structural_analysis.bending_shear import BendingShearCalculator
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.influence_line import InfluenceLines
+from structural_analysis.moving_load import VehicleTrain, moving_load_envelope
+from structural_analysis.statically_determinate.solver import StaticallyDeterminateSolver
+from structural_analysis.statically_indeterminate.three_moment.solver import (
+    ThreeMomentSolver,
+    solve_three_moment_equations,
+    udl_terms,
+)
+from structural_analysis.sweep import hinge_roller_reactions, sweep
+
+SIZES = (2, 10, 100, 1_000, 10_000, 100_000)
+SEED = 546
+
+
+def continuous_beam(n: int) -> ColumnarBeam:
+    """n nodes 1 m apart with a support every 10 nodes and a udl on every member"""
+    restraints = np.zeros((n, 3), dtype=bool)
+    restraints[::10, 1] = True
+    restraints[-1, 1] = True
+    restraints[0, 0] = True
+
+    beam = ColumnarBeam.from_arrays(np.arange(n, dtype=float), restraints=restraints)
+    beam.distributed_loads[:] = -10
+    return beam
+
+
+def loaded_beam(n: int, support_every: int = 0) -> Beam:
+    """n nodes 1 m apart with a point load on every node and a udl on every member
+
+       A hinge at the start and a roller at the end carry the beam, with a
+       roller every support_every nodes in between for a continuous beam.
+    """
+    rng = np.random.default_rng(SEED)
+    loads = (-1 * rng.integers(1, 50, n)).tolist()
+
+    nodes = [Node(float(x), 0, point_load=PointLoad(load)) for x, load in enumerate(loads)]
+    for idx, node in enumerate(nodes):
+        node.ry = idx in (0, n - 1) or bool(support_every) and idx % support_every == 0
+    nodes[0].rx = True
+
+    beam = Beam()
+    beam.add_nodes(nodes)
+    for start, end in zip(nodes, nodes[1:]):
+        beam.add_member(start, end, distributed_load=UniformlyDistributedLoad(-10, 1))
+    return beam
+
+
+def beam_construction(n: int):
+    nodes = [Node(float(x), 0, ry=x % 10 == 0) for x in range(n)]
+
+    def run():
+        beam = Beam()
+        beam.add_nodes(nodes)
+        beam.add_members(zip(nodes, nodes[1:]))
+
+    return run
+
+
+def columnar_construction(n: int):
+    x = np.arange(n, dtype=float)
+    return lambda: ColumnarBeam.from_arrays(x)
+
+
+def columnar_analysis(n: int):
+    """Builds a loaded ColumnarBeam from arrays and solves it, as a script would"""
+    x = np.arange(max(n, 2), dtype=float)
+    restraints = np.zeros((len(x), 3), dtype=bool)
+    restraints[::10, 1] = True
+    restraints[-1, 1] = True
+    restraints[0, 0] = True
+
+    def run():
+        beam = ColumnarBeam.from_arrays(x, restraints=restraints)
+        beam.distributed_loads[:] = -1
+        DirectStiffnessSolver(beam).solve()
+
+    return run
+
+
+def bulk_point_loads(n: int):
+    magnitudes = np.linspace(-100, 100, n)
+    x = np.arange(n, dtype=float)
+    return lambda: PointLoad.from_arrays(magnitudes, 60.0, x=x)
+
+
+def statically_determinate_solve(n: int):
+    beam = loaded_beam(max(n, 2))
+    return lambda: StaticallyDeterminateSolver(beam).solve()
+
+
+def statically_determinate_solve_batch(n: int):
+    rng = np.random.default_rng(SEED)
+    supports_x = np.column_stack([np.zeros(n), rng.uniform(4, 10, n)])
+    point_loads = -1 * rng.uniform(1, 50, (n, 3))
+    point_loads_x = rng.uniform(0, 4, (n, 3))
+
+    return lambda: StaticallyDeterminateSolver.solve_batch(
+        supports_x, point_loads=point_loads, point_loads_x=point_loads_x
+    )
+
+
+def three_moment_equations(n: int):
+    lengths = np.full(n, 5.0).tolist()
+    left, right = zip(*(udl_terms(-10, 0, length, length) for length in lengths))
+
+    return lambda: solve_three_moment_equations(lengths, list(left), list(right))
+
+
+def three_moment_solve(n: int):
+    beam = loaded_beam(max(n, 2), support_every=10)
+    return lambda: ThreeMomentSolver(beam).solve()
+
+
+def bending_shear_numeric(n: int):
+    beam = loaded_beam(max(n, 2))
+
+    def run():
+        calculator = BendingShearCalculator(beam)
+        calculator.calculate_bending()
+        calculator.calculate_shear()
+
+    return run
+
+
+def bending_shear_exact(n: int):
+    beam = loaded_beam(max(n, 2))
+
+    def run():
+        calculator = BendingShearCalculator(beam, exact=True)
+        calculator.calculate_bending()
+        calculator.calculate_shear()
+
+    return run
+
+
+def elastic_curve(n: int):
+    calculator = BendingShearCalculator(loaded_beam(max(n, 2)))
+    calculator.calculate_bending()
+
+    return lambda: calculator.elastic_curve(2e4).maximum_deflection()
+
+
+def direct_stiffness_solve(n: int):
+    beam = continuous_beam(max(n, 2))
+    return lambda: DirectStiffnessSolver(beam).solve()
+
+
+def direct_stiffness_solve_beam(n: int):
+    beam = loaded_beam(max(n, 2), support_every=10)
+    return lambda: DirectStiffnessSolver(beam).solve()
+
+
+def influence_lines(n: int):
+    solver = DirectStiffnessSolver(continuous_beam(max(n, 2)))
+    positions = np.linspace(0, max(n, 2) - 1, 1_000)
+    sections = np.linspace(0, max(n, 2) - 1, 20)
+
+    return lambda: InfluenceLines(solver).moments(sections, positions)
+
+
+def moving_load(n: int):
+    lines = InfluenceLines(DirectStiffnessSolver(continuous_beam(max(n, 2))))
+    train = VehicleTrain([PointLoad(-40), PointLoad(-100), PointLoad(-100)], [3.0, 1.2])
+    stations = np.linspace(0, max(n, 2) - 1, 20)
+
+    return lambda: moving_load_envelope(lines, train, stations, step=0.25)
+
+
+def parametric_sweep(n: int):
+    """Grid of n spans by 100 loads, the pool only pays off on the larger grids"""
+    parameters = {"support_b_x": np.linspace(4, 12, n), "point_load": -1 * np.arange(1, 101)}
+
+    return lambda: sweep(hinge_roller_reactions, parameters, chunksize=50_000)
+
+
+def import_time(statement: str):
+    """Runs an import in a fresh interpreter, the cost of the interpreter itself is import_nothing"""
+
+    def setup(n: int):
+        return lambda: subprocess.run([sys.executable, "-c", statement], check=True)
+
+    return setup
+
+
+# name -> (setup, largest size worth running)
+CASES = {
+    "beam_construction": (beam_construction, 100_000),
+    "columnar_construction": (columnar_construction, 100_000),
+    "columnar_analysis": (columnar_analysis, 100_000),
+    "bulk_point_loads": (bulk_point_loads, 100_000),
+    "statically_determinate_solve": (statically_determinate_solve, 10_000),
+    "statically_determinate_solve_batch": (statically_determinate_solve_batch, 100_000),
+    "three_moment_equations": (three_moment_equations, 100_000),
+    "three_moment_solve": (three_moment_solve, 1_000),
+    "bending_shear_numeric": (bending_shear_numeric, 100_000),
+    "bending_shear_exact": (bending_shear_exact, 1_000),
+    "elastic_curve": (elastic_curve, 100_000),
+    "direct_stiffness_solve": (direct_stiffness_solve, 100_000),
+    "direct_stiffness_solve_beam": (direct_stiffness_solve_beam, 100_000),
+    "influence_lines": (influence_lines, 10_000),
+    "moving_load_envelope": (moving_load, 10_000),
+    "parametric_sweep": (parametric_sweep, 100_000),
+    # import times do not depend on the size, they only run at the smallest one
+    "import_nothing": (import_time("pass"), 2),
+    "import_package": (import_time("import structural_analysis"), 2),
+    "import_determinate_solver": (
+        import_time("import structural_analysis.statically_determinate.solver"), 2
+    ),
+    "import_bending_shear": (import_time("import structural_analysis.bending_shear"), 2),
+    "import_bending_shear_exact": (
+        import_time("import structural_analysis.bending_shear, sympy"), 2
+    ),
+}
@@ -0,0 +1,65 @@
+"""Compares two benchmark JSON files and fails when a case got slower"""
+import argparse
+import json
+import sys
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.25,
+            memory_threshold: float = 0.25, metric: str = "min") -> list[dict]:
+    """Returns the ratio of current to baseline of every case and size in both files
+
+       A row regresses when its time ratio is above 1 + threshold or its peak
+       memory ratio is above 1 + memory_threshold.
+    """
+    baseline_results = {(row["case"], row["size"]): row for row in baseline["results"]}
+    rows = []
+
+    for row in current["results"]:
+        reference = baseline_results.get((row["case"], row["size"]))
+        if reference is None:
+            continue
+
+        time_ratio = row[metric] / reference[metric] if reference[metric] else float("inf")
+        memory_ratio = (
+            row["peak_memory"] / reference["peak_memory"] if reference["peak_memory"] else 1.0
+        )
+        rows.append({
+            "case": row["case"],
+            "size": row["size"],
+            "baseline": reference[metric],
+            "current": row[metric],
+            "time_ratio": time_ratio,
+            "memory_ratio": memory_ratio,
+            "regressed": time_ratio > 1 + threshold or memory_ratio > 1 + memory_threshold,
+        })
+
+    return rows
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("baseline")
+    parser.add_argument("current")
+    parser.add_argument("--threshold", type=float, default=0.25,
+                        help="allowed relative slowdown, 0.25 is 25%%")
+    parser.add_argument("--memory-threshold", type=float, default=0.25)
+    parser.add_argument("--metric", choices=("min", "median", "mean"), default="min")
+    args = parser.parse_args(argv)
+
+    with open(args.baseline) as file:
+        baseline = json.load(file)
+    with open(args.current) as file:
+        current = json.load(file)
+
+    rows = compare(baseline, current, args.threshold, args.memory_threshold, args.metric)
+
+    for row in rows:
+        flag = "REGRESSED" if row["regressed"] else ""
+        print(f"{row['case']:<36}{row['size']:>8}  {row['time_ratio']:8.2f}x time"
+              f"  {row['memory_ratio']:8.2f}x memory  {flag}")
+
+    return 1 if any(row["regressed"] for row in rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Times every benchmark case over model sizes and writes the results as JSON"""
+import argparse
+import gc
+import json
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timezone
+
+import numpy as np
+
+from .cases import CASES, SIZES
+
+SCHEMA_VERSION = 1
+
+
+def measure(operation, repeat: int, budget: float) -> dict:
+    """Wall times of repeated runs and the peak memory allocated by a single run
+
+       Runs stop early once budget seconds are spent, but always run once.
+    """
+    times = []
+    spent = 0.0
+    gc.collect()
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        operation()
+        elapsed = time.perf_counter() - start
+
+        times.append(elapsed)
+        spent += elapsed
+        if spent > budget:
+            break
+
+    # tracemalloc slows the run down, so memory is measured on a run of its own
+    tracemalloc.start()
+    operation()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "runs": len(times),
+        "min": min(times),
+        "median": statistics.median(times),
+        "mean": statistics.fmean(times),
+        "peak_memory": peak,
+    }
+
+
+def run(cases=None, sizes=SIZES, repeat: int = 5, budget: float = 2.0, log=None) -> dict:
+    """Runs the benchmark cases and returns the JSON document of the results
+
+       :param cases: names of the cases to run (defaults to all of them)
+       :param sizes: model sizes, sizes larger than the limit of a case are skipped
+       :param repeat: largest number of timed runs of every case and size
+       :param budget: seconds after which no more timed runs are started
+    """
+    results = []
+
+    for name in cases or CASES:
+        setup, largest = CASES[name]
+        for size in sizes:
+            if size > largest:
+                continue
+
+            result = {"case": name, "size": size, **measure(setup(size), repeat, budget)}
+            results.append(result)
+
+            if log:
+                log(f"{name:<36}{size:>8}  {result['min'] * 1e3:12.3f} ms"
+                    f"  {result['peak_memory'] / 1024:12.1f} KiB")
+
+    return {
+        "schema": SCHEMA_VERSION,
+        "created": datetime.now(timezone.utc).isoformat(),
+        "machine": {
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "processor": platform.processor(),
+        },
+        "results": results,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--output", "-o", help="JSON file to write, defaults to stdout")
+    parser.add_argument("--case", action="append", choices=sorted(CASES), help="case to run")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(SIZES))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--budget", type=float, default=2.0)
+    args = parser.parse_args(argv)
+
+    document = run(
+        args.case, args.sizes, args.repeat, args.budget,
+        log=lambda line: print(line, file=sys.stderr),
+    )
+
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(document, file, indent=2)
+    else:
+        json.dump(document, sys.stdout, indent=2)
+
+
+if __name__ == "__main__":
+    main()
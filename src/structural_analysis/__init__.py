@@ -1,14 +1,72 @@
-from .load import PointLoad, UniformlyDistributedLoad, PointMoment
-from .beam import Beam, FixedSupport, HingeSupport, RollerSupport, InternalRoller, InternalHinge
-from .beam_errors import (
-    GeometricallyUnstableExternally,
-    StaticallyUnstableExternally,
-    SupportCreationError,
-    StaticallyIndeterminateExternally,
-)
+import importlib
+from typing import TYPE_CHECKING
 
 __version__ = "1.0.0a"
 
+# names of the package and the modules they live in, loaded on first access (PEP 562)
+# so that importing the package, or one solver, does not import every dependency
+_LAZY_NAMES = {
+    "PointLoad": ".load",
+    "UniformlyDistributedLoad": ".load",
+    "TriangularLoad": ".load",
+    "TrapezoidalLoad": ".load",
+    "PointMoment": ".load",
+    "PointLoads": ".load",
+    "UniformlyDistributedLoads": ".load",
+    "PointMoments": ".load",
+    "LoadCase": ".load",
+    "LoadCombination": ".load",
+    "Beam": ".beam",
+    "FixedSupport": ".beam",
+    "HingeSupport": ".beam",
+    "RollerSupport": ".beam",
+    "InternalRoller": ".beam",
+    "InternalHinge": ".beam",
+    "GeometricallyUnstableExternally": ".beam_errors",
+    "StaticallyUnstableExternally": ".beam_errors",
+    "SupportCreationError": ".beam_errors",
+    "StaticallyIndeterminateExternally": ".beam_errors",
+}
+
+__all__ = [*_LAZY_NAMES, "sign_convention"]
+
+if TYPE_CHECKING:
+    from .load import (
+        PointLoad,
+        UniformlyDistributedLoad,
+        TriangularLoad,
+        TrapezoidalLoad,
+        PointMoment,
+        PointLoads,
+        UniformlyDistributedLoads,
+        PointMoments,
+        LoadCase,
+        LoadCombination,
+    )
+    from .beam import Beam, FixedSupport, HingeSupport, RollerSupport, InternalRoller, InternalHinge
+    from .beam_errors import (
+        GeometricallyUnstableExternally,
+        StaticallyUnstableExternally,
+        SupportCreationError,
+        StaticallyIndeterminateExternally,
+    )
+
+
+def __getattr__(name: str):
+    try:
+        module = _LAZY_NAMES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+
+    value = getattr(importlib.import_module(module, __name__), name)
+    # cache it so later lookups do not come back here
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list:
+    return sorted({*globals(), *_LAZY_NAMES})
+
 
 def sign_convention():
     print("- \u2193   + \u2191")
@@ -1,19 +1,36 @@
 # NEW DESIGN
 # ==========
 
+import math
+from array import array
 from collections import OrderedDict
 from typing import Iterable
 
-from structure import Structure
+import numpy as np
+
+from .structure import Structure
+from .beam_errors import SupportCreationError
 
 
 class Node:
-    def __init__(self, x, y, rx=False, ry=False, rm=False):
+    __slots__ = ("x", "y", "rx", "ry", "rm", "point_load", "point_moment")
+
+    def __init__(self, x, y, rx=False, ry=False, rm=False, *, point_load=None, point_moment=None):
         self.x = x
         self.y = y
         self.rx = rx
         self.ry = ry
         self.rm = rm
+        self.point_load = point_load
+        self.point_moment = point_moment
+
+        if self.point_load:
+            self.point_load.x = self.x
+            self.point_load.y = self.y
+
+        if self.point_moment:
+            self.point_moment.x = self.x
+            self.point_moment.y = self.y
 
     def __repr__(self):
         return f'{self.__class__.__name__}(x={self.x}, y={self.y})'
@@ -28,21 +45,68 @@ class Node:
 
 
 class Member:
-    def __init__(self, node1, node2):
+    __slots__ = (
+        "start",
+        "end",
+        "distributed_load",
+        "modulus_of_elasticity",
+        "moment_of_inertia",
+        "cross_sectional_area",
+    )
+
+    # Material Properties
+    MODULUS_OF_ELASTICITY: float = 20e-07
+
+    # Geometric Properties
+    CROSS_SECTIONAL_AREA: float = 1.000e-02
+    MOMENT_OF_INERTIA: float = 1.000e-04
+
+    def __init__(
+            self,
+            node1,
+            node2,
+            *,
+            distributed_load=None,
+            modulus_of_elasticity=None,
+            moment_of_inertia=None,
+            cross_sectional_area=None,
+    ):
         self.start = node1
         self.end = node2
+        self.distributed_load = distributed_load
+        self.modulus_of_elasticity = (
+            self.MODULUS_OF_ELASTICITY if modulus_of_elasticity is None else modulus_of_elasticity
+        )
+        self.moment_of_inertia = (
+            self.MOMENT_OF_INERTIA if moment_of_inertia is None else moment_of_inertia
+        )
+        self.cross_sectional_area = (
+            self.CROSS_SECTIONAL_AREA if cross_sectional_area is None else cross_sectional_area
+        )
+
+        if self.distributed_load:
+            self.distributed_load.start = self.start.x
 
     def __repr__(self):
         return f"{self.__class__.__name__}(start={self.start}, end={self.end})"
 
+    @property
+    def length(self) -> float:
+        return math.hypot(self.end.x - self.start.x, self.end.y - self.start.y)
+
 
 class Beam(Structure):
 
     def __init__(self):
         self.nodes: list = []
         self.members: list = []
+        self.node_ids: dict = {}
         self.beam_model: OrderedDict = OrderedDict()
 
+        # start and end node ids of every member, flattened
+        self._member_nodes: array = array("q")
+        self._adjacency = None
+
     def add_node(self, node: Node):
         """Adds a node to Beam
 
@@ -50,8 +114,21 @@ class Beam(Structure):
            :type node: Node
         """
 
-        if node not in self.nodes:
+        if node not in self.node_ids:
+            self.node_ids[node] = len(self.nodes)
             self.nodes.append(node)
+            self._adjacency = None
+
+    def add_nodes(self, nodes: Iterable[Node]):
+        """Adds many nodes to Beam, skipping nodes that are already in it"""
+        node_ids, beam_nodes = self.node_ids, self.nodes
+
+        for node in nodes:
+            # a single hash per node, setdefault keeps the id of a node already in Beam
+            if node_ids.setdefault(node, len(beam_nodes)) == len(beam_nodes):
+                beam_nodes.append(node)
+
+        self._adjacency = None
 
     def add_member(self, start: Node, end: Node, *args, **kwargs):
         """Adds a member to Beam
@@ -61,33 +138,369 @@ class Beam(Structure):
 
            :param end: End point of the member
            :type end: Node
+
+           Keyword arguments (distributed load and section properties) are
+           passed on to Member.
         """
-        if node1 in self.nodes and node2 in self.nodes:
-            member = Member(node1=node1, node2=node2)
+        if start in self.node_ids and end in self.node_ids:
+            member = Member(node1=start, node2=end, **kwargs)
             self.members.append(member)
-            self.beam_model[node1] = {node2: member}
+            self.beam_model.setdefault(start, {})[end] = member
+            self._member_nodes.extend((self.node_ids[start], self.node_ids[end]))
+            self._adjacency = None
+
+    def add_members(self, pairs: Iterable[tuple[Node, Node]], **kwargs):
+        """Adds a member between every (start, end) pair of nodes
+
+           Keyword arguments are passed on to every Member.
+        """
+        node_ids, beam_model = self.node_ids, self.beam_model
+        members, member_nodes = [], []
+
+        for start, end in pairs:
+            start_id, end_id = node_ids.get(start), node_ids.get(end)
+            if start_id is None or end_id is None:
+                continue
+
+            member = Member(start, end, **kwargs)
+            members.append(member)
+            member_nodes += (start_id, end_id)
+            beam_model.setdefault(start, {})[end] = member
+
+        self.members.extend(members)
+        self._member_nodes.extend(member_nodes)
+        self._adjacency = None
 
     def get_nodes(self) -> Iterable[Node]:
         """Returns the number of nodes/joints"""
-        return OrderedDict.fromkeys(self.nodes).keys()
+        return self.node_ids.keys()
 
     def get_members(self) -> list[Member]:
         """Returns the number of members"""
         return self.members
 
+    def node_id(self, node: Node) -> int:
+        """Returns the integer id of a node, in the order the nodes were added"""
+        return self.node_ids[node]
+
+    @property
+    def member_nodes(self) -> np.ndarray:
+        """Start and end node ids of every member, shape (members, 2)"""
+        return np.array(self._member_nodes, dtype=np.int64).reshape(-1, 2)
+
+    def adjacency(self) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Compressed sparse row adjacency of the nodes
+
+           The members meeting at node i are members[indptr[i]:indptr[i + 1]]
+           and the nodes at their other ends are neighbours[indptr[i]:indptr[i + 1]].
+
+           :return: indptr, neighbours, members
+        """
+        if self._adjacency is None:
+            member_nodes = self.member_nodes
+            owners = member_nodes.reshape(-1)
+            order = np.argsort(owners, kind="stable")
+
+            indptr = np.zeros(len(self.nodes) + 1, dtype=np.int64)
+            np.cumsum(np.bincount(owners, minlength=len(self.nodes)), out=indptr[1:])
+
+            self._adjacency = (
+                indptr,
+                member_nodes[:, ::-1].reshape(-1)[order],
+                np.repeat(np.arange(len(member_nodes)), 2)[order],
+            )
+
+        return self._adjacency
+
+    def neighbours(self, node: Node) -> list[Node]:
+        """Returns the nodes connected to node by a member"""
+        indptr, neighbours, _ = self.adjacency()
+        idx = self.node_ids[node]
+
+        return [self.nodes[other] for other in neighbours[indptr[idx]:indptr[idx + 1]]]
+
+
+class FixedSupport:
+    NUMBER_OF_RESTRAINTS = 3
+
+    def __init__(
+            self,
+            moment: float or None = None,
+            vertical_force: float or None = None,
+            horizontal_force: float or None = None,
+            x: float or None = None,
+            y: float or None = None,
+    ):
+        self._moment = moment
+        self._vertical_force = vertical_force
+        self._horizontal_force = horizontal_force
+        self._x = x
+        self._y = y
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
+
+    # def __str__(self) -> str:
+    #     return self.__class__.__name__
+
+    @property
+    def moment(self):
+        return self._moment
+
+    @moment.setter
+    def moment(self, val):
+        if isinstance(val, (int, float)):
+            self._moment = val
+        else:
+            raise ValueError("moment can only be int or float")
+
+    @property
+    def vertical_force(self):
+        return self._vertical_force
+
+    @vertical_force.setter
+    def vertical_force(self, val):
+        if isinstance(val, (int, float)):
+            self._vertical_force = val
+        else:
+            raise ValueError("vertical force can only be int or float")
+
+    @property
+    def horizontal_force(self):
+        return self._horizontal_force
+
+    @horizontal_force.setter
+    def horizontal_force(self, val):
+        if isinstance(val, (int, float)):
+            self._horizontal_force = val
+        else:
+            raise ValueError("horizontal force can only be int or float")
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @x.setter
+    def x(self, val):
+        if val < 0:
+            raise ValueError("x cannot be negative")
+        self._x = val
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @y.setter
+    def y(self, val):
+        if val < 0:
+            raise ValueError("y cannot be negative")
+        self._y = val
+
+    @classmethod
+    def get_num_of_restraints(cls):
+        return cls.NUMBER_OF_RESTRAINTS
+
+    @staticmethod
+    def get_vertical_reaction():
+        return 1
+
+    @staticmethod
+    def get_horizontal_reaction():
+        return 1
+
+    @staticmethod
+    def get_moment():
+        return 1
+
+
+class HingeSupport:
+    NUMBER_OF_RESTRAINTS = 2
+
+    def __init__(
+            self,
+            vertical_force: float or None = None,
+            horizontal_force: float or None = None,
+            x: float or None = None,
+            y: float or None = None,
+    ):
+        self._vertical_force = vertical_force
+        self._horizontal_force = horizontal_force
+        self._x = x
+        self._y = y
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
+
+    # def __str__(self) -> str:
+    #     return self.__class__.__name__
+
+    @property
+    def vertical_force(self):
+        return self._vertical_force
+
+    @vertical_force.setter
+    def vertical_force(self, val):
+        if isinstance(val, (int, float)):
+            self._vertical_force = val
+        else:
+            raise ValueError("vertical force can only be int or float")
+
+    @property
+    def horizontal_force(self):
+        return self._horizontal_force
+
+    @horizontal_force.setter
+    def horizontal_force(self, val):
+        if isinstance(val, (int, float)):
+            self._horizontal_force = val
+        else:
+            raise ValueError("horizontal force can only be int or float")
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @x.setter
+    def x(self, val):
+        if val < 0:
+            raise ValueError("x cannot be negative")
+        self._x = val
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @y.setter
+    def y(self, val):
+        if val < 0:
+            raise ValueError("y cannot be negative")
+        self._y = val
+
+    @classmethod
+    def get_num_of_restraints(cls):
+        return cls.NUMBER_OF_RESTRAINTS
+
+    @staticmethod
+    def get_vertical_reaction():
+        return 1
+
+    @staticmethod
+    def get_horizontal_reaction():
+        return 1
+
+    @staticmethod
+    def get_moment():
+        return 0
+
+
+class RollerSupport:
+    NUMBER_OF_RESTRAINTS = 1
+
+    def __init__(
+            self,
+            force: float or None = None,
+            x: float or None = None,
+            y: float or None = None,
+            rx: bool or None = None,
+            ry: bool or None = None,
+    ):
+        self._force = force
+        self._x = x
+        self._y = y
+        self.rx = rx
+        self.ry = ry
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
+
+    def __str__(self) -> str:
+        return self.__class__.__name__
+
+    @property
+    def force(self):
+        return self._force
+
+    @force.setter
+    def force(self, val):
+        if isinstance(val, (int, float)):
+            self._force = val
+        else:
+            raise ValueError("force can only be int or float")
+
+    @property
+    def x(self) -> float:
+        return self._x
+
+    @x.setter
+    def x(self, val):
+        if val < 0:
+            raise ValueError("x cannot be negative")
+        self._x = val
+
+    @property
+    def y(self) -> float:
+        return self._y
+
+    @y.setter
+    def y(self, val):
+        if val < 0:
+            raise ValueError("y cannot be negative")
+        self._y = val
+
+    @classmethod
+    def get_num_of_restraints(cls):
+        return cls.NUMBER_OF_RESTRAINTS
+
+    def get_vertical_reaction(self):
+        if self.is_rxn_vertical():
+            return 1
+        else:
+            return 0
+
+    def get_horizontal_reaction(self):
+        if self.is_rxn_vertical():
+            return 0
+        else:
+            return 1
+
+    @staticmethod
+    def get_moment():
+        return 0
+
+    def is_rxn_vertical(self) -> bool:
+        try:
+            return self.ry
+        except AttributeError:
+            return self.rx
+
+
+class InternalHinge:
+    pass
+
+
+class InternalRoller:
+    pass
+
+
+def create_support(
+        rx: bool or None = None,
+        ry: bool or None = None,
+        rm: bool or None = None,
+):
+    if rx and ry and rm:
+        return FixedSupport()
+    elif rx and ry:
+        return HingeSupport()
+    elif rx or ry:
+        return RollerSupport(rx=rx, ry=ry)
+
+    raise SupportCreationError("Not enough information to create a valid support")
+
+
+def create_supports(restraints: list[dict]):
+    return [create_support(**r) for r in restraints]
+
 
-b = Beam()
-node1 = Node(0, 0)
-node3 = Node(0, 0)
-b.add_node(node1)
-b.add_node(node3)
-node2 = Node(4, 0)
-b.add_node(node2)
-b.add_member(node1, node2)
-print(b.nodes)
-print(b.members)
-print(b.beam_model)
-print(b.get_nodes())
 # from typing import Iterable, Any
 # from types import MappingProxyType
 #
@@ -100,287 +513,6 @@ print(b.get_nodes())
 # TODO automatically update the beam's length when nodes are added
 
 
-# class FixedSupport:
-#     NUMBER_OF_RESTRAINTS = 3
-#
-#     def __init__(
-#             self,
-#             moment: float or None = None,
-#             vertical_force: float or None = None,
-#             horizontal_force: float or None = None,
-#             x: float or None = None,
-#             y: float or None = None,
-#     ):
-#         self._moment = moment
-#         self._vertical_force = vertical_force
-#         self._horizontal_force = horizontal_force
-#         self._x = x
-#         self._y = y
-#
-#     def __repr__(self):
-#         return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
-#
-#     # def __str__(self) -> str:
-#     #     return self.__class__.__name__
-#
-#     @property
-#     def moment(self):
-#         return self._moment
-#
-#     @moment.setter
-#     def moment(self, val):
-#         if isinstance(val, (int, float)):
-#             self._moment = val
-#         else:
-#             raise ValueError("moment can only be int or float")
-#
-#     @property
-#     def vertical_force(self):
-#         return self._vertical_force
-#
-#     @vertical_force.setter
-#     def vertical_force(self, val):
-#         if isinstance(val, (int, float)):
-#             self._vertical_force = val
-#         else:
-#             raise ValueError("vertical force can only be int or float")
-#
-#     @property
-#     def horizontal_force(self):
-#         return self._horizontal_force
-#
-#     @horizontal_force.setter
-#     def horizontal_force(self, val):
-#         if isinstance(val, (int, float)):
-#             self._horizontal_force = val
-#         else:
-#             raise ValueError("horizontal force can only be int or float")
-#
-#     @property
-#     def x(self) -> float:
-#         return self._x
-#
-#     @x.setter
-#     def x(self, val):
-#         if val < 0:
-#             raise ValueError("x cannot be negative")
-#         self._x = val
-#
-#     @property
-#     def y(self) -> float:
-#         return self._y
-#
-#     @y.setter
-#     def y(self, val):
-#         if val < 0:
-#             raise ValueError("y cannot be negative")
-#         self._y = val
-#
-#     @classmethod
-#     def get_num_of_restraints(cls):
-#         return cls.NUMBER_OF_RESTRAINTS
-#
-#     @staticmethod
-#     def get_vertical_reaction():
-#         return 1
-#
-#     @staticmethod
-#     def get_horizontal_reaction():
-#         return 1
-#
-#     @staticmethod
-#     def get_moment():
-#         return 1
-#
-#
-# class HingeSupport:
-#     NUMBER_OF_RESTRAINTS = 2
-#
-#     def __init__(
-#             self,
-#             vertical_force: float or None = None,
-#             horizontal_force: float or None = None,
-#             x: float or None = None,
-#             y: float or None = None,
-#     ):
-#         self._vertical_force = vertical_force
-#         self._horizontal_force = horizontal_force
-#         self._x = x
-#         self._y = y
-#
-#     def __repr__(self):
-#         return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
-#
-#     # def __str__(self) -> str:
-#     #     return self.__class__.__name__
-#
-#     @property
-#     def vertical_force(self):
-#         return self._vertical_force
-#
-#     @vertical_force.setter
-#     def vertical_force(self, val):
-#         if isinstance(val, (int, float)):
-#             self._vertical_force = val
-#         else:
-#             raise ValueError("vertical force can only be int or float")
-#
-#     @property
-#     def horizontal_force(self):
-#         return self._horizontal_force
-#
-#     @horizontal_force.setter
-#     def horizontal_force(self, val):
-#         if isinstance(val, (int, float)):
-#             self._horizontal_force = val
-#         else:
-#             raise ValueError("horizontal force can only be int or float")
-#
-#     @property
-#     def x(self) -> float:
-#         return self._x
-#
-#     @x.setter
-#     def x(self, val):
-#         if val < 0:
-#             raise ValueError("x cannot be negative")
-#         self._x = val
-#
-#     @property
-#     def y(self) -> float:
-#         return self._y
-#
-#     @y.setter
-#     def y(self, val):
-#         if val < 0:
-#             raise ValueError("y cannot be negative")
-#         self._y = val
-#
-#     @classmethod
-#     def get_num_of_restraints(cls):
-#         return cls.NUMBER_OF_RESTRAINTS
-#
-#     @staticmethod
-#     def get_vertical_reaction():
-#         return 1
-#
-#     @staticmethod
-#     def get_horizontal_reaction():
-#         return 1
-#
-#     @staticmethod
-#     def get_moment():
-#         return 0
-#
-#
-# class RollerSupport:
-#     NUMBER_OF_RESTRAINTS = 1
-#
-#     def __init__(
-#             self,
-#             force: float or None = None,
-#             x: float or None = None,
-#             y: float or None = None,
-#             rx: bool or None = None,
-#             ry: bool or None = None,
-#     ):
-#         self._force = force
-#         self._x = x
-#         self._y = y
-#         self.rx = rx
-#         self.ry = ry
-#
-#     def __repr__(self):
-#         return f"{self.__class__.__name__}(x={self.x}, y={self.y})"
-#
-#     def __str__(self) -> str:
-#         return self.__class__.__name__
-#
-#     @property
-#     def force(self):
-#         return self._force
-#
-#     @force.setter
-#     def force(self, val):
-#         if isinstance(val, (int, float)):
-#             self._force = val
-#         else:
-#             raise ValueError("force can only be int or float")
-#
-#     @property
-#     def x(self) -> float:
-#         return self._x
-#
-#     @x.setter
-#     def x(self, val):
-#         if val < 0:
-#             raise ValueError("x cannot be negative")
-#         self._x = val
-#
-#     @property
-#     def y(self) -> float:
-#         return self._y
-#
-#     @y.setter
-#     def y(self, val):
-#         if val < 0:
-#             raise ValueError("y cannot be negative")
-#         self._y = val
-#
-#     @classmethod
-#     def get_num_of_restraints(cls):
-#         return cls.NUMBER_OF_RESTRAINTS
-#
-#     def get_vertical_reaction(self):
-#         if self.is_rxn_vertical():
-#             return 1
-#         else:
-#             return 0
-#
-#     def get_horizontal_reaction(self):
-#         if self.is_rxn_vertical():
-#             return 0
-#         else:
-#             return 1
-#
-#     @staticmethod
-#     def get_moment():
-#         return 0
-#
-#     def is_rxn_vertical(self) -> bool:
-#         try:
-#             return self.ry
-#         except AttributeError:
-#             return self.rx
-#
-#
-# class InternalHinge:
-#     pass
-#
-#
-# class InternalRoller:
-#     pass
-#
-#
-# def create_support(
-#         rx: bool or None = None,
-#         ry: bool or None = None,
-#         rm: bool or None = None,
-# ):
-#     if rx and ry and rm:
-#         return FixedSupport()
-#     elif rx and ry:
-#         return HingeSupport()
-#     elif rx or ry:
-#         return RollerSupport(rx=rx, ry=ry)
-#
-#     raise SupportCreationError("Not enough information to create a valid support")
-#
-#
-# def create_supports(restraints: list[dict]):
-#     return [create_support(**r) for r in restraints]
-#
-#
 # @attrs.define(slots=True)
 # class Node:
 #     name: str = attrs.field(validator=attrs.validators.instance_of(str))
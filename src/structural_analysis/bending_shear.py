@@ -1,34 +1,29 @@
-from sympy import sympify, Derivative
-from sympy.core.numbers import Float, Integer
-import attrs
+import numbers
 
-from . import (
-    HingeSupport,
-    RollerSupport,
-    PointMoment,
-    UniformlyDistributedLoad,
-    PointLoad,
+import attrs
+import numpy as np
+
+from . import HingeSupport, RollerSupport
+from .beam import Member
+from .chain import NodeChain
+from .deflection import ElasticCurve, elastic_curve
+from .load import TrapezoidalLoad
+from .piecewise import (
+    PiecewisePolynomial,
+    critical_points,
+    derivative_coefficients,
+    derivative_roots,
+    polyval,
 )
+from .profiling import stage
+from .statically_determinate.solver import StaticallyDeterminateSolver
+from .structure import Structure
 
 
 class NotSolvedError(Exception):
     pass
 
 
-@attrs.define(slots=True)
-class ULoad:
-    magnitude: int or float = attrs.field(validator=attrs.validators.instance_of((int, float)))
-    type: str = attrs.field(validator=attrs.validators.instance_of(UniformlyDistributedLoad))
-    length: list = attrs.field(factory=list)
-
-
-@attrs.define()
-class Load:
-    magnitude: int or float = attrs.field(validator=attrs.validators.instance_of((int, float)))
-    length: int or float = attrs.field(validator=attrs.validators.instance_of((int, float)))
-    type = attrs.field()
-
-
 @attrs.define(frozen=True, slots=True)
 class Boundary:
     lower_bound: int or float = attrs.field(
@@ -53,41 +48,217 @@ class Result:
     upper_bound: int or float = attrs.field(
         validator=attrs.validators.instance_of((int, float))
     )
-    lower_bound_val: Integer or Float = attrs.field(
-        validator=attrs.validators.instance_of((Integer, Float))
+    # sympy registers its Integer and Float as numbers.Real, so they pass
+    # without importing sympy here
+    lower_bound_val: numbers.Real = attrs.field(
+        validator=attrs.validators.instance_of(numbers.Real)
     )
-    upper_bound_val: Integer or Float = attrs.field(
-        validator=attrs.validators.instance_of((Integer, Float))
+    upper_bound_val: numbers.Real = attrs.field(
+        validator=attrs.validators.instance_of(numbers.Real)
     )
     eqn: str = attrs.field()
 
 
+@attrs.define(frozen=True, slots=True)
+class Extremes:
+    lower_bound: float = attrs.field()
+    upper_bound: float = attrs.field()
+    maximum_x: float = attrs.field()
+    maximum: float = attrs.field()
+    minimum_x: float = attrs.field()
+    minimum: float = attrs.field()
+
+
+def moment_coefficients(
+        x: np.ndarray,
+        forces: np.ndarray,
+        moments: np.ndarray,
+        udls: np.ndarray,
+        udl_gradients: np.ndarray = None,
+) -> np.ndarray:
+    """Builds the bending moment polynomial of every segment of a beam
+
+       A segment runs from one node to the next and its polynomial is written
+       in terms of x measured from the start of the segment, exactly like the
+       equations of the exact mode. The resultant force and moment of all the
+       loads to the left of every segment are carried forward with cumulative
+       sums, so the whole beam is built in a single vectorized pass.
+
+       :param x: x coordinates of the nodes
+       :param forces: vertical force at every node (loads and reactions)
+       :param moments: point moment at every node (loads and reactions)
+       :param udls: intensity of the distributed load at the start of every segment
+       :param udl_gradients: change of that intensity per unit length along
+            every segment, for triangular and trapezoidal loads
+       :return: coefficient matrix of shape (3, number of segments), highest
+            power first, or (4, number of segments) for linearly varying loads
+    """
+    x = np.asarray(x, dtype=float)
+    forces = np.asarray(forces, dtype=float)[:-1]
+    moments = np.asarray(moments, dtype=float)[:-1]
+    udls = np.asarray(udls, dtype=float)[:-1]
+    gradients = (
+        np.zeros_like(udls) if udl_gradients is None
+        else np.asarray(udl_gradients, dtype=float)[:-1]
+    )
+
+    start = x[:-1]
+    length = np.diff(x)
+    udl_force = udls * length + gradients * length ** 2 / 2
+    # about the start of the segment
+    udl_moment = udls * length ** 2 / 2 + gradients * length ** 3 / 3
+
+    # resultants of everything strictly to the left of the start of a segment
+    previous_force = np.cumsum(forces) - forces + np.cumsum(udl_force) - udl_force
+    moment_of_udl_about_origin = udl_force * start + udl_moment
+    previous_moment_of_force = (
+            np.cumsum(forces * start)
+            - forces * start
+            + np.cumsum(moment_of_udl_about_origin)
+            - moment_of_udl_about_origin
+    )
+
+    linear = np.any(gradients)
+    coefficients = np.empty((4 if linear else 3, len(start)))
+    if linear:
+        coefficients[0] = gradients / 6
+    coefficients[-3] = udls / 2
+    coefficients[-2] = previous_force + forces
+    coefficients[-1] = start * previous_force - previous_moment_of_force + np.cumsum(moments)
+
+    return coefficients
+
+
 class BendingShearCalculator:
-    def __init__(self, beam):
+    def __init__(self, beam, exact: bool = False, reactions=None):
+        """Calculates the bending moment and shear force equations of a solved beam
+
+           :param beam: Beam or ColumnarBeam, or a chain of nodes whose supports
+                hold their reactions like NodeChain
+           :param exact: use sympy to build exact equations instead of the numeric engine
+           :param reactions: DeterminateResult the reactions are read from, by
+                default they are read from the support objects of a chain of
+                nodes and solved with StaticallyDeterminateSolver for a Beam
+           :raises StaticallyIndeterminateExternally: if the reactions of a
+                Beam are not given and it is not determinate
+        """
+        if isinstance(beam, Structure):
+            beam = NodeChain(beam, () if reactions is None else reactions.supports)
+            if reactions is None:
+                reactions = StaticallyDeterminateSolver(beam).solve()
+
         self.beam = beam
+        self.exact = exact
+        self.reactions = reactions
         self._bending_moments_equations = []
         self._shear_force_equations = []
-        self.cache: list = []
         self.points = []
+        self.moment_coefficients = None
+        self.shear_coefficients = None
         self.solved = False
 
     @property
     def bending_moments_equations(self) -> list:
         if self.solved:
+            if not self.exact:
+                return self._numeric_equations(self.moment_coefficients)
             return self._bending_moments_equations
         raise NotSolvedError("Bending and Shear has not been calculated yet")
 
     @property
     def shear_force_equations(self) -> list:
         if self.solved:
+            if not self.exact:
+                return self._numeric_equations(self.shear_coefficients)
             return self._shear_force_equations
         raise NotSolvedError("Bending and Shear has not been calculated yet")
 
+    def _numeric_equations(self, coefficients) -> list:
+        return [
+            Equation(
+                eqn=coefficients[:, idx],
+                boundary=Boundary(lower_bound=lower_bound, upper_bound=upper_bound),
+            )
+            for idx, (lower_bound, upper_bound) in enumerate(self.points)
+        ]
+
+    @staticmethod
+    def _node_actions(node, reactions=None) -> tuple:
+        """Returns the vertical force, point moment and udl acting at a node
+
+           For a triangular or trapezoidal load the udl is its intensity at the
+           node, see _udl_gradient for how it changes along the segment. The
+           reaction of a support comes from reactions when it is given.
+        """
+        force = 0
+        moment = 0
+
+        if node.support and reactions is not None:
+            reaction = reactions.reaction(node.support)
+            force += reaction.vertical
+            moment += reaction.moment
+        elif node.support:
+            if isinstance(node.support, HingeSupport):
+                force += node.support.vertical_force
+            elif isinstance(node.support, RollerSupport):
+                force += node.support.force
+            else:
+                force += node.support.vertical_force
+                moment += node.support.moment
+
+        if node.point_load:
+            force += node.point_load.vertical_force
+
+        if node.point_moment:
+            moment += node.point_moment.magnitude
+
+        udl = 0
+        if isinstance(node.distributed_load, TrapezoidalLoad):
+            udl = node.distributed_load.intensity(node.x - node.distributed_load.start)
+        elif node.distributed_load:
+            udl = node.distributed_load.magnitude
+
+        return force, moment, udl
+
+    @staticmethod
+    def _udl_gradient(node) -> float:
+        """Change per unit length of the intensity of the distributed load at a node"""
+        if isinstance(node.distributed_load, TrapezoidalLoad):
+            return node.distributed_load.gradient
+        return 0
+
+    def _calculate_numeric(self):
+        x, forces, moments, udls, gradients = [], [], [], [], []
+
+        with stage("bending_shear.node_actions"):
+            for node in self.beam:
+                force, moment, udl = self._node_actions(node, self.reactions)
+
+                x.append(node.x)
+                forces.append(force)
+                moments.append(moment)
+                udls.append(udl)
+                gradients.append(self._udl_gradient(node))
+
+        with stage("bending_shear.coefficients"):
+            self.moment_coefficients = moment_coefficients(x, forces, moments, udls, gradients)
+            self.shear_coefficients = derivative_coefficients(self.moment_coefficients)
+        self.points = [(0, upper_bound) for upper_bound in np.diff(x).tolist()]
+
+        self.solved = True
+
     def _calculate_bending_and_shear(self):
+        # sympy is only needed for exact equations and is slow to import
+        from sympy import Derivative, sympify
+
         lower_bound: int = 0
 
+        # resultant force of all the loads to the left of the current node and
+        # their moment about it, carried forward from segment to segment
+        resultant_force = 0
+        resultant_moment = 0
+
         for node in self.beam:
-            eqn: str = ""
             x_coordinate_of_node = node.x
             try:
                 x_coordinate_of_next_node = node.next_.x
@@ -95,94 +266,22 @@ class BendingShearCalculator:
                 break
             upper_bound: int = x_coordinate_of_next_node - x_coordinate_of_node
 
-            for load in self.cache:
-                if isinstance(load.type, UniformlyDistributedLoad):
-                    if len(load.length) > 1:
-                        eqn += f" + {load.magnitude * load.length[0]} * ({load.length[0] / 2} + {sum(load.length[1:])} + x)"
-                        load.length.append(upper_bound)
-                    else:
-                        eqn += f" + {load.magnitude * load.length[0]} * ({load.length[0] / 2} + x)"
-                        load.length.append(upper_bound)
-
-                elif isinstance(load.type, PointMoment):
-                    eqn += f" + {load.magnitude}"
-
-                else:
-                    eqn += f" + {load.magnitude} * ({load.length} + x)"
-                    load.length = load.length + upper_bound
-
-            if node.support:
-                if isinstance(node.support, HingeSupport):
-                    eqn += f" + {node.support.vertical_force} * x"
-                    self.cache.append(
-                        Load(
-                            magnitude=node.support.vertical_force,
-                            length=upper_bound,
-                            type=node.support,
-                        )
-                    )
-                elif isinstance(node.support, RollerSupport):
-                    eqn += f" + {node.support.force} * x"
-                    self.cache.append(
-                        Load(
-                            magnitude=node.support.force,
-                            length=upper_bound,
-                            type=node.support,
-                        )
-                    )
-                else:
-                    eqn += (
-                        f" + {node.support.vertical_force} * x + {node.support.moment}"
-                    )
-                    self.cache.extend(
-                        [
-                            Load(
-                                magnitude=node.support.vertical_force,
-                                length=upper_bound,
-                                type=HingeSupport(),
-                            ),
-                            Load(
-                                magnitude=node.support.moment,
-                                length=upper_bound,
-                                type=PointMoment(magnitude=node.support.moment),
-                            ),
-                        ]
-                    )
-
-            if node.point_load:
-                eqn += f" + {node.point_load.vertical_force} * x"
-                self.cache.append(
-                    Load(
-                        magnitude=node.point_load.vertical_force,
-                        length=upper_bound,
-                        type=node.point_load,
-                    )
-                )
+            force, moment, udl = self._node_actions(node, self.reactions)
+            gradient = self._udl_gradient(node)
 
-            if node.distributed_load:
-                eqn += f" + {node.distributed_load.magnitude} * x * x / 2"
-                self.cache.append(
-                    ULoad(
-                        magnitude=node.distributed_load.magnitude,
-                        length=[upper_bound],
-                        type=node.distributed_load,
-                    )
-                )
+            resultant_force += force
+            resultant_moment += moment
 
-            if node.point_moment:
-                eqn += f" + {node.point_moment.magnitude}"
-                self.cache.append(
-                    Load(
-                        magnitude=node.point_moment.magnitude,
-                        length=upper_bound,
-                        type=node.point_moment,
-                    )
-                )
+            eqn = f"{resultant_moment} + {resultant_force} * x + {udl} * x * x / 2"
+            if gradient:
+                eqn += f" + {gradient} * x * x * x / 6"
 
-            bending_moment_equation = sympify(eqn)
-            shear_force_equation = Derivative(
-                bending_moment_equation, "x", evaluate=True
-            )
+            with stage("bending_shear.sympify"):
+                bending_moment_equation = sympify(eqn)
+            with stage("bending_shear.derivative"):
+                shear_force_equation = Derivative(
+                    bending_moment_equation, "x", evaluate=True
+                )
             boundary = Boundary(lower_bound=lower_bound, upper_bound=upper_bound)
             b = Equation(eqn=bending_moment_equation, boundary=boundary)
             s = Equation(eqn=shear_force_equation, boundary=boundary)
@@ -191,56 +290,216 @@ class BendingShearCalculator:
             self._shear_force_equations.append(s)
             self.points.append((lower_bound, upper_bound))
 
-        self.solved = True
+            resultant_moment += (
+                    resultant_force * upper_bound
+                    + udl * upper_bound * upper_bound / 2
+                    + gradient * upper_bound * upper_bound * upper_bound / 6
+            )
+            resultant_force += udl * upper_bound + gradient * upper_bound * upper_bound / 2
 
-    def calculate_bending(self):
+        self.solved = True
 
-        if not self.solved:
+    def _calculate(self):
+        if self.exact:
             self._calculate_bending_and_shear()
+        else:
+            self._calculate_numeric()
 
+    def _numeric_results(self, coefficients) -> list:
         p = self._convert_points(self.points)
-        b = []
+        upper_bounds = np.array([upper_bound for _, upper_bound in self.points])
 
-        for idx, eqn in enumerate(self.bending_moments_equations):
-            lower_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.lower_bound}), 2)
-            upper_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.upper_bound}), 2)
-            v = (lower_bound_val, upper_bound_val, p[idx][0], p[idx][1])
-            v = Result(
+        lower_bound_vals = np.round(polyval(coefficients, 0), 2).tolist()
+        upper_bound_vals = np.round(polyval(coefficients, upper_bounds), 2).tolist()
+
+        return [
+            Result(
                 lower_bound=p[idx][0],
                 upper_bound=p[idx][1],
-                lower_bound_val=lower_bound_val,
-                upper_bound_val=upper_bound_val,
-                eqn=eqn.eqn,
+                lower_bound_val=lower_bound_vals[idx],
+                upper_bound_val=upper_bound_vals[idx],
+                eqn=coefficients[:, idx],
             )
+            for idx in range(len(p))
+        ]
+
+    def calculate_bending(self):
+
+        if not self.solved:
+            self._calculate()
 
-            b.append(v)
+        if not self.exact:
+            with stage("bending_shear.evaluate"):
+                return self._numeric_results(self.moment_coefficients)
+
+        p = self._convert_points(self.points)
+        b = []
+
+        with stage("bending_shear.evaluate"):
+            for idx, eqn in enumerate(self.bending_moments_equations):
+                lower_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.lower_bound}), 2)
+                upper_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.upper_bound}), 2)
+                v = (lower_bound_val, upper_bound_val, p[idx][0], p[idx][1])
+                v = Result(
+                    lower_bound=p[idx][0],
+                    upper_bound=p[idx][1],
+                    lower_bound_val=lower_bound_val,
+                    upper_bound_val=upper_bound_val,
+                    eqn=eqn.eqn,
+                )
+
+                b.append(v)
 
         return b
 
     def calculate_shear(self):
 
         if not self.solved:
-            self._calculate_bending_and_shear()
+            self._calculate()
+
+        if not self.exact:
+            with stage("bending_shear.evaluate"):
+                return self._numeric_results(self.shear_coefficients)
 
         p = self._convert_points(self.points)
         s = []
 
-        for idx, eqn in enumerate(self.shear_force_equations):
-            lower_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.lower_bound}), 2)
-            upper_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.upper_bound}), 2)
-            # v = (lower_bound_val, upper_bound_val, p[idx][0], p[idx][1])
+        with stage("bending_shear.evaluate"):
+            for idx, eqn in enumerate(self.shear_force_equations):
+                lower_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.lower_bound}), 2)
+                upper_bound_val = round(eqn.eqn.subs({"x": eqn.boundary.upper_bound}), 2)
+                # v = (lower_bound_val, upper_bound_val, p[idx][0], p[idx][1])
+
+                v = Result(
+                    lower_bound=p[idx][0],
+                    upper_bound=p[idx][1],
+                    lower_bound_val=lower_bound_val,
+                    upper_bound_val=upper_bound_val,
+                    eqn=eqn.eqn,
+                )
 
-            v = Result(
+                s.append(v)
+
+        return s
+
+    def _coefficient_matrix(self, quantity: str) -> np.ndarray:
+        if quantity not in ("moment", "shear"):
+            raise ValueError("quantity must be 'moment' or 'shear'")
+
+        if not self.solved:
+            self._calculate()
+
+        if not self.exact:
+            return self.moment_coefficients if quantity == "moment" else self.shear_coefficients
+
+        from sympy import Poly, Symbol
+
+        equations = (
+            self.bending_moments_equations if quantity == "moment" else self.shear_force_equations
+        )
+        columns = [
+            [float(c) for c in Poly(equation.eqn, Symbol("x")).all_coeffs()]
+            for equation in equations
+        ]
+        degree = max(map(len, columns), default=1)
+        return np.array([[0.0] * (degree - len(column)) + column for column in columns]).T
+
+    def extremes(self, quantity: str = "moment") -> list:
+        """Maximum and minimum of every segment together with where they occur
+
+           Interior extremes are found where the derivative vanishes, e.g. the
+           maximum moment under a udl where the shear force is zero.
+
+           :param quantity: 'moment' or 'shear'
+           :return: an Extremes per segment, x measured along the beam
+        """
+        coefficients = self._coefficient_matrix(quantity)
+        p = self._convert_points(self.points)
+        lengths = [upper_bound for _, upper_bound in self.points]
+
+        maximum_x, maximum, minimum_x, minimum = (
+            values.tolist() for values in critical_points(coefficients, lengths)
+        )
+
+        return [
+            Extremes(
                 lower_bound=p[idx][0],
                 upper_bound=p[idx][1],
-                lower_bound_val=lower_bound_val,
-                upper_bound_val=upper_bound_val,
-                eqn=eqn.eqn,
+                maximum_x=p[idx][0] + maximum_x[idx],
+                maximum=maximum[idx],
+                minimum_x=p[idx][0] + minimum_x[idx],
+                minimum=minimum[idx],
             )
+            for idx in range(len(p))
+        ]
 
-            s.append(v)
+    def bending_moment(self) -> PiecewisePolynomial:
+        """Bending moment along the beam as a single piecewise polynomial"""
+        return self._piecewise("moment")
 
-        return s
+    def shear_force(self) -> PiecewisePolynomial:
+        """Shear force along the beam as a single piecewise polynomial"""
+        return self._piecewise("shear")
+
+    def elastic_curve(self, flexural_rigidity=None) -> ElasticCurve:
+        """Slope and deflection along the beam by integrating M / EI
+
+           Hinges and rollers fix the deflection, any other support fixes the
+           slope as well.
+
+           :param flexural_rigidity: EI, a number or one value per segment,
+                defaults to the section of a Member
+        """
+        if flexural_rigidity is None:
+            flexural_rigidity = Member.MODULUS_OF_ELASTICITY * Member.MOMENT_OF_INERTIA
+
+        moment = self.bending_moment()
+        deflection_restraints, slope_restraints = [], []
+
+        origin = None
+        for node in self.beam:
+            origin = node.x if origin is None else origin
+            if not node.support:
+                continue
+
+            deflection_restraints.append(node.x - origin)
+            if not isinstance(node.support, (HingeSupport, RollerSupport)):
+                slope_restraints.append(node.x - origin)
+
+        return elastic_curve(moment, flexural_rigidity, deflection_restraints, slope_restraints)
+
+    def _piecewise(self, quantity: str) -> PiecewisePolynomial:
+        coefficients = self._coefficient_matrix(quantity)
+        lengths = [upper_bound for _, upper_bound in self.points]
+
+        return PiecewisePolynomial(np.concatenate([[0.0], np.cumsum(lengths)]), coefficients)
+
+    def moment_extremes(self) -> list:
+        return self.extremes("moment")
+
+    def shear_extremes(self) -> list:
+        return self.extremes("shear")
+
+    def global_extremes(self, quantity: str = "moment") -> Extremes:
+        """Maximum and minimum over the whole beam
+
+           :param quantity: 'moment' or 'shear'
+        """
+        segments = self.extremes(quantity)
+        if not segments:
+            raise NotSolvedError("The beam has no segments")
+
+        maximum = max(segments, key=lambda segment: segment.maximum)
+        minimum = min(segments, key=lambda segment: segment.minimum)
+
+        return Extremes(
+            lower_bound=segments[0].lower_bound,
+            upper_bound=segments[-1].upper_bound,
+            maximum_x=maximum.maximum_x,
+            maximum=maximum.maximum,
+            minimum_x=minimum.minimum_x,
+            minimum=minimum.minimum,
+        )
 
     def draw_bending_moment_diagram(self):
         pass
@@ -0,0 +1,192 @@
+import functools
+import hashlib
+import os
+import pickle
+import tempfile
+from collections import OrderedDict
+
+import numpy as np
+
+from .columnar import ColumnarBeam
+
+# bumped whenever the layout of the fingerprint changes so old disk entries are not reused
+FINGERPRINT_VERSION = b"3"
+
+
+def _quantize(values: np.ndarray, tolerance: float) -> np.ndarray:
+    """Snaps floats to multiples of tolerance so nearly equal models hash the same
+
+       The multiples stay float64 rather than being cast to integers, which
+       would overflow for large values such as a modulus of elasticity of
+       2e11 and make them all hash the same. Adding 0.0 turns -0.0 into 0.0.
+    """
+    return np.round(np.asarray(values, dtype=float) / tolerance) + 0.0
+
+
+def fingerprint(beam, tolerance: float = 1e-9) -> str:
+    """Canonical hash of the geometry, supports, sections and loads of a beam
+
+       The fingerprint does not depend on the order the nodes and members
+       were added in, and values that round to the same multiple of
+       tolerance hash the same. Values closer than tolerance can still fall
+       either side of a rounding boundary and hash differently.
+
+       :param beam: Beam or ColumnarBeam
+       :param tolerance: resolution of the coordinates, properties and loads
+    """
+    columns = beam if isinstance(beam, ColumnarBeam) else ColumnarBeam.from_beam(beam)
+
+    x = _quantize(columns.x, tolerance)
+    y = _quantize(columns.y, tolerance)
+    order = np.lexsort((y, x))
+    number = np.empty_like(order)
+    number[order] = np.arange(len(order))
+
+    nodes = np.column_stack([
+        x[order],
+        y[order],
+        columns.restraints[order],
+        _quantize(columns.point_loads[order], tolerance),
+        _quantize(columns.point_moments[order], tolerance),
+    ])
+
+    members = np.column_stack([
+        number[columns.member_nodes],
+        _quantize(columns.modulus_of_elasticity, tolerance),
+        _quantize(columns.moment_of_inertia, tolerance),
+        _quantize(columns.cross_sectional_area, tolerance),
+        _quantize(columns.distributed_loads, tolerance),
+        _quantize(columns.distributed_load_start, tolerance),
+        _quantize(columns.distributed_load_length, tolerance),
+        _quantize(columns.distributed_load_gradients, tolerance),
+    ])
+    members = members[np.lexsort(members.T[::-1])]
+
+    digest = hashlib.blake2b(FINGERPRINT_VERSION, digest_size=16)
+    for table in (nodes, members):
+        digest.update(np.int64(table.shape).tobytes())
+        digest.update(np.ascontiguousarray(table, dtype=float).tobytes())
+
+    return digest.hexdigest()
+
+
+class ResultsCache:
+    def __init__(self, maxsize: int = 128, directory: str or os.PathLike = None):
+        """Least recently used cache of analysis results
+
+           :param maxsize: number of results kept in memory
+           :param directory: optional directory where every result is also
+                pickled, so results survive the process and evicted results
+                are read back instead of recomputed
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._results: OrderedDict = OrderedDict()
+
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._results or (
+            self.directory is not None and os.path.exists(self._path(key))
+        )
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.pickle")
+
+    def _remember(self, key: str, result):
+        self._results[key] = result
+        self._results.move_to_end(key)
+
+        while len(self._results) > self.maxsize:
+            self._results.popitem(last=False)
+
+    def get(self, key: str, default=None):
+        """Returns a cached result, looking in memory first and then on disk"""
+        if key in self._results:
+            self._results.move_to_end(key)
+            return self._results[key]
+
+        if self.directory is not None:
+            try:
+                with open(self._path(key), "rb") as file:
+                    result = pickle.load(file)
+            except FileNotFoundError:
+                return default
+
+            self._remember(key, result)
+            return result
+
+        return default
+
+    def put(self, key: str, result):
+        """Stores a result in memory and, when there is a directory, on disk"""
+        self._remember(key, result)
+
+        if self.directory is not None:
+            # write to a temporary file first so readers never see half a pickle
+            handle, temporary = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(handle, "wb") as file:
+                pickle.dump(result, file, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(temporary, self._path(key))
+
+    def get_or_compute(self, key: str, compute):
+        """Returns the cached result of key, or computes and caches it"""
+        missing = object()
+        result = self.get(key, missing)
+
+        if result is missing:
+            self.misses += 1
+            result = compute()
+            self.put(key, result)
+        else:
+            self.hits += 1
+
+        return result
+
+    def clear(self, disk: bool = False):
+        """Empties the memory tier, and the disk tier too when disk is True"""
+        self._results.clear()
+
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".pickle"):
+                    os.remove(os.path.join(self.directory, name))
+
+
+def cached(function=None, *, cache: ResultsCache = None, tolerance: float = 1e-9):
+    """Memoizes an analysis whose first argument is a beam
+
+       The key is the fingerprint of the beam together with the name of the
+       analysis and its other arguments, so equivalent beams share results.
+       Cached results are shared between callers and must not be mutated.
+
+           @cached
+           def analyse(beam):
+               return DirectStiffnessSolver(beam).solve()
+    """
+    if function is None:
+        return functools.partial(cached, cache=cache, tolerance=tolerance)
+
+    cache = ResultsCache() if cache is None else cache
+
+    @functools.wraps(function)
+    def wrapper(beam, *args, **kwargs):
+        arguments = hashlib.blake2b(
+            repr((function.__module__, function.__qualname__, args, sorted(kwargs.items()))).encode(),
+            digest_size=8,
+        ).hexdigest()
+        key = f"{fingerprint(beam, tolerance)}-{arguments}"
+
+        return cache.get_or_compute(key, lambda: function(beam, *args, **kwargs))
+
+    wrapper.cache = cache
+    return wrapper
@@ -0,0 +1,158 @@
+"""The nodes of a Beam linked from left to right
+
+StaticallyDeterminateSolver and BendingShearCalculator read a beam as a
+chain of nodes that carry their support and loads, the layout of the
+original Beam. NodeChain presents a Beam or a ColumnarBeam that way, with
+a support object built from the restraints of every supported node.
+"""
+from types import MappingProxyType
+from typing import Iterable
+
+from .beam import InternalHinge, InternalRoller, create_support
+from .structure import Structure
+
+
+class ChainNode:
+    __slots__ = ("x", "y", "next_", "support", "point_load", "distributed_load", "point_moment")
+
+    def __init__(self, node, support=None, distributed_load=None):
+        self.x = node.x
+        self.y = node.y
+        self.next_ = None
+        self.support = support
+        self.point_load = node.point_load
+        self.distributed_load = distributed_load
+        self.point_moment = node.point_moment
+
+    def __repr__(self):
+        return f'{self.__class__.__name__}(x={self.x}, y={self.y})'
+
+
+class NodeChain:
+    # total number of equilibrium equations
+    NUMBER_OF_EQUILIBRIUM_EQUATIONS: int = 3
+
+    def __init__(self, beam: Structure, supports: Iterable = ()):
+        """Links the nodes of a beam in order of x
+
+           The distributed load of a member is carried by the node it starts
+           at, so the members are expected to join neighbouring nodes.
+
+           :param beam: Beam or ColumnarBeam
+           :param supports: support objects to reuse for the supported nodes
+                at their x, e.g. the supports of a DeterminateResult so that
+                its reactions can be looked up
+           :raises SupportCreationError: if a node only restrains rotation
+        """
+        supports = {support.x: support for support in supports}
+        distributed_loads = {
+            member.start: member.distributed_load
+            for member in beam.get_members() if member.distributed_load
+        }
+
+        self.nodes = []
+        for node in sorted(beam.get_nodes(), key=lambda node: node.x):
+            support = None
+            if node.rx or node.ry or node.rm:
+                support = supports.get(node.x)
+                if support is None:
+                    support = create_support(rx=node.rx, ry=node.ry, rm=node.rm)
+                    support.x, support.y = node.x, node.y
+
+            self.nodes.append(ChainNode(node, support, distributed_loads.get(node)))
+
+        for node, next_ in zip(self.nodes, self.nodes[1:]):
+            node.next_ = next_
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    @property
+    def members(self) -> int:
+        supports = tuple(self.get_supports())
+
+        if len(supports) == 1:
+            if supports[0].get_num_of_restraints() == 3:
+                return 1
+
+        return len(supports) - 1
+
+    @property
+    def joints(self) -> int:
+        supports = tuple(self.get_supports())
+
+        if len(supports) == 1:
+            if supports[0].get_num_of_restraints() == 3:
+                return 1
+
+        return len(supports)
+
+    @property
+    def number_of_vertical_reactions(self) -> int:
+        return sum(support.get_vertical_reaction() for support in self.get_supports())
+
+    @property
+    def number_of_horizontal_reactions(self) -> int:
+        return sum(support.get_horizontal_reaction() for support in self.get_supports())
+
+    def is_geometrically_stable(self) -> bool:
+        reactions = self.get_total_support_reactions()
+        eqn_on_condition = self.get_eqn_on_conditions()
+
+        ie = 3 * self.members + reactions - (3 * self.joints + eqn_on_condition)
+
+        if ie == 0:
+            if self.number_of_vertical_reactions == 1:
+                return False
+            if self.number_of_horizontal_reactions == 0:
+                return False
+        return True
+
+    def classify_beam(self) -> str:
+        r = self.get_total_support_reactions()
+        rhs = self.NUMBER_OF_EQUILIBRIUM_EQUATIONS + self.get_eqn_on_conditions()
+
+        if r < rhs:
+            return "unstable"
+        elif r == rhs:
+            return "determinate"
+        else:
+            return "indeterminate"
+
+    def get_beam_information(self) -> MappingProxyType:
+        return MappingProxyType(
+            {
+                "point_loads": self.get_point_loads(),
+                "distributed_loads": self.get_distributed_loads(),
+                "point_moments": self.get_point_moments(),
+                "supports": self.get_supports(),
+            }
+        )
+
+    def get_supports(self) -> Iterable:
+        return (node.support for node in self if node.support)
+
+    def get_point_loads(self) -> Iterable:
+        return (node.point_load for node in self if node.point_load)
+
+    def get_distributed_loads(self) -> Iterable:
+        return (node.distributed_load for node in self if node.distributed_load)
+
+    def get_point_moments(self) -> Iterable:
+        return (node.point_moment for node in self if node.point_moment)
+
+    def get_eqn_on_conditions(self) -> int:
+        equations = 0
+        for support in self.get_supports():
+            if isinstance(support, InternalHinge):
+                equations += 1
+            elif isinstance(support, InternalRoller):
+                equations += 2
+
+        return equations
+
+    def get_total_support_reactions(self) -> int:
+        return sum(support.get_num_of_restraints() for support in self.get_supports())
@@ -0,0 +1,264 @@
+"""Solves beams streamed as JSON lines, one beam per line
+
+Every line is a beam document of structural_analysis.server, plus an
+optional id echoed back, optional section properties, and the x of every
+point moment:
+
+    {"id": "b1", "supports": [0, 6], "point_loads": [{"force": -10, "x": 2}],
+     "point_moments": [{"magnitude": 4, "x": 3}], "modulus_of_elasticity": 2e8}
+
+and every output line holds the reactions, the extreme moments and shears
+and the largest deflection of one beam, in input order. The deflection is
+null unless the line gives both the modulus_of_elasticity and the
+moment_of_inertia of the beam. Lines are read and
+written a chunk at a time, so the memory used does not grow with the input.
+
+    structural-analysis beams.jsonl --jobs 8 --format csv -o results.csv
+"""
+import argparse
+import collections
+import csv
+import itertools
+import json
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from .beam import Member
+from .columnar import ColumnarBeam
+from .direct_stiffness.solver import DirectStiffnessSolver
+from .query import SolvedBeam
+from .server import parse_beam
+
+QUANTITIES = ("moment", "shear")
+
+# columns of the csv output, a fixed end leaves the second support empty
+CSV_COLUMNS = (
+    "line",
+    "id",
+    *(
+        f"support_{support}_{field}"
+        for support in (1, 2) for field in ("x", "horizontal", "vertical", "moment")
+    ),
+    *(
+        f"{quantity}_{field}"
+        for quantity in QUANTITIES for field in ("maximum", "maximum_x", "minimum", "minimum_x")
+    ),
+    "deflection",
+    "deflection_x",
+    "error",
+)
+
+
+def beam_model(supports_x: list, loads: dict, document: dict) -> ColumnarBeam:
+    """Builds the beam of a parsed document with a node at every support and load position
+
+       A single support is a fixed end, two are a hinge and a roller.
+       Distributed loads are split over the members they cover and
+       overlapping loads add up.
+    """
+    udl_ends = [(start, start + length) for _, start, length, _ in loads["distributed_loads"]]
+    x = np.unique([
+        *supports_x,
+        *(row[1] for row in loads["point_loads"]),
+        *(row[1] for row in loads["point_moments"]),
+        *itertools.chain.from_iterable(udl_ends),
+    ])
+
+    restraints = np.zeros((len(x), 3), dtype=bool)
+    support_rows = np.searchsorted(x, supports_x)
+    restraints[support_rows[0], :2] = True
+    if len(supports_x) == 2:
+        restraints[support_rows[1], 1] = True
+    else:
+        restraints[support_rows[0], 2] = True
+
+    beam = ColumnarBeam.from_arrays(
+        x,
+        restraints=restraints,
+        modulus_of_elasticity=document.get("modulus_of_elasticity", Member.MODULUS_OF_ELASTICITY),
+        moment_of_inertia=document.get("moment_of_inertia", Member.MOMENT_OF_INERTIA),
+        cross_sectional_area=document.get("cross_sectional_area", Member.CROSS_SECTIONAL_AREA),
+    )
+
+    for force, load_x, horizontal in loads["point_loads"]:
+        beam.point_loads[np.searchsorted(x, load_x)] += (horizontal, force)
+    for magnitude, moment_x in loads["point_moments"]:
+        beam.point_moments[np.searchsorted(x, moment_x)] += magnitude
+
+    starts, ends = x[:-1], x[1:]
+    for (magnitude, start, length, end_magnitude), (_, end) in zip(
+            loads["distributed_loads"], udl_ends
+    ):
+        gradient = (end_magnitude - magnitude) / length
+        covered = (starts >= start) & (ends <= end)
+        beam.distributed_loads[covered] += magnitude + gradient * (starts[covered] - start)
+        beam.distributed_load_gradients[covered] += gradient
+
+    return beam
+
+
+def analyse(document) -> dict:
+    """Reactions, extreme moments and shears and the largest deflection of a beam document
+
+       The deflection is None when the document does not give both the
+       modulus_of_elasticity and the moment_of_inertia, the defaults of
+       Member are placeholders that would give meaningless deflections.
+
+       :raises ValueError: if the document is not a valid beam
+    """
+    if isinstance(document, dict) and not all(
+            isinstance(row, dict) and "x" in row for row in document.get("point_moments", [])
+    ):
+        raise ValueError("every one of point_moments needs an x")
+
+    _, supports_x, loads = parse_beam(document)
+    beam = beam_model(supports_x, loads, document)
+
+    solver = DirectStiffnessSolver(beam)
+    result = solver.solve()
+    solved = SolvedBeam.from_stiffness(solver, result)
+
+    output = {"id": document.get("id"), "reactions": []}
+    for support_x in supports_x:
+        horizontal, vertical, moment = result.reactions[np.searchsorted(solver.x, support_x)]
+        output["reactions"].append({
+            "x": support_x,
+            "horizontal": float(horizontal),
+            "vertical": float(vertical),
+            "moment": float(moment),
+        })
+
+    for quantity in QUANTITIES:
+        maximum_x, maximum, minimum_x, minimum = solved.polynomials[quantity].extremes()
+        output[quantity] = {
+            "maximum": maximum, "maximum_x": maximum_x, "minimum": minimum, "minimum_x": minimum_x
+        }
+
+    # the reactions, moments and shears do not depend on the section, the deflection does
+    if "modulus_of_elasticity" in document and "moment_of_inertia" in document:
+        maximum_x, maximum, minimum_x, minimum = solved.polynomials["deflection"].extremes()
+        output["deflection"] = (
+            {"value": maximum, "x": maximum_x} if abs(maximum) > abs(minimum)
+            else {"value": minimum, "x": minimum_x}
+        )
+    else:
+        output["deflection"] = None
+
+    return output
+
+
+def analyse_lines(lines: list) -> list:
+    """Work function of the pool, analyses (line number, text) pairs
+
+       A line that fails is reported with its error instead of stopping the
+       whole stream.
+    """
+    outputs = []
+    for number, text in lines:
+        try:
+            output = {"line": number, **analyse(json.loads(text))}
+        except Exception as error:
+            output = {"line": number, "error": f"{type(error).__name__}: {error}"}
+        outputs.append(output)
+
+    return outputs
+
+
+def chunks(file, size: int):
+    """Yields lists of up to size (line number, text) pairs, skipping blank lines"""
+    numbered = ((number, text) for number, text in enumerate(file, 1) if text.strip())
+
+    while True:
+        chunk = list(itertools.islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def solve_stream(file, jobs: int = 1, chunk_size: int = 256):
+    """Yields the output of every beam of a JSON lines file, in input order
+
+       With more than one job the chunks are solved on a process pool with
+       at most a few chunks per worker in flight, so neither the input nor
+       the outputs are ever held in memory as a whole.
+    """
+    if jobs <= 1:
+        for chunk in chunks(file, chunk_size):
+            yield from analyse_lines(chunk)
+        return
+
+    with ProcessPoolExecutor(jobs) as pool:
+        window = collections.deque()
+        for chunk in chunks(file, chunk_size):
+            window.append(pool.submit(analyse_lines, chunk))
+            if len(window) >= 2 * jobs:
+                yield from window.popleft().result()
+
+        while window:
+            yield from window.popleft().result()
+
+
+def csv_row(output: dict) -> dict:
+    """Flattens an output into the CSV_COLUMNS"""
+    row = {"line": output["line"], "id": output.get("id"), "error": output.get("error")}
+
+    for support, reaction in enumerate(output.get("reactions", []), 1):
+        for field, value in reaction.items():
+            row[f"support_{support}_{field}"] = value
+
+    for quantity in QUANTITIES:
+        for field, value in output.get(quantity, {}).items():
+            row[f"{quantity}_{field}"] = value
+
+    if output.get("deflection"):
+        row["deflection"] = output["deflection"]["value"]
+        row["deflection_x"] = output["deflection"]["x"]
+
+    return row
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="structural-analysis",
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument(
+        "input", nargs="?", type=argparse.FileType("r"), default=sys.stdin,
+        help="JSON lines file of beams, defaults to stdin",
+    )
+    parser.add_argument(
+        "--output", "-o", type=argparse.FileType("w"), default=sys.stdout,
+        help="file to write, defaults to stdout",
+    )
+    parser.add_argument("--format", choices=("jsonl", "csv"), default="jsonl")
+    parser.add_argument("--jobs", "-j", type=int, default=1, help="worker processes")
+    parser.add_argument("--chunk-size", type=int, default=256, help="beams per work unit")
+    args = parser.parse_args(argv)
+
+    writer = csv.DictWriter(args.output, CSV_COLUMNS, lineterminator="\n")
+    if args.format == "csv":
+        writer.writeheader()
+
+    def write(output: dict):
+        if args.format == "csv":
+            writer.writerow(csv_row(output))
+        else:
+            args.output.write(json.dumps(output) + "\n")
+
+    failed = 0
+    for output in solve_stream(args.input, args.jobs, args.chunk_size):
+        failed += "error" in output
+        write(output)
+
+    args.output.flush()
+    if failed:
+        print(f"{failed} beams could not be solved", file=sys.stderr)
+
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
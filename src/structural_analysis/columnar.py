@@ -0,0 +1,444 @@
+import math
+from collections.abc import Mapping, Sequence
+
+import numpy as np
+
+from .beam import Beam, Member
+from .load import (
+    PointLoad,
+    PointLoads,
+    PointMoment,
+    PointMoments,
+    TrapezoidalLoad,
+    UniformlyDistributedLoad,
+    UniformlyDistributedLoads,
+)
+from .structure import Structure
+
+
+def _column(table: str, name: str, doc: str) -> property:
+    def getter(self):
+        count = self.node_count if table == "_nodes" else self.member_count
+        return getattr(self, table)[name][:count]
+
+    return property(getter, doc=doc)
+
+
+def _grow(columns: dict, size: int):
+    """Grows every column to hold size rows, doubling so appends are amortized O(1)"""
+    for name, column in columns.items():
+        if len(column) < size:
+            grown = np.zeros((max(size, 2 * len(column)),) + column.shape[1:], dtype=column.dtype)
+            grown[:len(column)] = column
+            columns[name] = grown
+
+
+class NodeView:
+    """A row of the node columns of a ColumnarBeam, used wherever a Node is"""
+    __slots__ = ("beam", "row")
+
+    def __init__(self, beam: "ColumnarBeam", row: int):
+        self.beam = beam
+        self.row = row
+
+    def __repr__(self):
+        return f'Node(x={self.x}, y={self.y})'
+
+    def __eq__(self, other):
+        if hasattr(other, "x") and hasattr(other, "y") and hasattr(other, "rx"):
+            return (self.x, self.y) == (other.x, other.y)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.x, self.y))
+
+    @property
+    def x(self) -> float:
+        return float(self.beam.x[self.row])
+
+    @property
+    def y(self) -> float:
+        return float(self.beam.y[self.row])
+
+    @property
+    def rx(self) -> bool:
+        return bool(self.beam.restraints[self.row, 0])
+
+    @property
+    def ry(self) -> bool:
+        return bool(self.beam.restraints[self.row, 1])
+
+    @property
+    def rm(self) -> bool:
+        return bool(self.beam.restraints[self.row, 2])
+
+    @property
+    def point_load(self) -> PointLoad or None:
+        horizontal, vertical = self.beam.point_loads[self.row].tolist()
+        if not (horizontal or vertical):
+            return None
+
+        load = PointLoad(
+            math.hypot(horizontal, vertical), math.degrees(math.atan2(vertical, horizontal))
+        )
+        # the defaults of PointLoad round its components, keep the stored ones
+        load.horizontal_force, load.vertical_force = horizontal, vertical
+        load.x, load.y = self.x, self.y
+        return load
+
+    @property
+    def point_moment(self) -> PointMoment or None:
+        magnitude = float(self.beam.point_moments[self.row])
+        if not magnitude:
+            return None
+
+        load = PointMoment(magnitude)
+        load.x, load.y = self.x, self.y
+        return load
+
+
+class MemberView:
+    """A row of the member columns of a ColumnarBeam, used wherever a Member is"""
+    __slots__ = ("beam", "row")
+
+    def __init__(self, beam: "ColumnarBeam", row: int):
+        self.beam = beam
+        self.row = row
+
+    def __repr__(self):
+        return f"Member(start={self.start}, end={self.end})"
+
+    def __eq__(self, other):
+        if isinstance(other, MemberView):
+            return (self.beam, self.row) == (other.beam, other.row)
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.beam), self.row))
+
+    @property
+    def start(self) -> NodeView:
+        return NodeView(self.beam, int(self.beam.member_nodes[self.row, 0]))
+
+    @property
+    def end(self) -> NodeView:
+        return NodeView(self.beam, int(self.beam.member_nodes[self.row, 1]))
+
+    @property
+    def length(self) -> float:
+        start, end = self.beam.member_nodes[self.row]
+        return math.hypot(
+            self.beam.x[end] - self.beam.x[start], self.beam.y[end] - self.beam.y[start]
+        )
+
+    @property
+    def modulus_of_elasticity(self) -> float:
+        return float(self.beam.modulus_of_elasticity[self.row])
+
+    @property
+    def moment_of_inertia(self) -> float:
+        return float(self.beam.moment_of_inertia[self.row])
+
+    @property
+    def cross_sectional_area(self) -> float:
+        return float(self.beam.cross_sectional_area[self.row])
+
+    @property
+    def distributed_load(self) -> UniformlyDistributedLoad or TrapezoidalLoad or None:
+        magnitude = float(self.beam.distributed_loads[self.row])
+        gradient = float(self.beam.distributed_load_gradients[self.row])
+        if not magnitude and not gradient:
+            return None
+
+        length = min(float(self.beam.distributed_load_length[self.row]), self.length)
+        if gradient:
+            load = TrapezoidalLoad(magnitude, magnitude + gradient * length, length)
+        else:
+            load = UniformlyDistributedLoad(magnitude, length)
+        load.start = self.start.x + float(self.beam.distributed_load_start[self.row])
+        return load
+
+
+class Rows(Sequence):
+    """Lazy sequence of NodeView or MemberView over the given rows"""
+
+    def __init__(self, beam: "ColumnarBeam", view: type, rows: np.ndarray):
+        self.beam = beam
+        self.view = view
+        self.rows = rows
+
+    def __len__(self):
+        return len(self.rows)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            return Rows(self.beam, self.view, self.rows[idx])
+        return self.view(self.beam, int(self.rows[idx]))
+
+
+class NodeIndex(Mapping):
+    """Maps nodes to their row by a binary search of coordinates sorted by (x, y)"""
+
+    def __init__(self, nodes: Sequence, x: np.ndarray, y: np.ndarray):
+        self.nodes = nodes
+        self.x = x
+        self.y = y
+
+    def __getitem__(self, node) -> int:
+        lower = np.searchsorted(self.x, node.x, side="left")
+        upper = np.searchsorted(self.x, node.x, side="right")
+        idx = lower + np.searchsorted(self.y[lower:upper], node.y)
+
+        if idx == upper or self.y[idx] != node.y:
+            raise KeyError(node)
+        return int(idx)
+
+    def __iter__(self):
+        return iter(self.nodes)
+
+    def __len__(self):
+        return len(self.nodes)
+
+
+class ColumnarBeam(Structure):
+
+    def __init__(self):
+        """Beam stored as contiguous arrays, one column per attribute
+
+           Nodes and members are rows of the columns, NodeView and MemberView
+           are created on demand so a model of millions of nodes costs a few
+           bytes per node and the solvers read the columns directly. Point
+           loads are stored as (horizontal, vertical) components, point
+           moments are clockwise positive and distributed loads are vertical
+           with a start and a length along the member.
+        """
+        self.node_count = 0
+        self.member_count = 0
+
+        self._nodes = {
+            "x": np.zeros(0),
+            "y": np.zeros(0),
+            "restraints": np.zeros((0, 3), dtype=bool),
+            "point_loads": np.zeros((0, 2)),
+            "point_moments": np.zeros(0),
+        }
+        self._members = {
+            "member_nodes": np.zeros((0, 2), dtype=np.int64),
+            "modulus_of_elasticity": np.zeros(0),
+            "moment_of_inertia": np.zeros(0),
+            "cross_sectional_area": np.zeros(0),
+            "distributed_loads": np.zeros(0),
+            "distributed_load_start": np.zeros(0),
+            "distributed_load_length": np.zeros(0),
+            "distributed_load_gradients": np.zeros(0),
+        }
+
+        # (x, y) -> row, only built when nodes are added one at a time
+        self._ids = None
+
+    x = _column("_nodes", "x", "x coordinate of every node")
+    y = _column("_nodes", "y", "y coordinate of every node")
+    restraints = _column("_nodes", "restraints", "rx, ry and rm of every node")
+    point_loads = _column("_nodes", "point_loads", "horizontal and vertical point load on every node")
+    point_moments = _column("_nodes", "point_moments", "clockwise point moment on every node")
+
+    member_nodes = _column("_members", "member_nodes", "start and end node rows of every member")
+    modulus_of_elasticity = _column("_members", "modulus_of_elasticity", "E of every member")
+    moment_of_inertia = _column("_members", "moment_of_inertia", "I of every member")
+    cross_sectional_area = _column("_members", "cross_sectional_area", "A of every member")
+    distributed_loads = _column("_members", "distributed_loads", "udl magnitude on every member")
+    distributed_load_start = _column(
+        "_members", "distributed_load_start", "start of the udl from the start of every member"
+    )
+    distributed_load_length = _column("_members", "distributed_load_length", "length of every udl")
+    distributed_load_gradients = _column(
+        "_members",
+        "distributed_load_gradients",
+        "change of the udl magnitude per unit length, for triangular and trapezoidal loads",
+    )
+
+    @classmethod
+    def from_arrays(
+            cls,
+            x,
+            y=None,
+            restraints=None,
+            member_nodes=None,
+            *,
+            modulus_of_elasticity=None,
+            moment_of_inertia=None,
+            cross_sectional_area=None,
+    ) -> "ColumnarBeam":
+        """Builds a beam from arrays without creating a Python object per node
+
+           :param x: x coordinates of the nodes
+           :param y: y coordinates of the nodes (defaults to 0)
+           :param restraints: (n, 3) rx, ry and rm of the nodes (defaults to free)
+           :param member_nodes: (m, 2) start and end node rows of the members
+                (defaults to a member between consecutive nodes)
+        """
+        x = np.asarray(x, dtype=float)
+        y = np.zeros_like(x) if y is None else np.broadcast_to(np.asarray(y, dtype=float), x.shape)
+
+        order = np.lexsort((y, x))
+        if np.any((np.diff(x[order]) == 0) & (np.diff(y[order]) == 0)):
+            raise ValueError("two nodes cannot share the same coordinates")
+
+        if member_nodes is None:
+            member_nodes = np.stack([np.arange(len(x) - 1), np.arange(1, len(x))], axis=1)
+        member_nodes = np.asarray(member_nodes, dtype=np.int64).reshape(-1, 2)
+
+        if member_nodes.size and (member_nodes.min() < 0 or member_nodes.max() >= len(x)):
+            raise ValueError("members must connect nodes of the beam")
+
+        beam = cls()
+        beam.node_count, beam.member_count = len(x), len(member_nodes)
+
+        beam._nodes["x"] = x.copy()
+        beam._nodes["y"] = y.copy()
+        beam._nodes["restraints"] = (
+            np.zeros((len(x), 3), dtype=bool) if restraints is None
+            else np.array(np.broadcast_to(restraints, (len(x), 3)), dtype=bool)
+        )
+        beam._nodes["point_loads"] = np.zeros((len(x), 2))
+        beam._nodes["point_moments"] = np.zeros(len(x))
+
+        members = beam._members
+        members["member_nodes"] = member_nodes.copy()
+        for name, value, default in (
+                ("modulus_of_elasticity", modulus_of_elasticity, Member.MODULUS_OF_ELASTICITY),
+                ("moment_of_inertia", moment_of_inertia, Member.MOMENT_OF_INERTIA),
+                ("cross_sectional_area", cross_sectional_area, Member.CROSS_SECTIONAL_AREA),
+        ):
+            members[name] = np.array(
+                np.broadcast_to(default if value is None else value, len(member_nodes)), dtype=float
+            )
+        members["distributed_loads"] = np.zeros(len(member_nodes))
+        members["distributed_load_start"] = np.zeros(len(member_nodes))
+        members["distributed_load_length"] = np.full(len(member_nodes), np.inf)
+        members["distributed_load_gradients"] = np.zeros(len(member_nodes))
+
+        return beam
+
+    @classmethod
+    def from_beam(cls, beam: Beam) -> "ColumnarBeam":
+        """Copies the nodes, members and loads of a Beam into columns"""
+        nodes, members = beam.nodes, beam.get_members()
+        columnar = cls.from_arrays(
+            np.fromiter((node.x for node in nodes), dtype=float, count=len(nodes)),
+            np.fromiter((node.y for node in nodes), dtype=float, count=len(nodes)),
+            np.array([(node.rx, node.ry, node.rm) for node in nodes], dtype=bool).reshape(-1, 3),
+            beam.member_nodes,
+            modulus_of_elasticity=[member.modulus_of_elasticity for member in members],
+            moment_of_inertia=[member.moment_of_inertia for member in members],
+            cross_sectional_area=[member.cross_sectional_area for member in members],
+        )
+
+        for row, node in enumerate(nodes):
+            if node.point_load:
+                columnar.point_loads[row] += (
+                    node.point_load.horizontal_force, node.point_load.vertical_force
+                )
+            if node.point_moment:
+                columnar.point_moments[row] += node.point_moment.magnitude
+
+        for row, member in enumerate(members):
+            load = member.distributed_load
+            if load:
+                columnar._set_distributed_load(row, load)
+                columnar.distributed_load_start[row] = load.start - member.start.x
+
+        return columnar
+
+    def _node_ids(self) -> dict:
+        if self._ids is None:
+            self._ids = dict(zip(zip(self.x.tolist(), self.y.tolist()), range(self.node_count)))
+        return self._ids
+
+    def add_node(self, node):
+        """Appends a node (anything with x, y, rx, ry, rm and loads) as a row"""
+        self._node_ids()
+
+        key = (float(node.x), float(node.y))
+        if key in self._ids:
+            return
+
+        row = self.node_count
+        _grow(self._nodes, row + 1)
+        self.node_count += 1
+        self._ids[key] = row
+
+        self.x[row], self.y[row] = key
+        self.restraints[row] = (node.rx, node.ry, node.rm)
+        if getattr(node, "point_load", None):
+            self.point_loads[row] = (node.point_load.horizontal_force, node.point_load.vertical_force)
+        if getattr(node, "point_moment", None):
+            self.point_moments[row] = node.point_moment.magnitude
+
+    def add_member(self, start, end, *args, distributed_load=None, modulus_of_elasticity=None,
+                   moment_of_inertia=None, cross_sectional_area=None):
+        """Appends a member between two nodes that are already rows of the beam"""
+        ids = self._node_ids()
+        start_row = ids.get((float(start.x), float(start.y)))
+        end_row = ids.get((float(end.x), float(end.y)))
+        if start_row is None or end_row is None:
+            return
+
+        row = self.member_count
+        _grow(self._members, row + 1)
+        self.member_count += 1
+
+        self.member_nodes[row] = (start_row, end_row)
+        self.modulus_of_elasticity[row] = (
+            Member.MODULUS_OF_ELASTICITY if modulus_of_elasticity is None else modulus_of_elasticity
+        )
+        self.moment_of_inertia[row] = (
+            Member.MOMENT_OF_INERTIA if moment_of_inertia is None else moment_of_inertia
+        )
+        self.cross_sectional_area[row] = (
+            Member.CROSS_SECTIONAL_AREA if cross_sectional_area is None else cross_sectional_area
+        )
+        self.distributed_load_length[row] = np.inf
+        if distributed_load:
+            self._set_distributed_load(row, distributed_load)
+
+    def _set_distributed_load(self, row: int, load):
+        """Stores a uniform, triangular or trapezoidal load as a magnitude and a gradient"""
+        if isinstance(load, TrapezoidalLoad):
+            self.distributed_loads[row] = load.start_magnitude
+            self.distributed_load_gradients[row] = load.gradient
+        else:
+            self.distributed_loads[row] = load.magnitude
+        self.distributed_load_length[row] = load.length
+
+    def set_point_loads(self, rows, loads: PointLoads):
+        """Puts a table of point loads on the given node rows"""
+        self.point_loads[rows] = np.stack([loads.horizontal_force, loads.vertical_force], axis=1)
+
+    def set_point_moments(self, rows, loads: PointMoments):
+        """Puts a table of point moments on the given node rows"""
+        self.point_moments[rows] = loads.magnitude
+
+    def set_distributed_loads(self, rows, loads: UniformlyDistributedLoads):
+        """Puts a table of uniformly distributed loads on the given member rows
+
+           Loads without a start begin at the start of their member.
+        """
+        rows = np.asarray(rows)
+        self.distributed_loads[rows] = loads.magnitude
+        self.distributed_load_gradients[rows] = 0.0
+        self.distributed_load_length[rows] = loads.length
+        self.distributed_load_start[rows] = (
+            0.0 if loads.start is None else loads.start - self.x[self.member_nodes[rows, 0]]
+        )
+
+    def get_nodes(self) -> Rows:
+        return Rows(self, NodeView, np.arange(self.node_count))
+
+    def get_members(self) -> Rows:
+        return Rows(self, MemberView, np.arange(self.member_count))
+
+    @property
+    def nbytes(self) -> int:
+        """Memory used by the columns"""
+        return sum(column.nbytes for column in (*self._nodes.values(), *self._members.values()))
@@ -0,0 +1,77 @@
+import attrs
+import numpy as np
+
+from .beam_errors import GeometricallyUnstableExternally
+from .piecewise import PiecewisePolynomial
+
+
+@attrs.define(frozen=True, slots=True)
+class ElasticCurve:
+    """Slope and deflection along a beam, upward deflections and counterclockwise slopes positive"""
+    slope: PiecewisePolynomial = attrs.field()
+    deflection: PiecewisePolynomial = attrs.field()
+
+    def maximum_deflection(self) -> tuple:
+        """Location and value of the largest deflection in magnitude, found analytically"""
+        maximum_x, maximum, minimum_x, minimum = self.deflection.extremes()
+
+        return (maximum_x, maximum) if abs(maximum) > abs(minimum) else (minimum_x, minimum)
+
+    def within(self, limit: float) -> bool:
+        """Whether no deflection exceeds limit in magnitude, e.g. span / 360"""
+        return abs(self.maximum_deflection()[1]) <= limit
+
+
+def elastic_curve(
+        moment: PiecewisePolynomial,
+        flexural_rigidity,
+        deflection_restraints,
+        slope_restraints=(),
+) -> ElasticCurve:
+    """Integrates M / EI twice along a beam, exactly, segment by segment
+
+       The two constants of integration come from the supports, a least
+       squares fit handles more restraints than constants since the moments
+       of an indeterminate beam already satisfy the extra ones. The curve is
+       continuous across every breakpoint, so internal hinges are not
+       supported.
+
+       :param moment: bending moment along the beam, sagging positive
+       :param flexural_rigidity: EI, a number or one value per segment
+       :param deflection_restraints: x coordinates where the deflection is zero
+       :param slope_restraints: x coordinates where the slope is zero
+       :raises GeometricallyUnstableExternally: if the restraints do not fix the curve
+    """
+    flexural_rigidity = np.broadcast_to(np.asarray(flexural_rigidity, dtype=float), (len(moment),))
+    curvature = PiecewisePolynomial(moment.breakpoints, moment.coefficients / flexural_rigidity)
+
+    slope = curvature.integral()
+    deflection = slope.integral()
+    origin = moment.breakpoints[0]
+
+    # slope + c1 and deflection + c1 * (x - origin) + c2 vanish at the restraints
+    deflection_restraints = np.asarray(deflection_restraints, dtype=float).reshape(-1)
+    slope_restraints = np.asarray(slope_restraints, dtype=float).reshape(-1)
+
+    a = np.vstack([
+        np.column_stack([deflection_restraints - origin, np.ones_like(deflection_restraints)]),
+        np.column_stack([np.ones_like(slope_restraints), np.zeros_like(slope_restraints)]),
+    ])
+    b = -1 * np.concatenate([deflection(deflection_restraints), slope(slope_restraints)])
+
+    if np.linalg.matrix_rank(a) < 2:
+        raise GeometricallyUnstableExternally("The supports do not fix the elastic curve")
+
+    (c1, c2), *_ = np.linalg.lstsq(a, b, rcond=None)
+
+    slope_coefficients = slope.coefficients.copy()
+    slope_coefficients[-1] += c1
+
+    deflection_coefficients = deflection.coefficients.copy()
+    deflection_coefficients[-2] += c1
+    deflection_coefficients[-1] += c1 * (moment.breakpoints[:-1] - origin) + c2
+
+    return ElasticCurve(
+        slope=PiecewisePolynomial(moment.breakpoints, slope_coefficients),
+        deflection=PiecewisePolynomial(moment.breakpoints, deflection_coefficients),
+    )
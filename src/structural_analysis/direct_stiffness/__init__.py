@@ -0,0 +1,2 @@
+from ..beam import Beam, Node, Member
+from .. import GeometricallyUnstableExternally, LoadCase, LoadCombination
@@ -0,0 +1,460 @@
+from collections.abc import Mapping, Sequence
+from typing import Iterable
+
+import attrs
+import numpy as np
+from scipy.linalg import LinAlgError, cho_solve_banded, cholesky_banded
+
+from . import Beam, Node, GeometricallyUnstableExternally, LoadCase, LoadCombination
+from ..load import TrapezoidalLoad
+from ..columnar import ColumnarBeam, NodeIndex, NodeView, Rows
+from ..profiling import profiled, stage
+
+# ux, uy and rz at every node
+DOF_PER_NODE = 3
+
+# 3 point Gauss-Legendre rule on [-1, 1], exact for the polynomials of the
+# fixed end forces of linearly varying loads
+GAUSS_POINTS = np.array([-np.sqrt(3 / 5), 0.0, np.sqrt(3 / 5)])
+GAUSS_WEIGHTS = np.array([5 / 9, 8 / 9, 5 / 9])
+
+
+def transformation_matrices(cos: np.ndarray, sin: np.ndarray) -> np.ndarray:
+    """Returns the (m, 6, 6) global to local transformation matrices of m members"""
+    t = np.zeros((len(cos), 6, 6))
+
+    for offset in (0, 3):
+        t[:, offset, offset] = cos
+        t[:, offset, offset + 1] = sin
+        t[:, offset + 1, offset] = -sin
+        t[:, offset + 1, offset + 1] = cos
+        t[:, offset + 2, offset + 2] = 1
+
+    return t
+
+
+def local_stiffness_matrices(length: np.ndarray, ea: np.ndarray, ei: np.ndarray) -> np.ndarray:
+    """Returns the (m, 6, 6) local stiffness matrices of m plane frame members"""
+    k = np.zeros((len(length), 6, 6))
+
+    axial = ea / length
+    k[:, 0, 0] = k[:, 3, 3] = axial
+    k[:, 0, 3] = k[:, 3, 0] = -axial
+
+    k[:, 1, 1] = k[:, 4, 4] = 12 * ei / length ** 3
+    k[:, 1, 4] = k[:, 4, 1] = -12 * ei / length ** 3
+    k[:, 1, 2] = k[:, 2, 1] = k[:, 1, 5] = k[:, 5, 1] = 6 * ei / length ** 2
+    k[:, 2, 4] = k[:, 4, 2] = k[:, 4, 5] = k[:, 5, 4] = -6 * ei / length ** 2
+    k[:, 2, 2] = k[:, 5, 5] = 4 * ei / length
+    k[:, 2, 5] = k[:, 5, 2] = 2 * ei / length
+
+    return k
+
+
+def point_equivalent_nodal_loads(
+        length: np.ndarray, axial: np.ndarray, transverse: np.ndarray, a: np.ndarray
+) -> np.ndarray:
+    """Returns the (..., 6) local equivalent nodal loads of point loads on members
+
+       :param length: member lengths
+       :param axial: load along the member axis
+       :param transverse: load perpendicular to the member axis
+       :param a: distance of the load from the start node
+    """
+    b = length - a
+
+    loads = np.zeros(np.shape(a) + (6,))
+    loads[..., 0] = axial * b / length
+    loads[..., 3] = axial * a / length
+    loads[..., 1] = transverse * b ** 2 * (3 * a + b) / length ** 3
+    loads[..., 2] = transverse * a * b ** 2 / length ** 2
+    loads[..., 4] = transverse * a ** 2 * (a + 3 * b) / length ** 3
+    loads[..., 5] = -1 * transverse * a ** 2 * b / length ** 2
+
+    return loads
+
+
+def equivalent_nodal_loads(
+        length: np.ndarray,
+        axial: np.ndarray,
+        transverse: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        axial_gradient: np.ndarray = 0.0,
+        transverse_gradient: np.ndarray = 0.0,
+) -> np.ndarray:
+    """Returns the (m, 6) local equivalent nodal loads of uniform or linearly varying member loads
+
+       The fixed end forces of a point load are integrated over the loaded
+       part of every member with a Gauss-Legendre rule, which is exact for
+       uniform and linearly varying loads.
+
+       :param length: member lengths
+       :param axial: load intensity along the member axis at the start of the load
+       :param transverse: load intensity perpendicular to the member axis at the start of the load
+       :param start: distance of the start of the load from the start node
+       :param end: distance of the end of the load from the start node
+       :param axial_gradient: change of the axial intensity per unit length
+       :param transverse_gradient: change of the transverse intensity per unit length
+    """
+    half_width = ((end - start) / 2)[:, None]
+    a = ((end + start) / 2)[:, None] + half_width * GAUSS_POINTS
+    weights = (GAUSS_WEIGHTS * half_width)[:, :, None]
+
+    distance = a - start[:, None]
+    loads = point_equivalent_nodal_loads(
+        length[:, None],
+        axial[:, None] + np.reshape(axial_gradient, (-1, 1)) * distance,
+        transverse[:, None] + np.reshape(transverse_gradient, (-1, 1)) * distance,
+        a,
+    )
+
+    return (weights * loads).sum(axis=1)
+
+
+@attrs.define(frozen=True, slots=True)
+class StiffnessResult:
+    """Results of a direct stiffness analysis
+
+       Displacements are ``(ux, uy, rz)`` with rz counterclockwise, reactions
+       are ``(horizontal, vertical, moment)`` and member end forces are
+       ``(N1, V1, M1, N2, V2, M2)`` in member axes. Moments follow the sign
+       convention of the package (clockwise positive).
+    """
+    nodes: Sequence = attrs.field()
+    members: Sequence = attrs.field()
+    displacements: np.ndarray = attrs.field(repr=False)
+    reactions: np.ndarray = attrs.field(repr=False)
+    member_forces: np.ndarray = attrs.field(repr=False)
+    node_index: Mapping = attrs.field(repr=False)
+
+    def displacement(self, node: Node) -> np.ndarray:
+        return self.displacements[self.node_index[node]]
+
+    def reaction(self, node: Node) -> np.ndarray:
+        return self.reactions[self.node_index[node]]
+
+
+@attrs.define(frozen=True, slots=True)
+class LoadCaseResults:
+    """Results of many load cases (or combinations) stacked along the first axis"""
+    names: tuple = attrs.field()
+    nodes: Sequence = attrs.field(repr=False)
+    members: Sequence = attrs.field(repr=False)
+    displacements: np.ndarray = attrs.field(repr=False)
+    reactions: np.ndarray = attrs.field(repr=False)
+    member_forces: np.ndarray = attrs.field(repr=False)
+    node_index: Mapping = attrs.field(repr=False)
+
+    def __getitem__(self, name: str) -> StiffnessResult:
+        idx = self.names.index(name)
+
+        return StiffnessResult(
+            nodes=self.nodes,
+            members=self.members,
+            displacements=self.displacements[idx],
+            reactions=self.reactions[idx],
+            member_forces=self.member_forces[idx],
+            node_index=self.node_index,
+        )
+
+    def combine(self, combinations: Iterable[LoadCombination]) -> "LoadCaseResults":
+        """Superposes the load case results with a single matrix multiply
+
+           :param combinations: combinations whose factors are keyed by load case name
+        """
+        combinations = tuple(combinations)
+        factors = np.zeros((len(combinations), len(self.names)))
+
+        for row, combination in enumerate(combinations):
+            for name, factor in combination.factors.items():
+                if name not in self.names:
+                    raise ValueError(f"{combination.name} refers to an unknown load case {name!r}")
+                factors[row, self.names.index(name)] = factor
+
+        return LoadCaseResults(
+            names=tuple(combination.name for combination in combinations),
+            nodes=self.nodes,
+            members=self.members,
+            displacements=np.tensordot(factors, self.displacements, axes=1),
+            reactions=np.tensordot(factors, self.reactions, axes=1),
+            member_forces=np.tensordot(factors, self.member_forces, axes=1),
+            node_index=self.node_index,
+        )
+
+
+class DirectStiffnessSolver:
+    @profiled("stiffness.setup")
+    def __init__(self, beam: Beam):
+        """Analyses a Beam of Nodes and Members with the direct stiffness method
+
+           The global stiffness matrix is assembled in symmetric banded storage
+           with the nodes numbered along the beam, so the bandwidth does not
+           grow with the number of members and the solve is linear in size.
+
+           :param beam: beam whose nodes carry the rx/ry/rm restraints
+        """
+        self.beam = beam
+        self.columns = columns = (
+            beam if isinstance(beam, ColumnarBeam) else ColumnarBeam.from_beam(beam)
+        )
+
+        # number the nodes along the beam and map the member node rows onto that numbering
+        self.order = order = np.lexsort((columns.y, columns.x))
+        number = np.empty_like(order)
+        number[order] = np.arange(len(order))
+
+        if isinstance(beam, ColumnarBeam):
+            self.nodes = Rows(columns, NodeView, order)
+            self.members = beam.get_members()
+        else:
+            self.nodes = tuple(beam.nodes[idx] for idx in order)
+            self.members = tuple(beam.get_members())
+
+        self.x, self.y = columns.x[order], columns.y[order]
+        self.node_index = NodeIndex(self.nodes, self.x, self.y)
+
+        self.restrained = columns.restraints[order].reshape(-1)
+        self.free = np.flatnonzero(~self.restrained)
+
+        self.member_nodes = number[columns.member_nodes]
+        start, end = self.member_nodes[:, 0], self.member_nodes[:, 1]
+        self.member_dofs = np.concatenate(
+            [DOF_PER_NODE * start[:, None] + np.arange(DOF_PER_NODE),
+             DOF_PER_NODE * end[:, None] + np.arange(DOF_PER_NODE)],
+            axis=1,
+        )
+
+        dx, dy = self.x[end] - self.x[start], self.y[end] - self.y[start]
+        self.lengths = np.hypot(dx, dy)
+        self.cos, self.sin = dx / self.lengths, dy / self.lengths
+
+        self.transformations = transformation_matrices(self.cos, self.sin)
+        self.local_stiffness = local_stiffness_matrices(
+            self.lengths,
+            columns.modulus_of_elasticity * columns.cross_sectional_area,
+            columns.modulus_of_elasticity * columns.moment_of_inertia,
+        )
+        self.global_stiffness = (
+                self.transformations.transpose(0, 2, 1) @ self.local_stiffness @ self.transformations
+        )
+        self._factor = None
+
+    def _banded_stiffness_matrix(self) -> np.ndarray:
+        """Assembles the free-free stiffness matrix in upper banded storage"""
+        free_number = np.full(len(self.restrained), -1)
+        free_number[self.free] = np.arange(len(self.free))
+
+        rows = np.broadcast_to(free_number[self.member_dofs][:, :, None], self.global_stiffness.shape)
+        cols = np.broadcast_to(free_number[self.member_dofs][:, None, :], self.global_stiffness.shape)
+        mask = (rows >= 0) & (cols >= 0) & (rows <= cols)
+
+        rows, cols, values = rows[mask], cols[mask], self.global_stiffness[mask]
+        bandwidth = int((cols - rows).max(initial=0))
+
+        # scipy's upper form: ab[u + i - j, j] == a[i, j]
+        flat_index = (bandwidth + rows - cols) * len(self.free) + cols
+        banded = np.bincount(
+            flat_index, weights=values, minlength=(bandwidth + 1) * len(self.free)
+        )
+
+        return banded.reshape(bandwidth + 1, len(self.free))
+
+    def factorize(self) -> np.ndarray:
+        """Returns the banded Cholesky factor of the stiffness matrix
+
+           The factor only depends on the structure, it is computed once and
+           reused for every load case solved afterwards.
+        """
+        if self._factor is None:
+            with stage("stiffness.assemble"):
+                banded = self._banded_stiffness_matrix()
+
+            with stage("stiffness.factorize"):
+                try:
+                    self._factor = cholesky_banded(banded)
+                except LinAlgError:
+                    raise GeometricallyUnstableExternally("Structure is geometrically unstable")
+
+        return self._factor
+
+    def _assemble(self, member_vectors: np.ndarray) -> np.ndarray:
+        """Adds (k, m, 6) vectors in member axes of k load cases into (k, n) global vectors"""
+        n_cases = member_vectors.shape[0]
+        n_dofs = len(self.restrained)
+
+        index = self.member_dofs.reshape(-1) + n_dofs * np.arange(n_cases)[:, None]
+        weights = member_vectors[:, :, None, :] @ self.transformations
+
+        return np.bincount(
+            index.reshape(-1), weights=weights.reshape(-1), minlength=n_cases * n_dofs
+        ).reshape(n_cases, n_dofs)
+
+    def _load_vectors(self, load_case: LoadCase = None) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the global nodal loads and the equivalent nodal loads of the members
+
+           :param load_case: loads to use instead of the loads on the nodes and members
+        """
+        if load_case is None:
+            return self._column_load_vectors()
+
+        point_loads = (
+            (node, load) for node, loads in load_case.point_loads.items() for load in loads
+        )
+        point_moments = (
+            (node, load) for node, loads in load_case.point_moments.items() for load in loads
+        )
+        distributed_loads = (
+            (member, load)
+            for member, loads in load_case.distributed_loads.items() for load in loads
+        )
+
+        nodal = np.zeros((len(self.nodes), DOF_PER_NODE))
+
+        for node, load in point_loads:
+            nodal[self.node_index[node], 0] += load.horizontal_force
+            nodal[self.node_index[node], 1] += load.vertical_force
+
+        for node, load in point_moments:
+            # clockwise moments are positive in the package, rz is counterclockwise
+            nodal[self.node_index[node], 2] -= load.magnitude
+
+        loaded, udl, udl_start, udl_length, udl_gradient = [], [], [], [], []
+
+        if load_case.distributed_loads:
+            member_index = {member: idx for idx, member in enumerate(self.members)}
+
+            for member, load in distributed_loads:
+                loaded.append(member_index[member])
+                udl_start.append(load.start - member.start.x)
+                udl_length.append(load.length)
+                if isinstance(load, TrapezoidalLoad):
+                    udl.append(load.start_magnitude)
+                    udl_gradient.append(load.gradient)
+                else:
+                    udl.append(load.magnitude)
+                    udl_gradient.append(0.0)
+
+        return nodal.reshape(-1), self._equivalent_loads(
+            np.array(loaded, dtype=int),
+            np.array(udl, dtype=float),
+            np.array(udl_start, dtype=float),
+            np.array(udl_length, dtype=float),
+            np.array(udl_gradient, dtype=float),
+        )
+
+    def _column_load_vectors(self) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the load vectors of the loads stored on the nodes and members"""
+        columns = self.columns
+
+        nodal = np.zeros((len(self.order), DOF_PER_NODE))
+        nodal[:, :2] = columns.point_loads[self.order]
+        # clockwise moments are positive in the package, rz is counterclockwise
+        nodal[:, 2] = -1 * columns.point_moments[self.order]
+
+        loaded = np.flatnonzero(
+            (columns.distributed_loads != 0) | (columns.distributed_load_gradients != 0)
+        )
+
+        return nodal.reshape(-1), self._equivalent_loads(
+            loaded,
+            columns.distributed_loads[loaded],
+            columns.distributed_load_start[loaded],
+            columns.distributed_load_length[loaded],
+            columns.distributed_load_gradients[loaded],
+        )
+
+    def _equivalent_loads(self, loaded: np.ndarray, udl: np.ndarray, udl_start: np.ndarray,
+                          udl_length: np.ndarray, udl_gradient: np.ndarray) -> np.ndarray:
+        """Returns the (m, 6) equivalent nodal loads of vertical distributed loads on members"""
+        udl_end = np.minimum(udl_start + udl_length, self.lengths[loaded])
+
+        # the udl acts vertically, resolve it along and across the members
+        equivalent = np.zeros((len(self.members), 6))
+        np.add.at(
+            equivalent,
+            loaded,
+            equivalent_nodal_loads(
+                self.lengths[loaded],
+                udl * self.sin[loaded],
+                udl * self.cos[loaded],
+                udl_start,
+                udl_end,
+                udl_gradient * self.sin[loaded],
+                udl_gradient * self.cos[loaded],
+            ),
+        )
+
+        return equivalent
+
+    def _analyse(self, nodal: np.ndarray, equivalent: np.ndarray) -> tuple:
+        """Solves k load cases at once from (k, n) nodal and (k, m, 6) member loads"""
+        loads = nodal + self._assemble(equivalent)
+
+        displacements = np.zeros_like(loads)
+
+        if len(self.free):
+            displacements[:, self.free] = cho_solve_banded(
+                (self.factorize(), False), loads[:, self.free].T
+            ).T
+
+        member_forces = (
+                self.local_stiffness @ self.transformations
+                @ displacements[:, self.member_dofs][..., None]
+        )[..., 0] - equivalent
+
+        reactions = self._assemble(member_forces) - nodal
+        reactions[:, ~self.restrained] = 0
+
+        n_cases = len(loads)
+        displacements = displacements.reshape(n_cases, -1, DOF_PER_NODE)
+        reactions = reactions.reshape(n_cases, -1, DOF_PER_NODE)
+
+        # clockwise moments are positive in the package
+        reactions[..., 2] *= -1
+        member_forces[..., [2, 5]] *= -1
+
+        return displacements, reactions, member_forces
+
+    def solve(self, load_case: LoadCase = None) -> StiffnessResult:
+        """Solves the loads on the nodes and members, or the loads of a load case"""
+        with stage("stiffness.load_vectors"):
+            nodal, equivalent = self._load_vectors(load_case)
+
+        with stage("stiffness.analyse"):
+            displacements, reactions, member_forces = self._analyse(nodal[None], equivalent[None])
+
+        return StiffnessResult(
+            nodes=self.nodes,
+            members=self.members,
+            displacements=displacements[0],
+            reactions=reactions[0],
+            member_forces=member_forces[0],
+            node_index=self.node_index,
+        )
+
+    def solve_load_cases(self, load_cases: Iterable[LoadCase]) -> LoadCaseResults:
+        """Solves every load case against a single factorization of the stiffness matrix
+
+           Combinations are then formed from the results with
+           ``LoadCaseResults.combine``.
+        """
+        load_cases = tuple(load_cases)
+        with stage("stiffness.load_vectors"):
+            vectors = [self._load_vectors(load_case) for load_case in load_cases]
+
+        with stage("stiffness.analyse"):
+            displacements, reactions, member_forces = self._analyse(
+                np.stack([nodal for nodal, _ in vectors]),
+                np.stack([equivalent for _, equivalent in vectors]),
+            )
+
+        return LoadCaseResults(
+            names=tuple(load_case.name for load_case in load_cases),
+            nodes=self.nodes,
+            members=self.members,
+            displacements=displacements,
+            reactions=reactions,
+            member_forces=member_forces,
+            node_index=self.node_index,
+        )
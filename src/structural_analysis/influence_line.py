@@ -0,0 +1,268 @@
+import numpy as np
+from scipy.linalg import cho_solve_banded
+
+from .beam import Node
+from .direct_stiffness.solver import (
+    DOF_PER_NODE,
+    DirectStiffnessSolver,
+    point_equivalent_nodal_loads,
+)
+
+COMPONENTS = {"horizontal": 0, "vertical": 1, "moment": 2}
+
+
+class DeterminateInfluenceLines:
+    def __init__(self, supports_x, extent: tuple = None):
+        """Closed form influence lines of a statically determinate beam
+
+           The ordinates are for a unit downward load and follow the same sign
+           conventions as StaticallyDeterminateSolver and BendingShearCalculator.
+
+           :param supports_x: x coordinates of a hinge and a roller, or of a fixed support
+           :param extent: x coordinates of the ends of the beam, needed for
+                overhangs and cantilevers (defaults to the supports)
+        """
+        self.supports_x = tuple(supports_x)
+
+        if len(self.supports_x) not in (1, 2):
+            raise ValueError("a determinate beam has a hinge and a roller or a fixed support")
+
+        self.fixed_end = len(self.supports_x) == 1
+        self.extent = (
+            (min(self.supports_x), max(self.supports_x)) if extent is None else tuple(extent)
+        )
+
+    def reaction(self, support: int, positions, component: str = "vertical") -> np.ndarray:
+        """Influence line of the reaction of a support
+
+           :param support: index of the support in supports_x
+           :param positions: positions of the unit load
+           :param component: "vertical", or "moment" for a fixed support
+        """
+        positions = np.asarray(positions, dtype=float)
+
+        if self.fixed_end:
+            if component == "moment":
+                return -1 * (positions - self.supports_x[0])
+            return np.ones_like(positions)
+
+        support_a_x, support_b_x = self.supports_x
+        rxn_at_b = (positions - support_a_x) / (support_b_x - support_a_x)
+
+        return rxn_at_b if support == 1 else 1 - rxn_at_b
+
+    def _supports_on_left(self, sections: np.ndarray):
+        for support, support_x in enumerate(self.supports_x):
+            if self.fixed_end:
+                yield support, support_x, support_x <= sections
+            else:
+                yield support, support_x, support_x < sections
+
+    def shears(self, sections, positions) -> np.ndarray:
+        """Influence lines of the shear force at many sections, shape (sections, positions)"""
+        sections = np.atleast_1d(np.asarray(sections, dtype=float))[:, None]
+        positions = np.asarray(positions, dtype=float)
+
+        shear = -1.0 * (positions < sections)
+
+        for support, _, on_left in self._supports_on_left(sections):
+            shear += on_left * self.reaction(support, positions)
+
+        return shear
+
+    def moments(self, sections, positions) -> np.ndarray:
+        """Influence lines of the bending moment at many sections, shape (sections, positions)"""
+        sections = np.atleast_1d(np.asarray(sections, dtype=float))[:, None]
+        positions = np.asarray(positions, dtype=float)
+
+        moment = -1 * (sections - positions) * (positions < sections)
+
+        for support, support_x, on_left in self._supports_on_left(sections):
+            reaction = self.reaction(support, positions) * (sections - support_x)
+            if self.fixed_end:
+                reaction += self.reaction(support, positions, component="moment")
+            moment += on_left * reaction
+
+        return moment
+
+    def shear(self, x: float, positions) -> np.ndarray:
+        """Influence line of the shear force at x"""
+        return self.shears([x], positions)[0]
+
+    def moment(self, x: float, positions) -> np.ndarray:
+        """Influence line of the bending moment at x"""
+        return self.moments([x], positions)[0]
+
+
+class InfluenceLines:
+    def __init__(self, solver: DirectStiffnessSolver):
+        """Influence lines of any Beam for a unit downward load
+
+           By Betti's theorem every response is ``-z . N(position) + local``,
+           where N are the equivalent nodal loads of the unit load and z is the
+           solution of one system with the response as its right hand side. z
+           is solved against the factorization of the solver and cached per
+           response, so evaluating thousands of positions is a single
+           vectorized gather.
+
+           :param solver: direct stiffness solver of the beam
+        """
+        self.solver = solver
+
+        starts = solver.x[solver.member_nodes[:, 0]]
+        ends = solver.x[solver.member_nodes[:, 1]]
+
+        self._order = np.argsort(starts)
+        self._starts = starts[self._order]
+        self._ends = ends[self._order]
+        self._cache: dict = {}
+
+        self.extent = (float(starts.min()), float(ends.max()))
+
+    def _locate(self, x) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the member and the distance from its start node of every x"""
+        x = np.asarray(x, dtype=float)
+
+        idx = np.clip(np.searchsorted(self._starts, x, side="right") - 1, 0, len(self._starts) - 1)
+
+        if np.any(x < self._starts[idx]) or np.any(x > self._ends[idx]):
+            raise ValueError("position is not on a member of the beam")
+
+        return self._order[idx], x - self._starts[idx]
+
+    def _unit_loads(self, members: np.ndarray, a: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+        """Returns the local and global equivalent nodal loads of a unit upward load"""
+        solver = self.solver
+        local = point_equivalent_nodal_loads(
+            solver.lengths[members], solver.sin[members], solver.cos[members], a
+        )
+
+        return local, (local[:, None, :] @ solver.transformations[members])[:, 0, :]
+
+    def _responses(self, keys: list, vectors) -> np.ndarray:
+        """Solves (and caches) z for the global response vectors of the given keys"""
+        missing = [idx for idx, key in enumerate(keys) if key not in self._cache]
+
+        if missing:
+            solver = self.solver
+            vectors = vectors([keys[idx] for idx in missing])
+            z = np.zeros_like(vectors)
+
+            if len(solver.free):
+                z[:, solver.free] = cho_solve_banded(
+                    (solver.factorize(), False), vectors[:, solver.free].T
+                ).T
+
+            for idx, row in zip(missing, z):
+                self._cache[keys[idx]] = row
+
+        return np.stack([self._cache[key] for key in keys])
+
+    def _evaluate(self, z: np.ndarray, members: np.ndarray, global_loads: np.ndarray) -> np.ndarray:
+        """Returns -z . N for every response (rows) and position (columns)"""
+        gathered = z[:, self.solver.member_dofs[members]]
+
+        return -1 * np.einsum("kpd,pd->kp", gathered, global_loads)
+
+    def _reaction_vectors(self, keys: list) -> np.ndarray:
+        solver = self.solver
+        vectors = np.zeros((len(keys), len(solver.restrained)))
+
+        for row, (_, dof) in enumerate(keys):
+            members, local_dofs = np.nonzero(solver.member_dofs == dof)
+            for member, local_dof in zip(members, local_dofs):
+                vectors[row, solver.member_dofs[member]] += solver.global_stiffness[member, local_dof]
+
+        return vectors
+
+    def reactions(self, nodes, positions, component: str = "vertical") -> np.ndarray:
+        """Influence lines of the reactions of many supports at once
+
+           :param nodes: restrained nodes
+           :param positions: positions of the unit load
+           :param component: "horizontal", "vertical" or "moment"
+           :return: array of shape (len(nodes), len(positions))
+        """
+        solver = self.solver
+        offset = COMPONENTS[component]
+        dofs = [DOF_PER_NODE * solver.node_index[node] + offset for node in nodes]
+
+        if not all(solver.restrained[dof] for dof in dofs):
+            raise ValueError(f"every node must be restrained in the {component} direction")
+
+        keys = [("reaction", dof) for dof in dofs]
+        z = self._responses(keys, self._reaction_vectors)
+
+        members, a = self._locate(positions)
+        _, global_loads = self._unit_loads(members, a)
+
+        ordinates = self._evaluate(z, members, global_loads)
+
+        # the unit load is carried straight into a support of its own member
+        member_dofs = solver.member_dofs[members]
+        for row, dof in enumerate(dofs):
+            ordinates[row] += (global_loads * (member_dofs == dof)).sum(axis=1)
+
+        if component == "moment":
+            # clockwise moments are positive in the package
+            ordinates *= -1
+
+        return ordinates
+
+    def reaction(self, node: Node, positions, component: str = "vertical") -> np.ndarray:
+        """Influence line of the reaction of a support"""
+        return self.reactions([node], positions, component=component)[0]
+
+    def _section_vectors(self, keys: list) -> np.ndarray:
+        solver = self.solver
+        vectors = np.zeros((len(keys), len(solver.restrained)))
+
+        for row, (quantity, x) in enumerate(keys):
+            (member,), (s,) = self._locate([x])
+            kt = solver.local_stiffness[member] @ solver.transformations[member]
+            # sagging moment and shear at s from the end forces at the start of the member
+            vectors[row, solver.member_dofs[member]] = (
+                kt[1] * s - kt[2] if quantity == "moment" else kt[1]
+            )
+
+        return vectors
+
+    def _sections(self, quantity: str, sections, positions) -> np.ndarray:
+        sections = np.atleast_1d(np.asarray(sections, dtype=float))
+        keys = [(quantity, float(x)) for x in sections]
+        z = self._responses(keys, self._section_vectors)
+
+        members, a = self._locate(positions)
+        local_loads, global_loads = self._unit_loads(members, a)
+
+        ordinates = self._evaluate(z, members, global_loads)
+
+        # fixed end forces of the unit load and the load itself on the cut member
+        section_members, s = self._locate(sections)
+        on_member = section_members[:, None] == members
+        left_of_section = on_member & (a < s[:, None])
+
+        if quantity == "moment":
+            ordinates += on_member * (local_loads[:, 1] * s[:, None] - local_loads[:, 2])
+            ordinates -= left_of_section * (s[:, None] - a)
+        else:
+            ordinates += on_member * local_loads[:, 1]
+            ordinates -= left_of_section
+
+        return ordinates
+
+    def moments(self, sections, positions) -> np.ndarray:
+        """Influence lines of the bending moment at many sections, shape (sections, positions)"""
+        return self._sections("moment", sections, positions)
+
+    def shears(self, sections, positions) -> np.ndarray:
+        """Influence lines of the shear force at many sections, shape (sections, positions)"""
+        return self._sections("shear", sections, positions)
+
+    def moment(self, x: float, positions) -> np.ndarray:
+        """Influence line of the bending moment at x"""
+        return self.moments([x], positions)[0]
+
+    def shear(self, x: float, positions) -> np.ndarray:
+        """Influence line of the shear force at x"""
+        return self.shears([x], positions)[0]
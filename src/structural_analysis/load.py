@@ -1,6 +1,8 @@
 import math
+from collections.abc import Sequence
 
 import attrs
+import numpy as np
 
 
 @attrs.define(slots=True)
@@ -41,6 +43,33 @@ class PointLoad:
     def _vertical_force(self):
         return round(self.magnitude * math.sin(self.angle_of_inclination), 4)
 
+    @classmethod
+    def from_arrays(cls, magnitude, angle_of_inclination=90.0, x=None, y=None) -> "PointLoads":
+        """Creates many point loads at once, validating whole arrays instead of every load
+
+           :param magnitude: magnitudes of the loads
+           :param angle_of_inclination: angles of the loads in degrees
+           :param x: x coordinates of the loads
+           :param y: y coordinates of the loads
+        """
+        magnitude, angle = np.broadcast_arrays(
+            _real_array("magnitude", magnitude),
+            np.radians(_real_array("angle_of_inclination", angle_of_inclination)),
+        )
+
+        # same rounding as the horizontal_force and vertical_force defaults
+        horizontal = magnitude * np.cos(angle)
+        horizontal = np.where(np.isclose(np.round(horizontal, 4), 0), 0.0, np.round(horizontal))
+
+        return PointLoads(
+            magnitude=np.array(magnitude),
+            angle_of_inclination=angle,
+            horizontal_force=horizontal,
+            vertical_force=np.round(magnitude * np.sin(angle), 4),
+            x=_coordinate_array("x", x, magnitude.shape),
+            y=_coordinate_array("y", y, magnitude.shape),
+        )
+
 
 @attrs.define(slots=True, order=True)
 class UniformlyDistributedLoad:
@@ -58,13 +87,93 @@ class UniformlyDistributedLoad:
     def total_force_of_udl(self) -> float:
         return self.magnitude * self.length
 
+    def moment_about(self, x: float) -> float:
+        """First moment of the load about x, the resultant times its distance from x"""
+        return self.total_force_of_udl() * (self.start + self.centroid_of_udl() - x)
+
+    @classmethod
+    def from_arrays(cls, magnitude, length, start=None) -> "UniformlyDistributedLoads":
+        """Creates many uniformly distributed loads at once
+
+           :param magnitude: magnitudes of the loads
+           :param length: lengths of the loads
+           :param start: x coordinates where the loads start
+        """
+        magnitude, length = np.broadcast_arrays(
+            _real_array("magnitude", magnitude), _real_array("length", length)
+        )
+        _check_ge_0("length", length)
 
-class TriangularLoad:
-    pass
+        return UniformlyDistributedLoads(
+            magnitude=np.array(magnitude),
+            length=np.array(length),
+            start=_coordinate_array("start", start, magnitude.shape),
+        )
 
 
+@attrs.define(slots=True)
 class TrapezoidalLoad:
-    pass
+    """Distributed load whose intensity varies linearly from start_magnitude to end_magnitude"""
+    start_magnitude: int or float = attrs.field(
+        validator=attrs.validators.instance_of((int, float))
+    )
+    end_magnitude: int or float = attrs.field(
+        validator=attrs.validators.instance_of((int, float))
+    )
+    length: int or float = attrs.field(validator=attrs.validators.ge(0))
+    start: int or float = attrs.field(init=False, validator=attrs.validators.ge(0))
+
+    @property
+    def gradient(self) -> float:
+        """Change of the intensity per unit length"""
+        return (self.end_magnitude - self.start_magnitude) / self.length if self.length else 0.0
+
+    def intensity(self, distance: float) -> float:
+        """Intensity at a distance from the start of the load"""
+        return self.start_magnitude + self.gradient * distance
+
+    def total_force(self) -> float:
+        return (self.start_magnitude + self.end_magnitude) * self.length / 2
+
+    def first_moment(self) -> float:
+        """Moment of the load about its start, exact even when the resultant vanishes"""
+        return (self.start_magnitude + 2 * self.end_magnitude) * self.length ** 2 / 6
+
+    def centroid(self) -> float:
+        """Distance of the resultant from the start of the load"""
+        total_force = self.total_force()
+        return self.first_moment() / total_force if total_force else self.length / 2
+
+    def moment_about(self, x: float) -> float:
+        """First moment of the load about x, the resultant times its distance from x"""
+        return self.total_force() * (self.start - x) + self.first_moment()
+
+    # the solvers treat every distributed load through the udl interface
+    def total_force_of_udl(self) -> float:
+        return self.total_force()
+
+    def centroid_of_udl(self) -> float:
+        return self.centroid()
+
+
+class TriangularLoad(TrapezoidalLoad):
+    __slots__ = ()
+
+    def __init__(self, magnitude: int or float, length: int or float, increasing: bool = True):
+        """Distributed load that rises linearly from zero to its peak magnitude
+
+           :param magnitude: peak intensity of the load
+           :param length: length of the load
+           :param increasing: peak at the end of the load, at its start otherwise
+        """
+        if increasing:
+            super().__init__(0.0, magnitude, length)
+        else:
+            super().__init__(magnitude, 0.0, length)
+
+    @property
+    def magnitude(self) -> float:
+        return self.end_magnitude if self.start_magnitude == 0 else self.start_magnitude
 
 
 @attrs.define(slots=True, order=True)
@@ -86,6 +195,145 @@ class PointMoment:
         return math.copysign(1, self.magnitude)
         # return 1 if self.magnitude > 0 else -1
 
+    @classmethod
+    def from_arrays(cls, magnitude, x=None, y=None) -> "PointMoments":
+        """Creates many point moments at once
+
+           :param magnitude: magnitudes of the moments, clockwise positive
+           :param x: x coordinates of the moments
+           :param y: y coordinates of the moments
+        """
+        magnitude = _real_array("magnitude", magnitude)
+
+        return PointMoments(
+            magnitude=magnitude,
+            x=_coordinate_array("x", x, magnitude.shape),
+            y=_coordinate_array("y", y, magnitude.shape),
+        )
+
+
+@attrs.define(slots=True)
+class LoadCase:
+    """A named set of loads that is analysed independently of other load cases"""
+    name: str = attrs.field(validator=attrs.validators.instance_of(str))
+    point_loads: dict = attrs.field(init=False, factory=dict, repr=False)
+    point_moments: dict = attrs.field(init=False, factory=dict, repr=False)
+    distributed_loads: dict = attrs.field(init=False, factory=dict, repr=False)
+
+    def add_point_load(self, node, load: PointLoad):
+        load.x = node.x
+        load.y = node.y
+        self.point_loads.setdefault(node, []).append(load)
+
+    def add_point_moment(self, node, load: PointMoment):
+        load.x = node.x
+        load.y = node.y
+        self.point_moments.setdefault(node, []).append(load)
+
+    def add_distributed_load(self, member, load: UniformlyDistributedLoad):
+        load.start = member.start.x
+        self.distributed_loads.setdefault(member, []).append(load)
+
+
+@attrs.define(slots=True)
+class LoadCombination:
+    """Factored sum of load cases, e.g. ``{"dead": 1.35, "live": 1.5}``"""
+    name: str = attrs.field(validator=attrs.validators.instance_of(str))
+    factors: dict = attrs.field(factory=dict)
+
+
+def _real_array(name: str, value) -> np.ndarray:
+    """Vectorized instance_of((int, float)) check"""
+    array = np.asarray(value)
+
+    if array.dtype.kind not in "biuf":
+        raise TypeError(f"'{name}' must be an array of int or float (got dtype {array.dtype})")
+
+    return np.atleast_1d(array.astype(float))
+
+
+def _check_ge_0(name: str, array: np.ndarray):
+    """Vectorized ge(0) check, NaN fails it like it fails ge(0)"""
+    invalid = ~(array >= 0)
+    if np.any(invalid):
+        raise ValueError(f"'{name}' must be >= 0: {array[invalid][0]}")
+
+
+def _coordinate_array(name: str, value, shape: tuple) -> np.ndarray or None:
+    if value is None:
+        return None
+
+    array = np.array(np.broadcast_to(_real_array(name, value), shape))
+    _check_ge_0(name, array)
+
+    return array
+
+
+class _LoadTable(Sequence):
+    """Columns of many loads, indexing returns a load object built from a row"""
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        return len(self.magnitude)
+
+    def __getitem__(self, idx):
+        if isinstance(idx, slice):
+            columns = {field.name: getattr(self, field.name) for field in attrs.fields(type(self))}
+            return type(self)(
+                **{name: None if column is None else column[idx] for name, column in columns.items()}
+            )
+        return self._load(idx)
+
+    def _position(self, load, idx: int, *names: str):
+        for name in names:
+            column = getattr(self, name)
+            if column is not None:
+                setattr(load, name, float(column[idx]))
+        return load
+
+
+@attrs.define(frozen=True, slots=True, eq=False)
+class PointLoads(_LoadTable):
+    """Compact table of point loads created by PointLoad.from_arrays"""
+    magnitude: np.ndarray
+    angle_of_inclination: np.ndarray = attrs.field(repr=False)
+    horizontal_force: np.ndarray = attrs.field(repr=False)
+    vertical_force: np.ndarray = attrs.field(repr=False)
+    x: np.ndarray or None = attrs.field(default=None, repr=False)
+    y: np.ndarray or None = attrs.field(default=None, repr=False)
+
+    def _load(self, idx: int) -> PointLoad:
+        load = PointLoad(
+            float(self.magnitude[idx]), math.degrees(self.angle_of_inclination[idx])
+        )
+        return self._position(load, idx, "x", "y")
+
+
+@attrs.define(frozen=True, slots=True, eq=False)
+class UniformlyDistributedLoads(_LoadTable):
+    """Compact table of uniformly distributed loads created by UniformlyDistributedLoad.from_arrays"""
+    magnitude: np.ndarray
+    length: np.ndarray = attrs.field(repr=False)
+    start: np.ndarray or None = attrs.field(default=None, repr=False)
+
+    def _load(self, idx: int) -> UniformlyDistributedLoad:
+        load = UniformlyDistributedLoad(float(self.magnitude[idx]), float(self.length[idx]))
+        return self._position(load, idx, "start")
+
+    def total_force_of_udl(self) -> np.ndarray:
+        return self.magnitude * self.length
+
+
+@attrs.define(frozen=True, slots=True, eq=False)
+class PointMoments(_LoadTable):
+    """Compact table of point moments created by PointMoment.from_arrays"""
+    magnitude: np.ndarray
+    x: np.ndarray or None = attrs.field(default=None, repr=False)
+    y: np.ndarray or None = attrs.field(default=None, repr=False)
+
+    def _load(self, idx: int) -> PointMoment:
+        return self._position(PointMoment(float(self.magnitude[idx])), idx, "x", "y")
+
 
 if __name__ == "__main__":
     # pl1 = PointLoad(-90)
@@ -0,0 +1,198 @@
+import attrs
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from .load import PointLoad
+
+QUANTITIES = ("moment", "shear")
+
+
+@attrs.define(frozen=True, slots=True)
+class VehicleTrain:
+    """A train of axle loads rolled across a beam
+
+       The first axle leads the train, spacings are the distances between
+       consecutive axles.
+
+       :param axles: PointLoad of every axle
+       :param spacings: distance from every axle to the next one
+       :param name: name used to identify the vehicle in an envelope
+    """
+    axles: tuple = attrs.field(converter=tuple)
+    spacings: tuple = attrs.field(converter=tuple)
+    name: str = attrs.field(default="", validator=attrs.validators.instance_of(str))
+
+    @axles.validator
+    def _check_axles(self, attribute, value):
+        if not value:
+            raise ValueError("a vehicle needs at least one axle")
+        for axle in value:
+            if not isinstance(axle, PointLoad):
+                raise TypeError("axles must be PointLoad instances")
+
+    @spacings.validator
+    def _check_spacings(self, attribute, value):
+        if len(value) != len(self.axles) - 1:
+            raise ValueError("a vehicle needs one spacing less than its number of axles")
+        if any(spacing < 0 for spacing in value):
+            raise ValueError("axle spacings cannot be negative")
+
+    @property
+    def offsets(self) -> np.ndarray:
+        """Distance of every axle behind the leading axle"""
+        return np.concatenate(([0.0], np.cumsum(self.spacings, dtype=float)))
+
+    @property
+    def loads(self) -> np.ndarray:
+        """Downward magnitude of every axle"""
+        return -1 * np.array([axle.vertical_force for axle in self.axles], dtype=float)
+
+    @property
+    def length(self) -> float:
+        return float(sum(self.spacings))
+
+
+@attrs.define(frozen=True, slots=True)
+class Envelope:
+    """Maximum and minimum of a response at every station for moving vehicles
+
+       The critical positions are the x coordinates of the leading axle, the
+       directions are +1 for a vehicle travelling towards +x and -1 otherwise,
+       and the vehicles are indices into the trains that were rolled.
+    """
+    stations: np.ndarray
+    maximum: np.ndarray
+    minimum: np.ndarray
+    maximum_position: np.ndarray
+    minimum_position: np.ndarray
+    maximum_direction: np.ndarray
+    minimum_direction: np.ndarray
+    maximum_vehicle: np.ndarray
+    minimum_vehicle: np.ndarray
+
+
+def axle_kernel(offsets: np.ndarray, loads: np.ndarray, step: float) -> np.ndarray:
+    """Spreads the axles of a vehicle onto a grid of spacing step
+
+       An axle between two grid points is shared between them in proportion
+       to its distance from each, which is exact for influence lines that are
+       straight between grid points.
+
+       :param offsets: distance of every axle behind the leading axle
+       :param loads: downward magnitude of every axle
+       :param step: spacing of the grid
+       :return: weight of every grid lag behind the leading axle
+    """
+    lags = np.asarray(offsets, dtype=float) / step
+    lower = np.floor(lags + 1e-9).astype(int)
+    fraction = np.clip(lags - lower, 0.0, 1.0)
+
+    kernel = np.zeros(lower.max() + 2)
+    np.add.at(kernel, lower, loads * (1 - fraction))
+    np.add.at(kernel, lower + 1, loads * fraction)
+
+    return kernel if kernel[-1] else kernel[:-1]
+
+
+def roll(ordinates: np.ndarray, kernel: np.ndarray, reverse: bool = False) -> np.ndarray:
+    """Responses to a vehicle at every position of its leading axle
+
+       The influence ordinates are padded with zeros so the vehicle enters and
+       leaves the beam, and the response is a sliding window sum of the padded
+       ordinates, keeping only the lags that carry an axle.
+
+       :param ordinates: influence ordinates of shape (stations, grid)
+       :param kernel: axle weights from axle_kernel
+       :param reverse: True when the vehicle travels towards -x
+       :return: array of shape (stations, grid + len(kernel) - 1). For a vehicle
+            travelling towards +x column i has the leading axle on grid point i,
+            otherwise on grid point i - len(kernel) + 1
+    """
+    width = len(kernel)
+    padded = np.pad(ordinates, ((0, 0), (width - 1, width - 1)))
+    windows = sliding_window_view(padded, width, axis=1)
+
+    lags = np.flatnonzero(kernel)
+    if reverse:
+        # the trailing axles are ahead of the leading axle in x
+        return windows[:, :, lags] @ kernel[lags]
+
+    return windows[:, :, width - 1 - lags] @ kernel[lags]
+
+
+def moving_load_envelope(influence_lines, trains, stations, quantity: str = "moment",
+                         step: float = 0.1, both_directions: bool = True) -> Envelope:
+    """Envelopes of moment or shear at many stations for vehicles rolled across a beam
+
+       The influence ordinates of every station are sampled once on a grid of
+       spacing step and every vehicle is a sliding window convolution of them,
+       so no structural analysis is repeated for the positions of the vehicles.
+
+       :param influence_lines: InfluenceLines or DeterminateInfluenceLines of the beam
+       :param trains: VehicleTrain or a sequence of them
+       :param stations: x coordinates where the envelopes are required
+       :param quantity: "moment" or "shear"
+       :param step: spacing of the positions of the leading axle
+       :param both_directions: roll every vehicle towards +x and towards -x
+       :raises ValueError: if quantity is unknown or step is not positive
+    """
+    if quantity not in QUANTITIES:
+        raise ValueError(f"quantity must be one of {QUANTITIES}")
+    if step <= 0:
+        raise ValueError("step must be positive")
+
+    if isinstance(trains, VehicleTrain):
+        trains = [trains]
+
+    # a uniform grid that ends on the end of the beam, refining step when needed
+    start, end = influence_lines.extent
+    count = max(int(np.ceil((end - start) / step - 1e-9)), 1)
+    step = (end - start) / count
+    grid = np.linspace(start, end, count + 1)
+
+    stations = np.atleast_1d(np.asarray(stations, dtype=float))
+    sections = influence_lines.moments if quantity == "moment" else influence_lines.shears
+    ordinates = sections(stations, grid)
+
+    maximum = np.full(len(stations), -np.inf)
+    minimum = np.full(len(stations), np.inf)
+    shape = len(stations)
+    maximum_position, minimum_position = np.zeros(shape), np.zeros(shape)
+    maximum_direction, minimum_direction = np.ones(shape, dtype=int), np.ones(shape, dtype=int)
+    maximum_vehicle, minimum_vehicle = np.zeros(shape, dtype=int), np.zeros(shape, dtype=int)
+
+    rows = np.arange(shape)
+    directions = (1, -1) if both_directions else (1,)
+
+    for vehicle, train in enumerate(trains):
+        kernel = axle_kernel(train.offsets, train.loads, step)
+
+        for direction in directions:
+            responses = roll(ordinates, kernel, reverse=direction == -1)
+            lead = np.arange(responses.shape[1]) - (0 if direction == 1 else len(kernel) - 1)
+
+            idx = responses.argmax(axis=1)
+            better = responses[rows, idx] > maximum
+            maximum = np.where(better, responses[rows, idx], maximum)
+            maximum_position = np.where(better, start + step * lead[idx], maximum_position)
+            maximum_direction = np.where(better, direction, maximum_direction)
+            maximum_vehicle = np.where(better, vehicle, maximum_vehicle)
+
+            idx = responses.argmin(axis=1)
+            better = responses[rows, idx] < minimum
+            minimum = np.where(better, responses[rows, idx], minimum)
+            minimum_position = np.where(better, start + step * lead[idx], minimum_position)
+            minimum_direction = np.where(better, direction, minimum_direction)
+            minimum_vehicle = np.where(better, vehicle, minimum_vehicle)
+
+    return Envelope(
+        stations=stations,
+        maximum=maximum,
+        minimum=minimum,
+        maximum_position=maximum_position,
+        minimum_position=minimum_position,
+        maximum_direction=maximum_direction,
+        minimum_direction=minimum_direction,
+        maximum_vehicle=maximum_vehicle,
+        minimum_vehicle=minimum_vehicle,
+    )
@@ -0,0 +1,340 @@
+from bisect import bisect_right
+
+import numpy as np
+
+
+def polyval(coefficients: np.ndarray, x) -> np.ndarray:
+    """Evaluates every column of a coefficient matrix (highest power first) at x
+
+       :param coefficients: coefficient matrix of shape (degree + 1, number of segments)
+       :param x: local x of every segment, a scalar or an array broadcastable to the segments
+    """
+    x = np.asarray(x, dtype=float)
+    result = np.zeros(np.broadcast_shapes(x.shape, coefficients.shape[1:]))
+
+    for coefficient in coefficients:
+        result = result * x + coefficient
+
+    return result
+
+
+def shift(coefficients: np.ndarray, offset) -> np.ndarray:
+    """Re-expands every column p(x) as q(t) = p(t + offset) with a Taylor shift
+
+       :param coefficients: coefficient matrix of shape (degree + 1, number of segments)
+       :param offset: new origin of every segment, measured from the old one
+    """
+    shifted = np.array(coefficients, dtype=float)
+    offset = np.asarray(offset, dtype=float)
+    n = shifted.shape[0]
+
+    for i in range(n - 1):
+        for j in range(1, n - i):
+            shifted[j] += offset * shifted[j - 1]
+
+    return shifted
+
+
+def derivative_coefficients(coefficients: np.ndarray) -> np.ndarray:
+    """Differentiates a coefficient matrix (highest power first) column by column"""
+    degree = coefficients.shape[0] - 1
+    powers = np.arange(degree, 0, -1).reshape(-1, 1)
+
+    return coefficients[:-1] * powers
+
+
+def real_roots(coefficients: np.ndarray) -> np.ndarray:
+    """Real roots of every column of a coefficient matrix
+
+       Polynomials up to quadratic are solved in closed form, higher degrees
+       through the eigenvalues of a stack of companion matrices, so all the
+       segments are solved at once either way.
+
+       :param coefficients: coefficient matrix of shape (degree + 1, number of segments)
+       :return: roots of shape (number of segments, max(degree, 2)), nan where there is no root
+    """
+    degree = coefficients.shape[0] - 1
+    roots = np.full((coefficients.shape[1], max(degree, 2)), np.nan)
+
+    if degree <= 2:
+        # pad to a*x^2 + b*x + c
+        a, b, c = np.vstack([np.zeros((2 - degree, coefficients.shape[1])), coefficients])
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            linear = (a == 0) & (b != 0)
+            roots[linear, 0] = -c[linear] / b[linear]
+
+            discriminant = b * b - 4 * a * c
+            quadratic = (a != 0) & (discriminant >= 0)
+            root = np.sqrt(np.where(quadratic, discriminant, 0))
+            roots[quadratic, 0] = ((-b - root) / (2 * a))[quadratic]
+            roots[quadratic, 1] = ((-b + root) / (2 * a))[quadratic]
+
+        return roots
+
+    leading = coefficients[0] != 0
+
+    if np.any(~leading):
+        lower = real_roots(coefficients[1:, ~leading])
+        roots[~leading, :lower.shape[1]] = lower
+
+    if np.any(leading):
+        monic = coefficients[1:, leading] / coefficients[0, leading]
+        companion = np.zeros((monic.shape[1], degree, degree))
+        companion[:, 0, :] = -1 * monic.T
+        companion[:, np.arange(1, degree), np.arange(degree - 1)] = 1
+
+        eigenvalues = np.linalg.eigvals(companion)
+        real = np.abs(eigenvalues.imag) <= 1e-9 * (1 + np.abs(eigenvalues.real))
+        roots[leading] = np.where(real, eigenvalues.real, np.nan)
+
+    return roots
+
+
+def derivative_roots(coefficients: np.ndarray) -> np.ndarray:
+    """Real roots of the derivative of every column of a coefficient matrix
+
+       :param coefficients: coefficient matrix of shape (degree + 1, number of segments)
+       :return: roots of shape (number of segments, max(degree - 1, 2)), nan where there is no root
+    """
+    return real_roots(derivative_coefficients(coefficients))
+
+
+def critical_points(coefficients: np.ndarray, lengths) -> tuple:
+    """Locations and values of the maximum and minimum of every segment
+
+       The candidates are the ends of a segment and the roots of the
+       derivative that lie inside it, so the maximum moment under a udl is
+       found where the shear is zero instead of by sampling.
+
+       :param coefficients: coefficient matrix of shape (degree + 1, number of segments)
+       :param lengths: length of every segment
+       :return: local x of the maxima, maxima, local x of the minima, minima
+    """
+    lengths = np.asarray(lengths, dtype=float)
+    roots = derivative_roots(coefficients)
+    roots[~((roots > 0) & (roots < lengths[:, None]))] = np.nan
+
+    candidates = np.column_stack([np.zeros_like(lengths), lengths, roots])
+    values = np.column_stack([polyval(coefficients, column) for column in candidates.T])
+    values[np.isnan(candidates)] = np.nan
+
+    rows = np.arange(len(lengths))
+    maximum = np.nanargmax(values, axis=1)
+    minimum = np.nanargmin(values, axis=1)
+
+    return (
+        candidates[rows, maximum], values[rows, maximum],
+        candidates[rows, minimum], values[rows, minimum],
+    )
+
+
+class PiecewisePolynomial:
+    __slots__ = ("breakpoints", "coefficients", "_breakpoints", "_columns")
+
+    def __init__(self, breakpoints, coefficients):
+        """Polynomials on consecutive segments of a beam
+
+           Segment i runs from breakpoints[i] to breakpoints[i + 1] and its
+           polynomial is in terms of x measured from the start of the
+           segment, highest power first, like BendingShearCalculator. At a
+           breakpoint the polynomial of the segment starting there applies,
+           the last breakpoint belongs to the last segment.
+
+           :param breakpoints: increasing x coordinates of the segment ends
+           :param coefficients: coefficient matrix of shape (degree + 1, number of segments)
+        """
+        self.breakpoints = np.asarray(breakpoints, dtype=float)
+        self.coefficients = np.asarray(coefficients, dtype=float)
+
+        if self.breakpoints.ndim != 1 or len(self.breakpoints) < 2:
+            raise ValueError("a piecewise polynomial needs at least one segment")
+        if np.any(np.diff(self.breakpoints) <= 0):
+            raise ValueError("breakpoints must be strictly increasing")
+        if self.coefficients.ndim != 2 or self.coefficients.shape[1] != len(self.breakpoints) - 1:
+            raise ValueError("there must be one column of coefficients per segment")
+
+        # plain lists for scalar evaluation, built on first use
+        self._breakpoints = None
+        self._columns = None
+
+    def __len__(self) -> int:
+        return self.coefficients.shape[1]
+
+    def __repr__(self):
+        return (
+            f"{type(self).__name__}(segments={len(self)}, degree={self.degree}, "
+            f"domain=({self.breakpoints[0]}, {self.breakpoints[-1]}))"
+        )
+
+    @property
+    def degree(self) -> int:
+        return self.coefficients.shape[0] - 1
+
+    @property
+    def lengths(self) -> np.ndarray:
+        return np.diff(self.breakpoints)
+
+    @property
+    def nbytes(self) -> int:
+        return self.breakpoints.nbytes + self.coefficients.nbytes
+
+    def segment(self, x) -> np.ndarray:
+        """Index of the segment every x falls in
+
+           :raises ValueError: if an x lies outside the breakpoints
+        """
+        x = np.asarray(x, dtype=float)
+        if np.any((x < self.breakpoints[0]) | (x > self.breakpoints[-1])) or np.any(np.isnan(x)):
+            raise ValueError("x lies outside the beam")
+
+        return np.minimum(np.searchsorted(self.breakpoints, x, side="right") - 1, len(self) - 1)
+
+    def _scalar(self, x: float) -> float:
+        # bisect and Horner's rule on lists beat the overhead of numpy for a single point
+        if self._breakpoints is None:
+            self._breakpoints = self.breakpoints.tolist()
+            self._columns = self.coefficients.T.tolist()
+
+        if not self._breakpoints[0] <= x <= self._breakpoints[-1]:
+            raise ValueError("x lies outside the beam")
+
+        idx = min(bisect_right(self._breakpoints, x) - 1, len(self._columns) - 1)
+        local = x - self._breakpoints[idx]
+
+        value = 0.0
+        for coefficient in self._columns[idx]:
+            value = value * local + coefficient
+        return value
+
+    def __call__(self, x):
+        """Value at x, a float for a number and an array for an array"""
+        if isinstance(x, (int, float)):
+            return self._scalar(float(x))
+
+        idx = self.segment(x)
+        local = np.asarray(x, dtype=float) - self.breakpoints[idx]
+
+        return polyval(self.coefficients[:, idx], local)
+
+    def derivative(self, order: int = 1) -> "PiecewisePolynomial":
+        coefficients = self.coefficients
+
+        for _ in range(order):
+            if coefficients.shape[0] == 1:
+                coefficients = np.zeros_like(coefficients)
+                continue
+            coefficients = derivative_coefficients(coefficients)
+
+        return PiecewisePolynomial(self.breakpoints, coefficients)
+
+    def integral(self, constant: float = 0.0) -> "PiecewisePolynomial":
+        """Antiderivative that is continuous across the breakpoints
+
+           :param constant: value of the antiderivative at the first breakpoint
+        """
+        powers = np.arange(self.coefficients.shape[0], 0, -1).reshape(-1, 1)
+        coefficients = np.vstack([self.coefficients / powers, np.zeros((1, len(self)))])
+
+        # every segment starts where the previous one ends
+        increments = polyval(coefficients, self.lengths)
+        coefficients[-1] = constant + np.cumsum(increments) - increments
+
+        return PiecewisePolynomial(self.breakpoints, coefficients)
+
+    def extremes(self) -> tuple:
+        """Location and value of the maximum and of the minimum over all the segments
+
+           :return: x of the maximum, maximum, x of the minimum, minimum
+        """
+        maximum_x, maximum, minimum_x, minimum = critical_points(self.coefficients, self.lengths)
+        highest, lowest = int(np.argmax(maximum)), int(np.argmin(minimum))
+
+        return (
+            float(self.breakpoints[highest] + maximum_x[highest]), float(maximum[highest]),
+            float(self.breakpoints[lowest] + minimum_x[lowest]), float(minimum[lowest]),
+        )
+
+    def definite_integral(self) -> float:
+        """Integral over all the segments"""
+        return float(self.integral()(self.breakpoints[-1]))
+
+    def refine(self, breakpoints) -> "PiecewisePolynomial":
+        """Re-expands the polynomials on a finer set of breakpoints
+
+           :param breakpoints: breakpoints with the same ends that include every current one
+        """
+        breakpoints = np.asarray(breakpoints, dtype=float)
+        if breakpoints[0] != self.breakpoints[0] or breakpoints[-1] != self.breakpoints[-1]:
+            raise ValueError("refined breakpoints must span the same domain")
+
+        idx = self.segment(breakpoints[:-1])
+        return PiecewisePolynomial(
+            breakpoints,
+            shift(self.coefficients[:, idx], breakpoints[:-1] - self.breakpoints[idx]),
+        )
+
+    def _elevated(self, degree: int) -> np.ndarray:
+        padding = np.zeros((degree - self.degree, len(self)))
+        return np.vstack([padding, self.coefficients])
+
+    def __add__(self, other):
+        if isinstance(other, (int, float)):
+            coefficients = self.coefficients.copy()
+            coefficients[-1] += other
+            return PiecewisePolynomial(self.breakpoints, coefficients)
+
+        if not isinstance(other, PiecewisePolynomial):
+            return NotImplemented
+
+        if (
+                self.breakpoints[0] != other.breakpoints[0]
+                or self.breakpoints[-1] != other.breakpoints[-1]
+        ):
+            raise ValueError("only piecewise polynomials over the same domain can be added")
+
+        if len(self) == len(other) and np.array_equal(self.breakpoints, other.breakpoints):
+            left, right = self, other
+        else:
+            breakpoints = np.union1d(self.breakpoints, other.breakpoints)
+            left, right = self.refine(breakpoints), other.refine(breakpoints)
+
+        degree = max(left.degree, right.degree)
+        return PiecewisePolynomial(
+            left.breakpoints, left._elevated(degree) + right._elevated(degree)
+        )
+
+    __radd__ = __add__
+
+    def __mul__(self, factor):
+        if not isinstance(factor, (int, float)):
+            return NotImplemented
+        return PiecewisePolynomial(self.breakpoints, self.coefficients * factor)
+
+    __rmul__ = __mul__
+
+    def __neg__(self) -> "PiecewisePolynomial":
+        return self * -1
+
+    def __sub__(self, other):
+        return self + -other
+
+    def __getitem__(self, segments: slice) -> "PiecewisePolynomial":
+        """Consecutive segments as a view that shares the arrays of self"""
+        if not isinstance(segments, slice) or segments.step not in (None, 1):
+            raise TypeError("piecewise polynomials are sliced by a contiguous range of segments")
+
+        start, stop, _ = segments.indices(len(self))
+        if stop <= start:
+            raise ValueError("a slice must keep at least one segment")
+
+        return PiecewisePolynomial(
+            self.breakpoints[start:stop + 1], self.coefficients[:, start:stop]
+        )
+
+    def between(self, lower: float, upper: float) -> "PiecewisePolynomial":
+        """View of the segments that overlap the span from lower to upper"""
+        start = int(self.segment(lower))
+        stop = int(np.searchsorted(self.breakpoints, upper, side="left"))
+
+        return self[start:max(stop, start + 1)]
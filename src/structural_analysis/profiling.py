@@ -0,0 +1,219 @@
+import functools
+import json
+import math
+import time
+import tracemalloc
+from contextlib import contextmanager
+
+import attrs
+
+# upper bounds in seconds of the duration histogram buckets, 1 us to ~17 min
+BUCKETS = tuple(2.0 ** exponent for exponent in range(-20, 11))
+
+
+@attrs.define(slots=True)
+class StageStats:
+    """Calls, wall time, allocated bytes and duration histogram of one stage"""
+    calls: int = 0
+    seconds: float = 0.0
+    allocated_bytes: int = 0
+    histogram: list = attrs.field(factory=lambda: [0] * (len(BUCKETS) + 1))
+
+    def add(self, seconds: float, allocated_bytes: int = 0):
+        self.calls += 1
+        self.seconds += seconds
+        self.allocated_bytes += allocated_bytes
+
+        bucket = max(0, min(len(BUCKETS), math.ceil(math.log2(seconds)) + 20)) if seconds > 0 else 0
+        self.histogram[bucket] += 1
+
+    def merge(self, other: "StageStats"):
+        self.calls += other.calls
+        self.seconds += other.seconds
+        self.allocated_bytes += other.allocated_bytes
+        self.histogram = [a + b for a, b in zip(self.histogram, other.histogram)]
+
+    def as_dict(self) -> dict:
+        return {
+            "calls": self.calls,
+            "seconds": self.seconds,
+            "allocated_bytes": self.allocated_bytes,
+            "histogram": dict(zip([*map(str, BUCKETS), "+Inf"], self.histogram)),
+        }
+
+
+class Report(dict):
+    """Stage name -> StageStats of a single recording"""
+
+    def as_dict(self) -> dict:
+        return {name: stats.as_dict() for name, stats in self.items()}
+
+    def __str__(self):
+        lines = [f"{'stage':<40}{'calls':>8}{'seconds':>14}{'bytes':>14}"]
+        for name, stats in sorted(self.items(), key=lambda item: -item[1].seconds):
+            lines.append(
+                f"{name:<40}{stats.calls:>8}{stats.seconds:>14.6f}{stats.allocated_bytes:>14}"
+            )
+        return "\n".join(lines)
+
+
+class _NullStage:
+    """Shared no-op context manager handed out while profiling is disabled"""
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+_NULL_STAGE = _NullStage()
+
+
+class _Stage:
+    __slots__ = ("profiler", "name", "start", "start_bytes")
+
+    def __init__(self, profiler: "Profiler", name: str):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        self.start_bytes = tracemalloc.get_traced_memory()[0] if self.profiler.memory else 0
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        seconds = time.perf_counter() - self.start
+        allocated = (
+            tracemalloc.get_traced_memory()[0] - self.start_bytes if self.profiler.memory else 0
+        )
+        self.profiler._add(self.name, seconds, allocated)
+        return False
+
+
+class Profiler:
+    def __init__(self):
+        """Records named solver stages while enabled
+
+           Disabled, stage() returns a shared no-op context manager, so the
+           hooks left in the solvers cost one attribute check per stage. The
+           profiler is process wide and not meant to be shared between threads.
+        """
+        self.enabled = False
+        self.memory = False
+        self.aggregate = Report()
+        self._reports: list = []
+        self._started_tracemalloc = False
+
+    def enable(self, memory: bool = False):
+        """Starts recording, memory=True also records allocated bytes with tracemalloc"""
+        self.enabled = True
+        self.memory = memory
+
+        if memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+
+    def disable(self):
+        self.enabled = False
+        self.memory = False
+
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    def reset(self):
+        self.aggregate = Report()
+
+    def stage(self, name: str):
+        """Context manager timing the enclosed block as the stage name"""
+        if not self.enabled:
+            return _NULL_STAGE
+        return _Stage(self, name)
+
+    def _add(self, name: str, seconds: float, allocated_bytes: int):
+        self.aggregate.setdefault(name, StageStats()).add(seconds, allocated_bytes)
+        for report in self._reports:
+            report.setdefault(name, StageStats()).add(seconds, allocated_bytes)
+
+    @contextmanager
+    def record(self, memory: bool = False):
+        """Enables the profiler for the enclosed block and yields its own Report
+
+               with profiler.record() as report:
+                   solver.solve()
+               print(report)
+        """
+        was_enabled, had_memory = self.enabled, self.memory
+        had_tracemalloc = self._started_tracemalloc
+        if not was_enabled or (memory and not had_memory):
+            self.enable(memory=memory or had_memory)
+
+        report = Report()
+        self._reports.append(report)
+        try:
+            yield report
+        finally:
+            self._reports.remove(report)
+            if not was_enabled:
+                self.disable()
+            elif memory and not had_memory:
+                self.memory = False
+                # stop tracing if this recording started it, not the enable() before it
+                if self._started_tracemalloc and not had_tracemalloc:
+                    tracemalloc.stop()
+                    self._started_tracemalloc = False
+
+    def dump(self, path: str = None) -> str:
+        """Returns the aggregate statistics as JSON, also writing them to path"""
+        document = json.dumps(self.aggregate.as_dict(), indent=2)
+
+        if path is not None:
+            with open(path, "w") as file:
+                file.write(document)
+        return document
+
+    def prometheus(self, prefix: str = "structural_analysis_stage") -> str:
+        """Returns the aggregate statistics in the Prometheus text exposition format"""
+        lines = [f"# TYPE {prefix}_seconds histogram"]
+
+        for name, stats in sorted(self.aggregate.items()):
+            cumulative = 0
+            for bound, count in zip([*map(repr, BUCKETS), "+Inf"], stats.histogram):
+                cumulative += count
+                lines.append(f'{prefix}_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+            lines.append(f'{prefix}_seconds_sum{{stage="{name}"}} {stats.seconds}')
+            lines.append(f'{prefix}_seconds_count{{stage="{name}"}} {stats.calls}')
+
+        lines.append(f"# TYPE {prefix}_allocated_bytes counter")
+        for name, stats in sorted(self.aggregate.items()):
+            lines.append(f'{prefix}_allocated_bytes{{stage="{name}"}} {stats.allocated_bytes}')
+
+        return "\n".join(lines) + "\n"
+
+
+profiler = Profiler()
+
+
+def stage(name: str):
+    """Context manager timing a stage on the process wide profiler"""
+    if not profiler.enabled:
+        return _NULL_STAGE
+    return _Stage(profiler, name)
+
+
+def profiled(name: str):
+    """Decorator timing every call of a function as the stage name"""
+
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not profiler.enabled:
+                return function(*args, **kwargs)
+            with _Stage(profiler, name):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
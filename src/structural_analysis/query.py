@@ -0,0 +1,173 @@
+import numpy as np
+
+from .bending_shear import BendingShearCalculator, NotSolvedError
+from .deflection import elastic_curve
+from .piecewise import PiecewisePolynomial
+
+
+class SolvedBeam:
+    def __init__(
+            self,
+            breakpoints,
+            moment: np.ndarray,
+            shear: np.ndarray,
+            deflection: np.ndarray = None,
+            slope: np.ndarray = None,
+    ):
+        """Point queries over the segment polynomials of a solved beam
+
+           Segment i runs from breakpoints[i] to breakpoints[i + 1] and its
+           polynomials are in terms of x measured from the start of the
+           segment, highest power first, like BendingShearCalculator. A query
+           at a breakpoint returns the value of the segment starting there,
+           the last breakpoint belongs to the last segment.
+
+           :param breakpoints: increasing x coordinates of the segment ends
+           :param moment: bending moment coefficients of shape (degree + 1, number of segments)
+           :param shear: shear force coefficients of shape (degree + 1, number of segments)
+           :param deflection: optional deflection coefficients
+           :param slope: optional slope coefficients
+        """
+        self.polynomials = {}
+        for name, coefficients in (
+                ("moment", moment), ("shear", shear), ("deflection", deflection), ("slope", slope)
+        ):
+            if coefficients is not None:
+                self.polynomials[name] = PiecewisePolynomial(breakpoints, coefficients)
+
+        self.breakpoints = self.polynomials["moment"].breakpoints
+
+    @classmethod
+    def from_calculator(
+            cls, calculator: BendingShearCalculator, flexural_rigidity=None
+    ) -> "SolvedBeam":
+        """Queries the equations of a BendingShearCalculator, solving them first if needed
+
+           :param calculator: calculator of a solved beam
+           :param flexural_rigidity: EI of the beam, deflections and slopes
+                are only available when it is given
+        """
+        moment = calculator.bending_moment()
+        shear = calculator.shear_force()
+
+        if flexural_rigidity is None:
+            return cls(moment.breakpoints, moment.coefficients, shear.coefficients)
+
+        curve = calculator.elastic_curve(flexural_rigidity)
+        return cls(
+            moment.breakpoints,
+            moment.coefficients,
+            shear.coefficients,
+            curve.deflection.coefficients,
+            curve.slope.coefficients,
+        )
+
+    @classmethod
+    def from_stiffness(cls, solver, result) -> "SolvedBeam":
+        """Queries the member forces of a direct stiffness analysis of a horizontal beam
+
+           Members are split where their udl starts and ends so that every
+           segment carries a single polynomial. Slopes and deflections are
+           integrated from M / EI of every member with the ry and rm
+           restraints of the nodes as boundary conditions.
+
+           :param solver: DirectStiffnessSolver that produced the result
+           :param result: StiffnessResult of the solver
+        """
+        if np.any(solver.sin != 0) or np.any(solver.cos <= 0):
+            raise ValueError("point queries need a horizontal beam with members running along +x")
+
+        columns = solver.columns
+        start_x = solver.x[solver.member_nodes[:, 0]]
+        lengths = solver.lengths
+        order = np.argsort(start_x, kind="stable")
+
+        if np.any(np.abs(start_x[order][1:] - (start_x + lengths)[order][:-1]) > 1e-9):
+            raise ValueError("members must follow each other along the beam")
+
+        udl = columns.distributed_loads
+        gradients = columns.distributed_load_gradients
+        udl_start = np.clip(columns.distributed_load_start, 0, lengths)
+        udl_end = np.clip(columns.distributed_load_start + columns.distributed_load_length, 0, lengths)
+        shear_at_start = result.member_forces[:, 1]
+        moment_at_start = result.member_forces[:, 2]
+
+        breakpoints, moment, shear, segment_members = [], [], [], []
+        for idx in order.tolist():
+            # local breakpoints of the member, the load acts between a and b
+            # with an intensity of w + k * (x - a)
+            a, b, length = udl_start[idx], udl_end[idx], lengths[idx]
+            w, k = (udl[idx], gradients[idx]) if b > a else (0.0, 0.0)
+
+            for lower, upper in ((0.0, a), (a, b), (b, length)):
+                if upper - lower <= 0:
+                    continue
+                loaded = (lower, upper) == (a, b)
+                covered = max(0.0, min(lower, b) - a)
+
+                # resultants at the start of the segment of the load covered so far
+                v = shear_at_start[idx] + w * covered + k * covered ** 2 / 2
+                m = (
+                        moment_at_start[idx]
+                        + shear_at_start[idx] * lower
+                        + w * covered * (lower - a - covered / 2)
+                        + k * ((lower - a) * covered ** 2 / 2 - covered ** 3 / 3)
+                )
+
+                breakpoints.append(start_x[idx] + lower)
+                segment_members.append(idx)
+                if loaded:
+                    moment.append((k / 6, w / 2, v, m))
+                    shear.append((k / 2, w, v))
+                else:
+                    moment.append((0.0, 0.0, v, m))
+                    shear.append((0.0, 0.0, v))
+
+        breakpoints.append(float(start_x[order[-1]] + lengths[order[-1]]))
+        moment = PiecewisePolynomial(breakpoints, np.array(moment).T)
+
+        flexural_rigidity = columns.modulus_of_elasticity * columns.moment_of_inertia
+        restraints = solver.restrained.reshape(-1, 3)
+        curve = elastic_curve(
+            moment,
+            flexural_rigidity[segment_members],
+            solver.x[restraints[:, 1]],
+            solver.x[restraints[:, 2]],
+        )
+
+        return cls(
+            breakpoints,
+            moment.coefficients,
+            np.array(shear).T,
+            curve.deflection.coefficients,
+            curve.slope.coefficients,
+        )
+
+    def segment(self, x) -> np.ndarray:
+        """Index of the segment every x falls in
+
+           :raises ValueError: if an x lies outside the beam
+        """
+        return self.polynomials["moment"].segment(x)
+
+    def _evaluate(self, name: str, x):
+        if name not in self.polynomials:
+            raise NotSolvedError(f"The {name} of the beam has not been calculated")
+
+        return self.polynomials[name](x)
+
+    def moment_at(self, x):
+        """Bending moment at x, a float for a number and an array for an array"""
+        return self._evaluate("moment", x)
+
+    def shear_at(self, x):
+        """Shear force at x, a float for a number and an array for an array"""
+        return self._evaluate("shear", x)
+
+    def deflection_at(self, x):
+        """Deflection at x, a float for a number and an array for an array"""
+        return self._evaluate("deflection", x)
+
+    def slope_at(self, x):
+        """Slope at x, a float for a number and an array for an array"""
+        return self._evaluate("slope", x)
@@ -0,0 +1,514 @@
+"""Local analysis server, JSON over HTTP on a TCP port or a Unix socket
+
+Beams posted to /solve are queued and solved in micro batches with
+StaticallyDeterminateSolver.solve_batch on warm worker processes. The
+counters are served on /metrics.
+
+    python -m structural_analysis.server --port 8080
+
+    curl -d '{"supports": [0, 6], "point_loads": [{"force": -10, "x": 2}]}' localhost:8080/solve
+"""
+import argparse
+import asyncio
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+
+import numpy as np
+
+from .profiling import Report, StageStats
+from .statically_determinate.solver import StaticallyDeterminateSolver
+
+# fields of every load of a beam document, in the order of the columns of its array
+LOAD_FIELDS = {
+    "point_loads": (("force", None), ("x", None), ("horizontal", 0.0)),
+    "distributed_loads": (
+        ("magnitude", None), ("start", None), ("length", None), ("end_magnitude", "magnitude")
+    ),
+    # the x of a point moment does not change the reactions, only the diagrams
+    "point_moments": (("magnitude", None), ("x", 0.0)),
+}
+
+# largest accepted request body
+MAX_BODY = 16 * 1024 * 1024
+
+
+class Overloaded(Exception):
+    """The queue of the server is full, the client should retry later"""
+
+
+def parse_beam(document) -> tuple:
+    """Validates a beam document and returns its kind, support coordinates and load rows
+
+       A beam has one support (a fixed end) or two (a hinge then a roller),
+       forces are up positive and moments clockwise positive:
+
+           {
+               "supports": [0, 6],
+               "point_loads": [{"force": -10, "x": 2, "horizontal": 0}],
+               "distributed_loads": [
+                   {"magnitude": -5, "start": 0, "length": 3, "end_magnitude": -5}
+               ],
+               "point_moments": [{"magnitude": 4, "x": 3}]
+           }
+
+       :raises ValueError: if the document is not a valid beam, or has values
+            that are not finite or distributed loads that are not positive in length
+    """
+    if not isinstance(document, dict):
+        raise ValueError("a beam must be a JSON object")
+
+    supports = document.get("supports")
+    if not isinstance(supports, list) or len(supports) not in (1, 2):
+        raise ValueError("supports must be the x of a fixed end, or of a hinge and a roller")
+
+    loads = {}
+    for name, fields in LOAD_FIELDS.items():
+        rows = document.get(name, [])
+        if not isinstance(rows, list) or not all(isinstance(row, dict) for row in rows):
+            raise ValueError(f"{name} must be a list of objects")
+
+        loads[name] = []
+        for row in rows:
+            values = []
+            for field, default in fields:
+                value = row.get(field, row.get(default) if isinstance(default, str) else default)
+                if value is None:
+                    raise ValueError(f"every one of {name} needs a {field}")
+                values.append(value)
+            loads[name].append(values)
+
+    try:
+        supports_x = [float(x) for x in supports]
+        loads = {
+            name: [[float(value) for value in row] for row in rows] for name, rows in loads.items()
+        }
+    except (TypeError, ValueError):
+        raise ValueError("supports and loads must be numbers") from None
+
+    # json reads NaN and Infinity literals, which would poison the whole batch
+    if not np.isfinite(supports_x).all() or not all(
+            np.isfinite(rows).all() for rows in loads.values() if rows
+    ):
+        raise ValueError("supports and loads must be finite")
+
+    if any(length <= 0 for _, _, length, _ in loads["distributed_loads"]):
+        raise ValueError("distributed loads must have a positive length")
+
+    if len(supports_x) == 2 and supports_x[0] == supports_x[1]:
+        raise ValueError("the hinge and the roller must be apart")
+
+    return ("hinge_roller" if len(supports_x) == 2 else "fixed"), supports_x, loads
+
+
+def batch_arrays(beams: list) -> tuple:
+    """Stacks parsed beams of one kind into the padded arrays of solve_batch
+
+       Beams with fewer loads are padded with loads of zero magnitude.
+    """
+    columns = {}
+    for name, fields in LOAD_FIELDS.items():
+        width = max(1, max(len(loads[name]) for _, loads in beams))
+        table = np.zeros((len(beams), width, len(fields)))
+        for i, (_, loads) in enumerate(beams):
+            if loads[name]:
+                table[i, :len(loads[name])] = loads[name]
+        columns[name] = table
+
+    point_loads, udls, point_moments = (
+        columns["point_loads"], columns["distributed_loads"], columns["point_moments"]
+    )
+    arguments = {
+        "point_loads": point_loads[..., 0],
+        "point_loads_x": point_loads[..., 1],
+        "horizontal_loads": point_loads[..., 2],
+        "udls": udls[..., 0],
+        "udls_start": udls[..., 1],
+        "udls_length": udls[..., 2],
+        "udls_end": udls[..., 3],
+        "point_moments": point_moments[..., 0],
+    }
+
+    return np.array([supports_x for supports_x, _ in beams]), arguments
+
+
+def solve_batch(supports_x: np.ndarray, arguments: dict) -> list:
+    """Work function of the pool, returns the reactions of every beam of a batch"""
+    first, second, third = StaticallyDeterminateSolver.solve_batch(supports_x, **arguments)
+
+    if supports_x.shape[1] == 2:
+        return [
+            {"reactions": [
+                {"x": a_x, "horizontal": horizontal, "vertical": rxn_a, "moment": 0.0},
+                {"x": b_x, "horizontal": 0.0, "vertical": rxn_b, "moment": 0.0},
+            ]}
+            for (a_x, b_x), rxn_a, rxn_b, horizontal in zip(
+                supports_x.tolist(), first.tolist(), second.tolist(), third.tolist()
+            )
+        ]
+
+    return [
+        {"reactions": [{"x": x, "horizontal": horizontal, "vertical": vertical, "moment": moment}]}
+        for (x,), moment, vertical, horizontal in zip(
+            supports_x.tolist(), first.tolist(), second.tolist(), third.tolist()
+        )
+    ]
+
+
+def _warm():
+    """Pool initializer, a no-op whose import of this module loads the solvers in every worker"""
+
+
+class AnalysisServer:
+    def __init__(
+            self,
+            processes: int = None,
+            max_batch: int = 1024,
+            max_delay: float = 0.002,
+            max_pending: int = 10_000,
+    ):
+        """Micro-batching analysis service on asyncio
+
+           Requests wait in a bounded queue. A batch is taken as soon as
+           max_batch beams are waiting or max_delay after its first beam,
+           whichever comes first, and at most one batch per worker is in
+           flight. Beyond max_pending waiting beams new requests are refused
+           with 503, so a slow pool pushes back on clients instead of growing
+           the queue without bound.
+
+           :param processes: worker processes, defaults to the number of CPUs,
+                0 solves the batches on the event loop
+           :param max_batch: largest number of beams solved together
+           :param max_delay: seconds the first beam of a batch waits for others
+           :param max_pending: most beams waiting to be solved
+        """
+        self.processes = os.cpu_count() if processes is None else processes
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+
+        self.counters = dict.fromkeys(
+            ("requests", "beams", "solved", "rejected", "invalid", "failed", "batches"), 0
+        )
+        # server.latency is the time a beam spends queued and solved, server.batch one solve
+        self.stages = Report({"server.latency": StageStats(), "server.batch": StageStats()})
+        self.started = None
+
+        self.pool = None
+        self._queue = None
+        self._slots = None
+        self._batcher = None
+        self._running: set = set()
+        self._servers: list = []
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0, path: str = None) -> tuple:
+        """Starts the workers and listens on a TCP port, or on a Unix socket when path is given
+
+           :return: the (host, port) listened on, or the path of the socket
+        """
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.max_pending)
+        self._slots = asyncio.Semaphore(max(self.processes, 1))
+
+        if self.processes:
+            self.pool = ProcessPoolExecutor(self.processes, initializer=_warm)
+            # start every worker now rather than on the first requests
+            await asyncio.gather(*(
+                loop.run_in_executor(self.pool, _warm) for _ in range(self.processes)
+            ))
+
+        self._batcher = asyncio.create_task(self._batches())
+        self.started = time.perf_counter()
+
+        if path is not None:
+            server = await asyncio.start_unix_server(self._connection, path)
+            address = path
+        else:
+            server = await asyncio.start_server(self._connection, host, port)
+            address = server.sockets[0].getsockname()[:2]
+
+        self._servers.append(server)
+        return address
+
+    async def close(self):
+        """Stops listening, finishes the queued beams and shuts the workers down"""
+        for server in self._servers:
+            server.close()
+            await server.wait_closed()
+        self._servers.clear()
+
+        while not self._queue.empty() or self._running:
+            await asyncio.sleep(self.max_delay)
+
+        self._batcher.cancel()
+        try:
+            await self._batcher
+        except asyncio.CancelledError:
+            pass
+
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    async def __aenter__(self) -> "AnalysisServer":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def solve(self, document) -> dict:
+        """Queues one beam document and waits for its reactions
+
+           :raises ValueError: if the document is not a valid beam
+           :raises Overloaded: if max_pending beams are already waiting
+        """
+        (result,) = await self.solve_many([document])
+        return result
+
+    async def solve_many(self, documents: list) -> list:
+        """Queues beam documents together and waits for their reactions, in order
+
+           Every document is validated and the room left in the queue is
+           checked before any beam is queued, so a list that is refused
+           leaves nothing behind to be solved.
+
+           :raises ValueError: if a document is not a valid beam, or there are
+                more than max_pending of them
+           :raises Overloaded: if the queue has no room for all the beams
+        """
+        beams = []
+        for idx, document in enumerate(documents):
+            try:
+                beams.append(parse_beam(document))
+            except ValueError as error:
+                if len(documents) > 1:
+                    raise ValueError(f"beam {idx}: {error}") from None
+                raise
+
+        if self.max_pending and len(beams) > self.max_pending:
+            raise ValueError(f"at most {self.max_pending} beams can be solved together")
+        if self.max_pending and self._queue.qsize() + len(beams) > self.max_pending:
+            self.counters["rejected"] += 1
+            raise Overloaded(f"more than {self.max_pending} beams are waiting")
+
+        loop = asyncio.get_running_loop()
+        futures = []
+        for kind, supports_x, loads in beams:
+            future = loop.create_future()
+            self._queue.put_nowait((kind, supports_x, loads, future, time.perf_counter()))
+            futures.append(future)
+
+        self.counters["beams"] += len(beams)
+        return list(await asyncio.gather(*futures))
+
+    async def _batches(self):
+        loop = asyncio.get_running_loop()
+
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            await self._slots.acquire()
+            task = asyncio.create_task(self._solve(batch))
+            self._running.add(task)
+            task.add_done_callback(self._running.discard)
+
+    async def _solve(self, batch: list):
+        loop = asyncio.get_running_loop()
+
+        try:
+            groups = {}
+            for item in batch:
+                groups.setdefault(item[0], []).append(item)
+
+            for items in groups.values():
+                supports_x, arguments = batch_arrays([(item[1], item[2]) for item in items])
+                start = time.perf_counter()
+
+                try:
+                    if self.pool is None:
+                        results = solve_batch(supports_x, arguments)
+                    else:
+                        results = await loop.run_in_executor(
+                            self.pool, solve_batch, supports_x, arguments
+                        )
+                except Exception as error:
+                    self.counters["failed"] += len(items)
+                    for item in items:
+                        if not item[3].done():
+                            item[3].set_exception(error)
+                    continue
+
+                end = time.perf_counter()
+                self.stages["server.batch"].add(end - start)
+                self.counters["batches"] += 1
+                self.counters["solved"] += len(items)
+
+                for item, result in zip(items, results):
+                    self.stages["server.latency"].add(end - item[4])
+                    # the client may have gone away
+                    if not item[3].done():
+                        item[3].set_result(result)
+        finally:
+            self._slots.release()
+
+    def metrics(self) -> dict:
+        """Counters, throughput and latency histograms since the server started"""
+        uptime = time.perf_counter() - self.started if self.started is not None else 0.0
+        latency = self.stages["server.latency"]
+
+        return {
+            **self.counters,
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+            "uptime": uptime,
+            "throughput": self.counters["solved"] / uptime if uptime else 0.0,
+            "mean_latency": latency.seconds / latency.calls if latency.calls else 0.0,
+            "mean_batch_size": (
+                self.counters["solved"] / self.counters["batches"]
+                if self.counters["batches"] else 0.0
+            ),
+            "stages": self.stages.as_dict(),
+        }
+
+    async def _respond(self, method: str, path: str, body: bytes) -> tuple:
+        """Routes one request, returns the status and the document of the response"""
+        if path == "/health":
+            return HTTPStatus.OK, {"status": "ok"}
+        if path == "/metrics":
+            return HTTPStatus.OK, self.metrics()
+        if path != "/solve":
+            return HTTPStatus.NOT_FOUND, {"error": f"no such path {path}"}
+        if method != "POST":
+            return HTTPStatus.METHOD_NOT_ALLOWED, {"error": "beams are posted to /solve"}
+
+        self.counters["requests"] += 1
+        try:
+            document = json.loads(body)
+            # a list of beams is solved together and answered in order
+            if isinstance(document, dict) and "beams" in document:
+                if not isinstance(document["beams"], list):
+                    raise ValueError("beams must be a list")
+                return HTTPStatus.OK, {"results": await self.solve_many(document["beams"])}
+
+            return HTTPStatus.OK, await self.solve(document)
+        except ValueError as error:
+            self.counters["invalid"] += 1
+            return HTTPStatus.BAD_REQUEST, {"error": str(error)}
+        except Overloaded as error:
+            return HTTPStatus.SERVICE_UNAVAILABLE, {"error": str(error)}
+        except Exception as error:
+            return HTTPStatus.INTERNAL_SERVER_ERROR, {"error": repr(error)}
+
+    async def _connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serves the HTTP/1.1 requests of one connection, keeping it alive between them"""
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+
+                try:
+                    method, path, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    break
+
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = headers.get("content-length", "0")
+                if not (length.isascii() and length.isdigit()):
+                    # the end of the body is unknown, so the connection cannot be reused
+                    status = HTTPStatus.BAD_REQUEST
+                    document = {"error": "Content-Length must be a non negative integer"}
+                    keep_alive = False
+                elif int(length) > MAX_BODY:
+                    status = HTTPStatus.REQUEST_ENTITY_TOO_LARGE
+                    document = {"error": "body too large"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(int(length))
+                    status, document = await self._respond(method, path.split("?")[0], body)
+                    keep_alive = (
+                        headers.get("connection", "").lower() != "close"
+                        and version == "HTTP/1.1"
+                    )
+
+                payload = json.dumps(document).encode()
+                head = (
+                    f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+                    "Content-Type: application/json\r\n"
+                    f"Content-Length: {len(payload)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                )
+                if status == HTTPStatus.SERVICE_UNAVAILABLE:
+                    head += "Retry-After: 1\r\n"
+                writer.write(head.encode("latin-1") + b"\r\n" + payload)
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(host: str, port: int, path: str = None, **options):
+    """Runs an AnalysisServer until it is cancelled"""
+    async with AnalysisServer(**options) as server:
+        address = await server.start(host, port, path)
+        print(f"serving on {address}", flush=True)
+        await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--unix-socket", help="listen on a Unix socket instead of a TCP port")
+    parser.add_argument(
+        "--processes", type=int, help="worker processes, 0 solves on the event loop"
+    )
+    parser.add_argument("--max-batch", type=int, default=1024)
+    parser.add_argument("--max-delay", type=float, default=0.002)
+    parser.add_argument("--max-pending", type=int, default=10_000)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(serve(
+            args.host,
+            args.port,
+            args.unix_socket,
+            processes=args.processes,
+            max_batch=args.max_batch,
+            max_delay=args.max_delay,
+            max_pending=args.max_pending,
+        ))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
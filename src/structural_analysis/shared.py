@@ -0,0 +1,170 @@
+import json
+import struct
+import sys
+from collections.abc import Mapping
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+
+from .columnar import ColumnarBeam
+
+# every array starts on a cache line
+ALIGNMENT = 64
+
+# length of the json layout at the start of a block
+_HEADER = struct.Struct("<Q")
+
+# models attached by attached(), kept open for the life of the process
+_attached: dict = {}
+
+
+def _aligned(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+class SharedModel:
+    def __init__(self, memory: SharedMemory, owner: bool = False):
+        """A ColumnarBeam and named result arrays in one block of shared memory
+
+           The block starts with a json layout of the arrays, so any process
+           can attach to it by name alone. The columns of the beam and the
+           results are read only numpy views on the block, a worker that
+           attaches copies nothing. Use publish and attach rather than
+           calling this directly.
+
+           :param memory: block written by publish
+           :param owner: whether this process published the block and unlinks it
+        """
+        self.memory = memory
+        self.owner = owner
+
+        (length,) = _HEADER.unpack_from(memory.buf)
+        layout = json.loads(bytes(memory.buf[_HEADER.size:_HEADER.size + length]))
+
+        def views(table: dict) -> dict:
+            # frombuffer holds an export of the buffer, so closing the block while a
+            # view is alive raises BufferError instead of unmapping memory still in use
+            arrays = {}
+            for name, (dtype, shape, offset) in table.items():
+                array = np.frombuffer(
+                    memory.buf, dtype=dtype, count=int(np.prod(shape)), offset=offset
+                ).reshape(shape)
+                array.flags.writeable = False
+                arrays[name] = array
+            return arrays
+
+        self.beam = ColumnarBeam()
+        self.beam.node_count = layout["node_count"]
+        self.beam.member_count = layout["member_count"]
+        self.beam._nodes = views(layout["nodes"])
+        self.beam._members = views(layout["members"])
+        self.results = views(layout["results"])
+
+    @property
+    def name(self) -> str:
+        """Name other processes attach with"""
+        return self.memory.name
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the block"""
+        return self.memory.size
+
+    @classmethod
+    def publish(cls, beam, results: Mapping = None, name: str = None) -> "SharedModel":
+        """Copies a beam and its results into a new block of shared memory
+
+               with SharedModel.publish(beam, {"unit_displacements": u}) as model:
+                   sweep(functools.partial(analyse, model=model.name), parameters)
+
+           The block lives until the publisher unlinks it, leaving the with
+           block does so.
+
+           :param beam: Beam or ColumnarBeam
+           :param results: name -> array, e.g. unit load displacements or
+                influence line ordinates computed once for every worker
+           :param name: name of the block, a unique one is generated by default
+        """
+        columns = beam if isinstance(beam, ColumnarBeam) else ColumnarBeam.from_beam(beam)
+        tables = {
+            "nodes": {name: getattr(columns, name) for name in columns._nodes},
+            "members": {name: getattr(columns, name) for name in columns._members},
+            "results": {
+                name: np.ascontiguousarray(array) for name, array in (results or {}).items()
+            },
+        }
+
+        # the offsets depend on the length of the layout itself, so leave room for the
+        # longest offsets and fix them up once the arrays are placed
+        layout = {"node_count": columns.node_count, "member_count": columns.member_count}
+        for table, arrays in tables.items():
+            layout[table] = {
+                name: [array.dtype.str, array.shape, sys.maxsize] for name, array in arrays.items()
+            }
+
+        offset = _aligned(_HEADER.size + len(json.dumps(layout)))
+        for table, arrays in tables.items():
+            for name, array in arrays.items():
+                layout[table][name][2] = offset
+                offset = _aligned(offset + array.nbytes)
+
+        header = json.dumps(layout).encode()
+        memory = SharedMemory(name=name, create=True, size=max(offset, 1))
+        try:
+            _HEADER.pack_into(memory.buf, 0, len(header))
+            memory.buf[_HEADER.size:_HEADER.size + len(header)] = header
+
+            for table, arrays in tables.items():
+                for name, array in arrays.items():
+                    dtype, shape, start = layout[table][name]
+                    np.ndarray(shape, dtype=dtype, buffer=memory.buf, offset=start)[...] = array
+        except BaseException:
+            memory.close()
+            memory.unlink()
+            raise
+
+        return cls(memory, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "SharedModel":
+        """Maps a published block into this process without copying it
+
+           :raises FileNotFoundError: if no block of that name exists
+        """
+        return cls(SharedMemory(name=name))
+
+    def close(self):
+        """Unmaps the block from this process
+
+           :raises BufferError: if arrays of the model are still referenced,
+                delete them and close again
+        """
+        self.beam = self.results = None
+        self.memory.close()
+
+    def unlink(self):
+        """Frees the block once every process has closed it, only the publisher should call this"""
+        self.memory.unlink()
+
+    def __enter__(self) -> "SharedModel":
+        return self
+
+    def __exit__(self, *exc_info):
+        try:
+            self.close()
+        finally:
+            if self.owner:
+                self.unlink()
+
+
+def attached(name: str) -> SharedModel:
+    """Attaches to a published model once per process
+
+       Work functions that run many times in a pool worker call this with
+       the name of the model instead of attaching on every call. The model
+       stays mapped until the worker exits.
+    """
+    if name not in _attached:
+        _attached[name] = SharedModel.attach(name)
+
+    return _attached[name]
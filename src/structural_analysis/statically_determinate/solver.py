@@ -1,5 +1,11 @@
+import attrs
+import numpy as np
+
 from . import Beam
 from .. import FixedSupport, HingeSupport, InternalRoller
+from ..chain import NodeChain
+from ..profiling import stage
+from ..structure import Structure
 from . import (
     StaticallyUnstableExternally,
     StaticallyIndeterminateExternally,
@@ -10,28 +16,81 @@ from . import (
 # TODO check if the x coordinate of the last is <= beam length
 
 
+@attrs.define(frozen=True, slots=True)
+class SupportReaction:
+    """Reaction of a support, up, right and clockwise positive like the support attributes"""
+    horizontal: float = 0.0
+    vertical: float = 0.0
+    moment: float = 0.0
+
+
+@attrs.define(frozen=True, slots=True)
+class DeterminateResult:
+    """Reactions of a statically determinate beam, the supports themselves are left untouched
+
+       Results are immutable, so one beam can be solved for several load
+       cases, or from several threads, at the same time.
+    """
+    supports: tuple = attrs.field(converter=tuple)
+    reactions: tuple = attrs.field(converter=tuple)
+
+    def reaction(self, support) -> SupportReaction:
+        """Reaction of one of the supports of the beam"""
+        for candidate, reaction in zip(self.supports, self.reactions):
+            if candidate is support:
+                return reaction
+
+        raise KeyError(support)
+
+    def apply(self):
+        """Writes the reactions into the support objects, for code that still reads them there"""
+        for support, reaction in zip(self.supports, self.reactions):
+            if isinstance(support, FixedSupport):
+                support.moment = reaction.moment
+                support.vertical_force = reaction.vertical
+                support.horizontal_force = reaction.horizontal
+            elif isinstance(support, HingeSupport):
+                support.vertical_force = reaction.vertical
+                support.horizontal_force = reaction.horizontal
+            else:
+                support.force = reaction.vertical
+
+
 class StaticallyDeterminateSolver:
     def __init__(self, beam: Beam, check_determinacy: bool = True):
-        self.beam = beam
+        """Reads the supports and loads of a statically determinate beam
 
-        if self.beam.is_geometrically_stable():
+           :param beam: Beam or ColumnarBeam, a hinge and a roller or a fixed
+                end give the supports, or a chain of nodes like NodeChain
+           :param check_determinacy: raise for beams that are not determinate
+        """
+        self.beam = NodeChain(beam) if isinstance(beam, Structure) else beam
+
+        with stage("determinate.is_geometrically_stable"):
+            geometrically_stable = self.beam.is_geometrically_stable()
+
+        if geometrically_stable:
             # print("\u2713 Structure is determinate and Geometrically stable")
             pass
         else:
             # raise GeometricallyUnstableExternally("Structure is geometrically unstable")
             pass
         if check_determinacy:
-            if self.beam.classify_beam() == "determinate":
+            with stage("determinate.classify_beam"):
+                classification = self.beam.classify_beam()
+
+            if classification == "determinate":
                 pass
             else:
-                if self.beam.classify_beam() == "unstable":
+                if classification == "unstable":
                     raise StaticallyUnstableExternally("Structure is unstable")
                 else:
                     raise StaticallyIndeterminateExternally(
                         "Structure is indeterminate"
                     )
 
-        self.beam_information = self.beam.get_beam_information()
+        with stage("determinate.beam_information"):
+            self.beam_information = self.beam.get_beam_information()
         self.supports = tuple(self.beam_information["supports"])
 
         if len(self.supports) > 1:
@@ -77,13 +136,11 @@ class StaticallyDeterminateSolver:
         summation_of_moments = 0
 
         for load in self.distributed_loads:
-            centroid_of_udl = load.centroid_of_udl()
-            moment_arm_of_udl = centroid_of_udl + (load.start - self.support_a_x)
-
             total_force_of_udl = -1 * load.total_force_of_udl()
 
+            # moment_about is exact for triangular and trapezoidal loads too
             summation_of_vertical_forces += total_force_of_udl
-            summation_of_moments += total_force_of_udl * moment_arm_of_udl
+            summation_of_moments += -1 * load.moment_about(self.support_a_x)
 
         moment_arm_of_vertical_rxn_at_b = self.support_b_x - self.support_a_x
 
@@ -117,19 +174,16 @@ class StaticallyDeterminateSolver:
         )
         )
 
-        if isinstance(self.support_a, HingeSupport):
-            self.support_a.vertical_force = vertical_rxn_at_a
-            self.support_a.horizontal_force = horizontal_rxn
-        else:
-            self.support_a.force = vertical_rxn_at_a
-
-        if isinstance(self.support_b, HingeSupport):
-            self.support_b.vertical_force = vertical_rxn_at_b
-            self.support_b.horizontal_force = horizontal_rxn
-        else:
-            self.support_b.force = vertical_rxn_at_b
+        reactions = []
+        for support, vertical_rxn in (
+                (self.support_a, vertical_rxn_at_a), (self.support_b, vertical_rxn_at_b)
+        ):
+            if isinstance(support, HingeSupport):
+                reactions.append(SupportReaction(horizontal=horizontal_rxn, vertical=vertical_rxn))
+            else:
+                reactions.append(SupportReaction(vertical=vertical_rxn))
 
-        return self.beam
+        return DeterminateResult(supports=(self.support_a, self.support_b), reactions=reactions)
 
     def _fixed_end_solver(self):
 
@@ -158,9 +212,7 @@ class StaticallyDeterminateSolver:
         )
 
         summation_of_moments_from_distributed_loads = sum(
-            load.total_force_of_udl()
-            * (load.centroid_of_udl() + (load.start - self.support.x))
-            for load in self.distributed_loads
+            load.moment_about(self.support.x) for load in self.distributed_loads
         )
 
         summation_of_moments_from_point_moments = sum(
@@ -173,78 +225,188 @@ class StaticallyDeterminateSolver:
                 + summation_of_moments_from_point_moments
         )
 
-        (
-            self.support.moment,
-            self.support.vertical_force,
-            self.support.horizontal_force,
-        ) = (
-            moment_at_support,
-            vertical_reaction_at_support,
-            horizontal_reaction_at_support,
+        reaction = SupportReaction(
+            horizontal=horizontal_reaction_at_support,
+            vertical=vertical_reaction_at_support,
+            moment=moment_at_support,
         )
 
-        return self.beam
+        return DeterminateResult(supports=(self.support,), reactions=(reaction,))
 
-    def solve(self):
+    def solve(self) -> DeterminateResult:
+        """Solves the reactions of the supports without modifying the beam"""
+        with stage("determinate.reactions"):
+            try:
+                self.hinge_roller
+            except AttributeError:
+                return self._fixed_end_solver()
+            else:
+                return self._hinge_roller_solver()
+
+    @staticmethod
+    def _batch_loads(n_beams, loads, *positions):
+        """Returns zero filled ``[n_beams, n_loads]`` arrays for missing loads"""
+        if loads is None:
+            return [np.zeros((n_beams, 1)) for _ in range(len(positions) + 1)]
+
+        loads = np.asarray(loads, dtype=float).reshape(n_beams, -1)
+        return [loads] + [
+            np.zeros_like(loads) if p is None else np.broadcast_to(
+                np.asarray(p, dtype=float).reshape(n_beams, -1), loads.shape
+            )
+            for p in positions
+        ]
+
+    @staticmethod
+    def _distributed_load_resultants(udl, udl_end, udl_start, udl_length, support_x):
+        """Resultants and first moments about the supports of linearly varying loads"""
+        total_force = (udl + udl_end) * udl_length / 2
+        first_moment = (
+                total_force * (udl_start - support_x[:, None])
+                + (udl + 2 * udl_end) * udl_length ** 2 / 6
+        )
 
-        try:
-            self.hinge_roller
-        except AttributeError:
-            return self._fixed_end_solver()
-        else:
-            return self._hinge_roller_solver()
+        return total_force, first_moment
 
+    @staticmethod
+    def _hinge_roller_batch_solver(
+            support_a_x, support_b_x, fx, fy, x, udl, udl_end, udl_start, udl_length, point_moments
+    ):
+        moment_arm_of_vertical_rxn_at_b = support_b_x - support_a_x
 
-def display_results(solved_beam: Beam):
-    # TODO check RollerSupport direction
+        total_force_of_udl, moment_of_udl = StaticallyDeterminateSolver._distributed_load_resultants(
+            udl, udl_end, udl_start, udl_length, support_a_x
+        )
 
-    for node in solved_beam:
-        if node.support:
-            if isinstance(node.support, HingeSupport):
-                if node.support.vertical_force < 0:
-                    print(
-                        f"{node.name}y = {abs(node.support.vertical_force):.2f} \u2193"
-                    )
-                else:
-                    print(
-                        f"{node.name}y = {node.support.vertical_force:.2f} \u2191"
-                    )
+        summation_of_vertical_forces = fy.sum(axis=1) - total_force_of_udl.sum(axis=1)
+        summation_of_moments = (
+                (fy * (x - support_a_x[:, None])).sum(axis=1)
+                - moment_of_udl.sum(axis=1)
+                + point_moments.sum(axis=1)
+        )
 
-                if node.support.horizontal_force < 0:
-                    print(
-                        f"{node.name}x = {abs(node.support.horizontal_force):.2f} \u2190"
-                    )
-                else:
-                    print(
-                        f"{node.name}x = {node.support.horizontal_force:.2f} \u2192"
-                    )
+        vertical_rxn_at_b = summation_of_moments / moment_arm_of_vertical_rxn_at_b
+        vertical_rxn_at_a = summation_of_vertical_forces - vertical_rxn_at_b
+        horizontal_rxn = fx.sum(axis=1)
 
-            elif isinstance(node.support, RollerSupport):
-                if node.support.force < 0:
-                    print(f"{node.name}y = {abs(node.support.force):.2f} \u2193")
-                else:
-                    print(f"{node.name}y = {node.support.force:.2f} \u2191")
+        return vertical_rxn_at_a, vertical_rxn_at_b, horizontal_rxn
 
-            else:
-                if node.support.moment < 0:
-                    print(f"{node.name}m = {abs(node.support.moment):.2f} \u21BA")
-                else:
-                    print(f"{node.name}m = {node.support.moment:.2f} \u21BB")
+    @staticmethod
+    def _fixed_end_batch_solver(
+            support_x, fx, fy, x, udl, udl_end, udl_start, udl_length, point_moments
+    ):
+        total_force_of_udl, moment_of_udl = StaticallyDeterminateSolver._distributed_load_resultants(
+            udl, udl_end, udl_start, udl_length, support_x
+        )
 
-                if node.support.vertical_force < 0:
-                    print(
-                        f"{node.name}y = {abs(node.support.vertical_force):.2f} \u2193"
-                    )
-                else:
-                    print(
-                        f"{node.name}y = {node.support.vertical_force:.2f} \u2191"
-                    )
+        horizontal_reaction_at_support = fx.sum(axis=1)
+        vertical_reaction_at_support = fy.sum(axis=1) - total_force_of_udl.sum(axis=1)
 
-                if node.support.horizontal_force < 0:
-                    print(
-                        f"{node.name}x = {abs(node.support.horizontal_force):.2f} \u2190"
-                    )
-                else:
-                    print(
-                        f"{node.name}x = {node.support.horizontal_force:.2f} \u2192"
-                    )
+        moment_at_support = (
+                (-1 * fy * (x - support_x[:, None])).sum(axis=1)
+                + moment_of_udl.sum(axis=1)
+                - point_moments.sum(axis=1)
+        )
+
+        return moment_at_support, vertical_reaction_at_support, horizontal_reaction_at_support
+
+    @staticmethod
+    def solve_batch(
+            supports_x,
+            point_loads=None,
+            point_loads_x=None,
+            horizontal_loads=None,
+            udls=None,
+            udls_start=None,
+            udls_length=None,
+            point_moments=None,
+            udls_end=None,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Solves the reactions of many beams that share the same topology at once
+
+           Every load argument is an array of shape ``[n_beams, n_loads]``, beams
+           with fewer loads are padded with zero magnitudes. The vertical and
+           horizontal loads are the vertical and horizontal components of the
+           point loads, the same as ``PointLoad.vertical_force`` and
+           ``PointLoad.horizontal_force``.
+
+           :param supports_x: x coordinates of the supports, shape ``[n_beams, 2]``
+                for a hinge and a roller or ``[n_beams]`` for a fixed end
+           :param point_loads: vertical components of the point loads
+           :param point_loads_x: x coordinates of the point loads
+           :param horizontal_loads: horizontal components of the point loads
+           :param udls: magnitudes of the udls, at their start for linearly varying loads
+           :param udls_start: x coordinates of the start of the udls
+           :param udls_length: lengths of the udls
+           :param point_moments: magnitudes of the point moments
+           :param udls_end: magnitudes at the end of triangular and trapezoidal
+                loads, defaults to udls for uniform loads
+           :return: ``(vertical_rxn_at_a, vertical_rxn_at_b, horizontal_rxn)`` for a
+                hinge and a roller or ``(moment, vertical_rxn, horizontal_rxn)`` for a
+                fixed end, each of shape ``[n_beams]``
+        """
+        supports_x = np.asarray(supports_x, dtype=float)
+        n_beams = supports_x.shape[0]
+
+        fy, x, fx = StaticallyDeterminateSolver._batch_loads(
+            n_beams, point_loads, point_loads_x, horizontal_loads
+        )
+        fy, fx = -1 * fy, -1 * fx
+        udl, udl_start, udl_length, udl_end = StaticallyDeterminateSolver._batch_loads(
+            n_beams, udls, udls_start, udls_length, udls_end
+        )
+        if udls_end is None:
+            udl_end = udl
+        (point_moments,) = StaticallyDeterminateSolver._batch_loads(n_beams, point_moments)
+
+        if supports_x.ndim == 2 and supports_x.shape[1] == 2:
+            return StaticallyDeterminateSolver._hinge_roller_batch_solver(
+                supports_x[:, 0],
+                supports_x[:, 1],
+                fx,
+                fy,
+                x,
+                udl,
+                udl_end,
+                udl_start,
+                udl_length,
+                point_moments,
+            )
+
+        return StaticallyDeterminateSolver._fixed_end_batch_solver(
+            supports_x.reshape(n_beams),
+            fx,
+            fy,
+            x,
+            udl,
+            udl_end,
+            udl_start,
+            udl_length,
+            point_moments,
+        )
+
+
+def _reaction_line(label: str, value: float, negative: str, positive: str) -> str:
+    if value < 0:
+        return f"{label} = {abs(value):.2f} {negative}"
+    return f"{label} = {value:.2f} {positive}"
+
+
+def display_results(result: DeterminateResult, names=None):
+    """Prints the reactions of a solved beam with arrows for their directions
+
+       :param result: DeterminateResult returned by StaticallyDeterminateSolver.solve
+       :param names: label of every support, A, B, ... by default
+    """
+    # TODO check RollerSupport direction
+    if names is None:
+        names = [chr(ord("A") + idx) for idx in range(len(result.supports))]
+
+    for name, support, reaction in zip(names, result.supports, result.reactions):
+        if isinstance(support, FixedSupport):
+            print(_reaction_line(f"{name}m", reaction.moment, "\u21BA", "\u21BB"))
+
+        print(_reaction_line(f"{name}y", reaction.vertical, "\u2193", "\u2191"))
+
+        if isinstance(support, (FixedSupport, HingeSupport)):
+            print(_reaction_line(f"{name}x", reaction.horizontal, "\u2190", "\u2192"))
@@ -1,22 +1,12 @@
-from pprint import pprint
-import operator
+import bisect
 from typing import Sequence
-from collections import deque, namedtuple
+from collections import namedtuple
 
 import attrs
 
-from structural_analysis import (
-    UniformlyDistributedLoad,
-    PointLoad,
-    PointMoment,
-    HingeSupport,
-    RollerSupport,
-    Beam,
-)
-from structural_analysis.statically_determinate.solver import (
-    StaticallyDeterminateSolver,
-    display_results,
-)
+from structural_analysis import TrapezoidalLoad, PointMoment, Beam
+from structural_analysis.beam import Node
+from structural_analysis.profiling import stage
 
 boundary = namedtuple("SupportBoundary", "lower_bound, upper_bound")
 
@@ -33,7 +23,6 @@ def pair_elements(iterables: Sequence, num_of_pairs: int) -> Sequence:
         iterable_pairs = []
 
         idx_plus_1 = idx + 1
-        x1, x2 = _iterables[idx], _iterables[idx_plus_1]
 
         iterable_pairs.append(_iterables[idx])
         iterable_pairs.append(_iterables[idx_plus_1])
@@ -43,6 +32,243 @@ def pair_elements(iterables: Sequence, num_of_pairs: int) -> Sequence:
     return iterable_container
 
 
+def solve_tridiagonal(
+        lower: Sequence[float],
+        diagonal: Sequence[float],
+        upper: Sequence[float],
+        rhs: Sequence[float],
+) -> list[float]:
+    """Solves a tridiagonal system of equations with the Thomas algorithm
+
+       The system is solved in O(n) by a forward elimination sweep followed by
+       back substitution. No pivoting is done, which is safe for the diagonally
+       dominant systems produced by the three-moment equation.
+
+       :param lower: sub-diagonal, ``lower[0]`` is ignored
+       :param diagonal: main diagonal
+       :param upper: super-diagonal, ``upper[-1]`` is ignored
+       :param rhs: right hand side of the system
+       :return: solution vector
+    """
+    n = len(diagonal)
+
+    if not (len(lower) == len(upper) == len(rhs) == n):
+        raise ValueError("all diagonals and the right hand side must have the same length")
+
+    if n == 0:
+        return []
+
+    c_prime = [0.0] * n
+    d_prime = [0.0] * n
+
+    c_prime[0] = upper[0] / diagonal[0]
+    d_prime[0] = rhs[0] / diagonal[0]
+
+    for i in range(1, n):
+        denominator = diagonal[i] - lower[i] * c_prime[i - 1]
+        c_prime[i] = upper[i] / denominator
+        d_prime[i] = (rhs[i] - lower[i] * d_prime[i - 1]) / denominator
+
+    solution = [0.0] * n
+    solution[-1] = d_prime[-1]
+
+    for i in range(n - 2, -1, -1):
+        solution[i] = d_prime[i] - c_prime[i] * solution[i + 1]
+
+    return solution
+
+
+def point_load_terms(vertical_force: float, a: float, b: float) -> tuple[float, float]:
+    """Returns the ``6Ax/L`` terms of a point load on a simply supported span
+
+       :param vertical_force: vertical component of the load
+       :param a: distance of the load from the left support
+       :param b: distance of the load from the right support
+       :return: terms with the centroid measured from the left and the right support
+    """
+    l = a + b  # span length
+
+    max_bending_moment = -1 * (vertical_force * a * b) / l
+
+    return max_bending_moment * (l + a), max_bending_moment * (l + b)
+
+
+def udl_terms(
+        magnitude: float, start: float, end: float, l: float
+) -> tuple[float, float]:
+    """Returns the ``6Ax/L`` terms of a (partial) udl on a simply supported span
+
+       :param magnitude: intensity of the udl
+       :param start: distance of the start of the udl from the left support
+       :param end: distance of the end of the udl from the left support
+       :param l: span length
+       :return: terms with the centroid measured from the left and the right support
+    """
+
+    def integral(u):
+        return pow(l, 2) * pow(u, 2) / 2 - pow(u, 4) / 4
+
+    left = -1 * magnitude * (integral(end) - integral(start)) / l
+    right = -1 * magnitude * (integral(l - start) - integral(l - end)) / l
+
+    return left, right
+
+
+def linear_load_terms(
+        start_magnitude: float, end_magnitude: float, start: float, end: float, l: float
+) -> tuple[float, float]:
+    """Returns the ``6Ax/L`` terms of a linearly varying (partial) load on a simply supported span
+
+       The point load terms are integrated exactly over the loaded length, so
+       one triangular or trapezoidal load replaces a staircase of udls.
+
+       :param start_magnitude: intensity at the start of the load
+       :param end_magnitude: intensity at the end of the load
+       :param start: distance of the start of the load from the left support
+       :param end: distance of the end of the load from the left support
+       :param l: span length
+       :return: terms with the centroid measured from the left and the right support
+    """
+    # intensity p + q * a at a distance a from the left support
+    q = (end_magnitude - start_magnitude) / (end - start)
+    p = start_magnitude - q * start
+
+    def integral(u, constant, linear):
+        # integral of (constant + linear * u) * (l^2 u - u^3)
+        return (
+                constant * (pow(l, 2) * pow(u, 2) / 2 - pow(u, 4) / 4)
+                + linear * (pow(l, 2) * pow(u, 3) / 3 - pow(u, 5) / 5)
+        )
+
+    left = -1 * (integral(end, p, q) - integral(start, p, q)) / l
+    # measured from the right support the intensity is (p + q * l) - q * b
+    right = -1 * (integral(l - start, p + q * l, -q) - integral(l - end, p + q * l, -q)) / l
+
+    return left, right
+
+
+def point_moment_terms(magnitude: float, a: float, b: float) -> tuple[float, float]:
+    """Returns the ``6Ax/L`` terms of a point moment on a simply supported span
+
+       :param magnitude: magnitude of the point moment
+       :param a: distance of the moment from the left support
+       :param b: distance of the moment from the right support
+       :return: terms with the centroid measured from the left and the right support
+    """
+    l = a + b  # span length
+
+    left = magnitude * (pow(l, 2) - 3 * pow(a, 2)) / l
+    right = magnitude * (3 * pow(b, 2) - pow(l, 2)) / l
+
+    return left, right
+
+
+def solve_three_moment_equations(
+        lengths: Sequence[float],
+        left_terms: Sequence[float],
+        right_terms: Sequence[float],
+        ma: float = 0,
+        mc: float = 0,
+        fixed_start: bool = False,
+        fixed_end: bool = False,
+) -> list[float]:
+    """Solves the three-moment equations of a continuous beam with N spans
+
+       The equation written at every interior support ``i`` is
+
+           L_i M_i-1 + 2 (L_i + L_i+1) M_i + L_i+1 M_i+1 = -(6A_i x_i / L_i + 6A_i+1 x_i+1 / L_i+1)
+
+       which gives a tridiagonal system that is solved in linear time. A fixed
+       end is modelled with an imaginary span of zero length.
+
+       :param lengths: length of every span, from left to right
+       :param left_terms: ``6Ax/L`` of every span with x measured from its left support
+       :param right_terms: ``6Ax/L`` of every span with x measured from its right support
+       :param ma: moment at the first support (from a left overhang)
+       :param mc: moment at the last support (from a right overhang)
+       :param fixed_start: True if the first support is fixed
+       :param fixed_end: True if the last support is fixed
+       :return: the moments at all N + 1 supports
+    """
+    n = len(lengths)
+
+    if not (len(left_terms) == len(right_terms) == n):
+        raise ValueError("a left and right term is required for every span")
+
+    if n == 0:
+        return []
+
+    lower, diagonal, upper, rhs = [], [], [], []
+
+    if fixed_start:
+        lower.append(0.0)
+        diagonal.append(2 * lengths[0])
+        upper.append(lengths[0])
+        rhs.append(-1 * right_terms[0])
+
+    for i in range(1, n):
+        lower.append(lengths[i - 1])
+        diagonal.append(2 * (lengths[i - 1] + lengths[i]))
+        upper.append(lengths[i])
+        rhs.append(-1 * (left_terms[i - 1] + right_terms[i]))
+
+    if fixed_end:
+        lower.append(lengths[-1])
+        diagonal.append(2 * lengths[-1])
+        upper.append(0.0)
+        rhs.append(-1 * left_terms[-1])
+
+    # move the known end moments to the right hand side
+    if not fixed_start and rhs:
+        rhs[0] -= lengths[0] * ma
+        lower[0] = 0.0
+    if not fixed_end and rhs:
+        rhs[-1] -= lengths[-1] * mc
+        upper[-1] = 0.0
+
+    moments = solve_tridiagonal(lower, diagonal, upper, rhs)
+
+    if not fixed_start:
+        moments.insert(0, ma)
+    if not fixed_end:
+        moments.append(mc)
+
+    return moments
+
+
+@attrs.define(frozen=True, slots=True)
+class ThreeMomentResult:
+    """Support moments of a continuous beam and its spans as simply supported sub beams
+
+       Every span is a Beam of copies of the nodes and members between two
+       supports, with a hinge and a roller at its ends and the support
+       moments added there as point moments. The nodes of the solved beam
+       are not modified.
+    """
+    support_moments: tuple = attrs.field(converter=tuple)
+    spans: tuple = attrs.field(converter=tuple)
+
+
+def _intensity(load, distance: float) -> float:
+    """Intensity of a uniform or linearly varying load at a distance from its start"""
+    return load.intensity(distance) if isinstance(load, TrapezoidalLoad) else load.magnitude
+
+
+def _overhang_moment(load, start: float, end: float, x: float) -> float:
+    """Moment about x of the part of a distributed load between start and end
+
+       The moment has the sign of ``vertical_force * (load x - x)`` like the
+       moments of the point loads on an overhang.
+    """
+    start_intensity = _intensity(load, start - load.start)
+    end_intensity = _intensity(load, end - load.start)
+
+    total_force = (start_intensity + end_intensity) * (end - start) / 2
+    first_moment = (start_intensity + 2 * end_intensity) * pow(end - start, 2) / 6
+
+    return total_force * (start - x) + first_moment
+
+
 @attrs.define(slots=True)
 class ThreeMomentSolver:
     beam: Beam = attrs.field(validator=attrs.validators.instance_of(Beam))
@@ -51,198 +277,186 @@ class ThreeMomentSolver:
     distributed_loads = attrs.field(init=False)
     point_moments = attrs.field(init=False)
 
+    def support_nodes(self) -> list[Node]:
+        """Nodes restrained vertically, from left to right"""
+        return sorted((node for node in self.beam.nodes if node.ry), key=lambda node: node.x)
+
     def create_sub_beams(self):
-        support_counter: int = 0
-        beam = Beam()
-        collection_of_sub_beams = []
+        """Splits the beam into one simply supported Beam per span
 
-        for node in self.beam:
-
-            if node.has_support:
-                support_counter += 1
-
-            if support_counter == 2:
-                # add node to beam
-                beam.append_node(
-                    name=node.name,
-                    x=node.x,
-                    y=node.y,
-                    point_load=node.point_load,
-                    distributed_load=node.distributed_load,
-                    point_moment=node.point_moment,
-                    support=node.support,
-                )
-
-                val = (
-                    beam,
-                    boundary(*[node.support.x for node in beam if node.has_support]),
-                )
-
-                # add beam to collection of sub beams
-                collection_of_sub_beams.append(val)
-
-                if self.beam.members == len(collection_of_sub_beams):
-                    if node.next_ is not None:
-                        overhang_force = node.next_
-                        beam.append_node(
-                            name=overhang_force.name,
-                            x=overhang_force.x,
-                            y=overhang_force.y,
-                            point_load=overhang_force.point_load,
-                            distributed_load=overhang_force.distributed_load,
-                            point_moment=overhang_force.point_moment,
-                            support=overhang_force.support,
-                        )
+           :return: (span, boundary) pairs, from left to right
+        """
+        supports_x = [node.x for node in self.support_nodes()]
 
-                # create new Beam
-                beam = Beam()
+        if len(supports_x) < 2:
+            raise ValueError("a continuous beam needs at least two vertical supports")
 
-                support_counter = 1
+        collection_of_sub_beams = []
 
-            beam.append_node(
-                name=node.name,
-                x=node.x,
-                y=node.y,
-                point_load=node.point_load,
-                distributed_load=node.distributed_load,
-                point_moment=node.point_moment,
-                support=node.support,
-            )
+        for lower_bound, upper_bound in pair_elements(supports_x, len(supports_x) - 1):
+            beam = Beam()
+            copies = {}
+
+            for node in sorted(self.beam.nodes, key=lambda node: node.x):
+                if lower_bound <= node.x <= upper_bound:
+                    copies[node] = Node(
+                        node.x,
+                        node.y,
+                        rx=node.x == lower_bound,
+                        ry=node.x in (lower_bound, upper_bound),
+                        point_load=node.point_load,
+                        point_moment=node.point_moment,
+                    )
+                    beam.add_node(copies[node])
+
+            for member in self.beam.members:
+                if member.start in copies and member.end in copies:
+                    beam.add_member(
+                        copies[member.start],
+                        copies[member.end],
+                        distributed_load=member.distributed_load,
+                        modulus_of_elasticity=member.modulus_of_elasticity,
+                        moment_of_inertia=member.moment_of_inertia,
+                        cross_sectional_area=member.cross_sectional_area,
+                    )
+
+            collection_of_sub_beams.append((beam, boundary(lower_bound, upper_bound)))
 
         return collection_of_sub_beams
 
-    def three_hinge_support_solver(self):
-        sub_beams = self.create_sub_beams()
+    def _span_terms(self, sub_beams):
+        bounds = [bound for _, bound in sub_beams]
+        supports_x = [bound.lower_bound for bound in bounds] + [bounds[-1].upper_bound]
+        lengths = [bound.upper_bound - bound.lower_bound for bound in bounds]
 
-        beam_info = []
+        left_terms = [0.0] * len(bounds)
+        right_terms = [0.0] * len(bounds)
         ma = 0
         mc = 0
 
-        # external_support_moment = (ma, mb)
-
-        for idx, (sub_beam, bound) in enumerate(sub_beams):
-            for node in sub_beam:
-                for el in node.elements:
-                    if isinstance(
-                            el, (PointLoad, UniformlyDistributedLoad, PointMoment)
-                    ):
-                        if isinstance(el, PointLoad):
-                            if bound.lower_bound <= el.x < bound.upper_bound:
-                                a = el.x - bound.lower_bound
-                                b = bound.upper_bound - el.x
-                                l = a + b  # span length
-
-                                max_bending_moment = (
-                                        -1 * (el.vertical_force * a * b) / l
-                                )
-
-                                if idx == 0:
-                                    area_from_point_load_mul_centroid = (
-                                            1 / 2 * a * max_bending_moment * (2 / 3 * a)
-                                            + 1
-                                            / 2
-                                            * b
-                                            * max_bending_moment
-                                            * (a + 1 / 3 * b)
-                                    )
-                                else:
-                                    area_from_point_load_mul_centroid = (
-                                            1 / 2 * b * max_bending_moment * (2 / 3 * b)
-                                            + 1
-                                            / 2
-                                            * a
-                                            * max_bending_moment
-                                            * (b + 1 / 3 * a)
-                                    )
-                                beam_info.append((area_from_point_load_mul_centroid, l))
-
-                        elif isinstance(el, UniformlyDistributedLoad):
-                            if bound.lower_bound <= el.start < bound.upper_bound:
-                                end_node = (
-                                        el.start + el.length
-                                )  # coordinate of the end node of udl
-                                print((end_node, bound.upper_bound))
-                                if end_node == bound.upper_bound:
-                                    l = bound.upper_bound - bound.lower_bound
-                                    centroid = (1 / 2) * l
-
-                                    area_from_udl = (
-                                            2
-                                            / 3
-                                            * l
-                                            * ((-1 * el.magnitude * pow(l, 2)) / 8)
-                                    )
-
-                                    area_from_udl_mul_centroid = (
-                                            area_from_udl * centroid
-                                    )
-
-                                    beam_info.append((area_from_udl_mul_centroid, l))
-
-                        # Overhang
-                        # TODO check UDL overhang
-                        if isinstance(el, (PointLoad, PointMoment)):
-                            if idx == 0:
-                                if el.x < bound.lower_bound:
-                                    if isinstance(el, PointLoad):
-                                        moment_arm = bound.lower_bound - el.x
-                                        ma = el.vertical_force * moment_arm
-                                    elif isinstance(el, PointMoment):
-                                        ma = (
-                                            el.magnitude
-                                            if el.direction == -1
-                                            else el.magnitude * -1
-                                        )
-                            else:
-                                if el.x > bound.upper_bound:
-                                    if isinstance(el, PointLoad):
-                                        moment_arm = el.x - bound.upper_bound
-                                        mc = el.vertical_force * moment_arm
-                                    elif isinstance(el, PointMoment):
-                                        mc = (
-                                            el.magnitude * -1
-                                            if el.direction == -1
-                                            else el.magnitude * -1
-                                        )
-
-        (area1, l1), (area2, l2) = beam_info
-
-        total_length = l1 + l2
-        lhs = -1 * (ma * l1 + mc * l2)
-        rhs = -6 * (operator.truediv(area1, l1) + operator.truediv(area2, l2))
-
-        mb = (rhs + lhs) / (2 * total_length)
-        print(mb)
+        for node in self.beam.nodes:
+            if node.point_load:
+                x = node.point_load.x
+
+                if x < supports_x[0]:
+                    ma += node.point_load.vertical_force * (supports_x[0] - x)
+                elif x > supports_x[-1]:
+                    mc += node.point_load.vertical_force * (x - supports_x[-1])
+                else:
+                    idx = bisect.bisect_right(supports_x, x) - 1
+                    if idx < len(bounds) and x > supports_x[idx]:
+                        a = x - supports_x[idx]
+                        b = supports_x[idx + 1] - x
+                        left, right = point_load_terms(
+                            node.point_load.vertical_force, a, b
+                        )
+                        left_terms[idx] += left
+                        right_terms[idx] += right
+
+            if node.point_moment:
+                x = node.point_moment.x
+                magnitude = node.point_moment.magnitude
+
+                if x < supports_x[0]:
+                    ma += magnitude
+                elif x > supports_x[-1]:
+                    mc += -1 * magnitude
+                else:
+                    idx = min(bisect.bisect_right(supports_x, x) - 1, len(bounds) - 1)
+                    a = x - supports_x[idx]
+                    b = supports_x[idx + 1] - x
+                    left, right = point_moment_terms(magnitude, a, b)
+                    left_terms[idx] += left
+                    right_terms[idx] += right
+
+        for member in self.beam.members:
+            udl = member.distributed_load
+            if not udl:
+                continue
+
+            start = udl.start
+            end = udl.start + udl.length  # coordinate of the end node of udl
+
+            # the parts of the load on the overhangs act like point loads there
+            if start < supports_x[0]:
+                ma += -1 * _overhang_moment(udl, start, min(end, supports_x[0]), supports_x[0])
+            if end > supports_x[-1]:
+                mc += _overhang_moment(udl, max(start, supports_x[-1]), end, supports_x[-1])
+
+            idx = max(bisect.bisect_right(supports_x, start) - 1, 0)
+
+            while idx < len(bounds) and supports_x[idx] < end:
+                lower_bound = max(start, supports_x[idx]) - supports_x[idx]
+                upper_bound = min(end, supports_x[idx + 1]) - supports_x[idx]
+
+                if upper_bound > lower_bound and isinstance(udl, TrapezoidalLoad):
+                    offset = supports_x[idx] - start
+                    left, right = linear_load_terms(
+                        udl.intensity(lower_bound + offset),
+                        udl.intensity(upper_bound + offset),
+                        lower_bound,
+                        upper_bound,
+                        lengths[idx],
+                    )
+                    left_terms[idx] += left
+                    right_terms[idx] += right
+                elif upper_bound > lower_bound:
+                    left, right = udl_terms(
+                        udl.magnitude, lower_bound, upper_bound, lengths[idx]
+                    )
+                    left_terms[idx] += left
+                    right_terms[idx] += right
+
+                idx += 1
+
+        return lengths, left_terms, right_terms, ma, mc
+
+    def solve(self) -> ThreeMomentResult:
+        """Solves the support moments of a continuous beam with any number of spans
+
+           Supports are the nodes restrained vertically, a support that also
+           restrains rotation is a fixed end. The beam is split into simply
+           supported sub beams, one per span, and the support moments found
+           are added to them as point moments. The sub beams are built fresh
+           on every call and the solver keeps no state, so the same beam can
+           be solved concurrently.
+
+           :raises ValueError: if the beam has fewer than two vertical supports
+        """
+        with stage("three_moment.create_sub_beams"):
+            sub_beams = self.create_sub_beams()
+
+        with stage("three_moment.build_equations"):
+            lengths, left_terms, right_terms, ma, mc = self._span_terms(sub_beams)
 
         beams = [b for b, *_ in sub_beams]
-        moments = pair_elements((ma, mb, -1 * mc), 2)
-
-        for idx, (beam, _moments) in enumerate(zip(beams, moments)):
-            counter = 0
-            for node in beam:
-                if node.has_support:
-                    if idx == 0:
-                        if counter == 1:
-                            m = _moments[counter] * -1
-                            pm = PointMoment(magnitude=m)
-                            pm.x = node.x
-                            pm.y = node.y
-                            node.point_moment = pm
-                            continue
-                    pm = PointMoment(magnitude=_moments[counter])
-                    pm.x = node.x
-                    pm.y = node.y
-                    node.point_moment = pm
-                    counter += 1
-            if idx == 0:
-                if not beam.head.has_support:
-                    beam.remove_first_node()
-            if idx == 1:
-                if not beam.tail.has_support:
-                    beam.remove_last_node()
-        for b in beams:
-            for n in b:
-                print(n)
-            print('=========================================')
-            # b = StaticallyDeterminateSolver(beam=b, check_determinacy=False).solve()
-            # display_results(b)
+        supports = self.support_nodes()
+
+        with stage("three_moment.solve_equations"):
+            support_moments = solve_three_moment_equations(
+                lengths,
+                left_terms,
+                right_terms,
+                ma=ma,
+                mc=mc,
+                fixed_start=bool(supports[0].rm),
+                fixed_end=bool(supports[-1].rm),
+            )
+
+        moments = pair_elements(support_moments, len(beams))
+
+        with stage("three_moment.apply_support_moments"):
+            for (beam, bound), (left_moment, right_moment) in zip(sub_beams, moments):
+                for node in beam.nodes:
+                    if node.x in bound:
+                        # the moment at the right support acts in the opposite direction
+                        m = left_moment if node.x == bound.lower_bound else right_moment * -1
+                        pm = PointMoment(magnitude=m)
+                        pm.x = node.x
+                        pm.y = node.y
+                        node.point_moment = pm
+
+        return ThreeMomentResult(support_moments=support_moments, spans=beams)
+
+    def three_hinge_support_solver(self):
+        return self.solve()
@@ -0,0 +1,187 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Mapping
+
+import attrs
+import numpy as np
+
+from .statically_determinate.solver import StaticallyDeterminateSolver
+
+# grid of the parameter axes in a worker, set once by the pool initializer so
+# that a work unit is only a range of flat indices
+_grid: dict = {}
+
+
+@attrs.define(frozen=True, slots=True)
+class SweepResult:
+    """Outputs of a sweep, every output has one axis per parameter in the given order"""
+    parameters: dict = attrs.field()
+    outputs: dict = attrs.field(repr=False)
+
+    @property
+    def shape(self) -> tuple:
+        return tuple(len(values) for values in self.parameters.values())
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.outputs[name]
+
+    def point(self, index: tuple) -> dict:
+        """Parameter values of a grid point
+
+               result.point(np.unravel_index(result["rxn_a"].argmax(), result.shape))
+        """
+        return {name: values[i] for (name, values), i in zip(self.parameters.items(), index)}
+
+
+def _initialize(function: Callable, parameters: dict, vectorized: bool):
+    _grid.update(function=function, parameters=parameters, vectorized=vectorized)
+
+
+def _evaluate(grid: dict, start: int, stop: int) -> tuple:
+    """Evaluates the grid points start to stop of a grid"""
+    parameters = grid["parameters"]
+    shape = tuple(len(values) for values in parameters.values())
+    index = np.unravel_index(np.arange(start, stop), shape)
+    arguments = {name: values[i] for (name, values), i in zip(parameters.items(), index)}
+
+    if grid["vectorized"]:
+        outputs = grid["function"](**arguments)
+    else:
+        rows = [
+            grid["function"](**{name: column[i] for name, column in arguments.items()})
+            for i in range(stop - start)
+        ]
+        outputs = {name: [row[name] for row in rows] for name in rows[0]}
+
+    chunk = {}
+    for name, values in outputs.items():
+        values = np.asarray(values)
+        # a vectorized function may return a number for outputs that do not vary
+        chunk[name] = np.broadcast_to(values, (stop - start,)) if values.ndim == 0 else values
+
+    return start, stop, chunk
+
+
+def _run_chunk(start: int, stop: int) -> tuple:
+    """Work unit of a pool worker, evaluated on the grid set up by _initialize"""
+    return _evaluate(_grid, start, stop)
+
+
+def sweep(
+        function: Callable,
+        parameters: Mapping,
+        *,
+        vectorized: bool = True,
+        processes: int = None,
+        chunksize: int = 100_000,
+        progress: Callable = None,
+) -> SweepResult:
+    """Evaluates an analysis over the full grid of combinations of parameter values
+
+       The grid is split into work units of chunksize consecutive points
+       that are sharded over a pool of processes. Every worker receives the
+       parameter axes once and builds the points of a unit from its range of
+       flat indices, and the outputs are written into arrays preallocated
+       for the whole grid as units complete, in any order.
+
+           result = sweep(
+               hinge_roller_reactions,
+               {"support_b_x": np.linspace(4, 12, 1000), "point_load": -np.arange(1, 101)},
+           )
+           result["rxn_a"].shape  # (1000, 100)
+
+       :param function: module level function taking every parameter as a
+            keyword argument and returning a dict of outputs. When vectorized it
+            receives arrays of a whole unit and returns arrays, otherwise it is
+            called once per point with numbers
+       :param parameters: parameter name -> values along its axis, numbers are axes of one value
+       :param vectorized: whether function takes arrays, see hinge_roller_reactions
+       :param processes: size of the pool, defaults to the number of CPUs and
+            0 evaluates the units in this process
+       :param chunksize: number of grid points in a work unit
+       :param progress: called with the number of points done and the total after every unit
+    """
+    parameters = {
+        name: np.atleast_1d(np.asarray(values)) for name, values in parameters.items()
+    }
+    if any(values.ndim != 1 or len(values) == 0 for values in parameters.values()):
+        raise ValueError("every parameter must be a number or a non empty 1D array of values")
+    if chunksize < 1:
+        raise ValueError("chunksize must be at least 1")
+
+    shape = tuple(len(values) for values in parameters.values())
+    total = math.prod(shape)
+    units = [(start, min(start + chunksize, total)) for start in range(0, total, chunksize)]
+    processes = os.cpu_count() if processes is None else processes
+
+    outputs = {}
+    done = 0
+
+    def collect(start: int, stop: int, chunk: dict):
+        nonlocal done
+        for name, values in chunk.items():
+            if name not in outputs:
+                outputs[name] = np.empty((total,) + values.shape[1:], dtype=values.dtype)
+            outputs[name][start:stop] = values
+
+        done += stop - start
+        if progress is not None:
+            progress(done, total)
+
+    if processes == 0 or len(units) == 1:
+        grid = {"function": function, "parameters": parameters, "vectorized": vectorized}
+        for start, stop in units:
+            collect(*_evaluate(grid, start, stop))
+    else:
+        with ProcessPoolExecutor(
+                max_workers=min(processes, len(units)),
+                initializer=_initialize,
+                initargs=(function, parameters, vectorized),
+        ) as pool:
+            futures = [pool.submit(_run_chunk, start, stop) for start, stop in units]
+            for future in as_completed(futures):
+                collect(*future.result())
+
+    return SweepResult(
+        parameters=parameters,
+        outputs={
+            name: values.reshape(shape + values.shape[1:]) for name, values in outputs.items()
+        },
+    )
+
+
+def hinge_roller_reactions(
+        support_a_x=0.0,
+        support_b_x=1.0,
+        point_load=0.0,
+        point_load_x=0.0,
+        udl=0.0,
+        udl_start=0.0,
+        udl_length=0.0,
+        point_moment=0.0,
+) -> dict:
+    """Vectorized sweep function of a hinge and roller beam with one load of every kind
+
+       Every argument is a number or an array of one value per grid point,
+       the reactions of all the points are solved with solve_batch at once.
+    """
+    support_a_x, support_b_x, point_load, point_load_x, udl, udl_start, udl_length, point_moment = (
+        np.broadcast_arrays(
+            *map(np.asarray, (
+                support_a_x, support_b_x, point_load, point_load_x,
+                udl, udl_start, udl_length, point_moment,
+            ))
+        )
+    )
+    rxn_a, rxn_b, horizontal = StaticallyDeterminateSolver.solve_batch(
+        np.stack([support_a_x.ravel(), support_b_x.ravel()], axis=1),
+        point_loads=point_load.reshape(-1, 1),
+        point_loads_x=point_load_x.reshape(-1, 1),
+        udls=udl.reshape(-1, 1),
+        udls_start=udl_start.reshape(-1, 1),
+        udls_length=udl_length.reshape(-1, 1),
+        point_moments=point_moment.reshape(-1, 1),
+    )
+
+    return {"rxn_a": rxn_a, "rxn_b": rxn_b, "horizontal": horizontal}
@@ -1,17 +1,77 @@
-"""
-    Dummy conftest.py for structural_analysis.
+"""Shared helpers and fixtures of the test suite
 
-    If you don't know what this is for, just leave it empty.
-    Read more about conftest.py under:
-    - https://docs.pytest.org/en/stable/fixture.html
-    - https://docs.pytest.org/en/stable/writing_plugins.html
+Read more about conftest.py under:
+- https://docs.pytest.org/en/stable/fixture.html
 """
 
-# import pytest
-
 import sys
 from pathlib import Path
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from structural_analysis import (
+    HingeSupport,
+    PointLoad,
+    PointMoment,
+    RollerSupport,
+    UniformlyDistributedLoad,
+)
 
 BASE_DIR = Path(__file__).resolve().parent.parent
 
 sys.path.insert(1, f'{BASE_DIR}')
+
+
+def linked_beam(*nodes):
+    """Links (x, support, point_load, distributed_load, point_moment) tuples into nodes"""
+    chain = []
+    for x, support, point_load, distributed_load, point_moment in nodes:
+        if point_load:
+            point_load.x, point_load.y = x, 0
+        if distributed_load:
+            distributed_load.start = x
+        if point_moment:
+            point_moment.x, point_moment.y = x, 0
+        chain.append(
+            SimpleNamespace(
+                x=x,
+                next_=None,
+                support=support,
+                point_load=point_load,
+                distributed_load=distributed_load,
+                point_moment=point_moment,
+            )
+        )
+    for node, next_ in zip(chain, chain[1:]):
+        node.next_ = next_
+    return chain
+
+
+def random_linked_beam(n, seed=0):
+    rng = np.random.default_rng(seed)
+    x = np.cumsum(rng.uniform(0.5, 2, n)).round(2)
+    nodes = [(0, HingeSupport(vertical_force=25.0, horizontal_force=0), None, None, None)]
+    for idx, x_coordinate in enumerate(x[:-1]):
+        nodes.append((
+            float(x_coordinate),
+            None,
+            PointLoad(float(rng.integers(-20, 0))) if idx % 2 else None,
+            UniformlyDistributedLoad(float(rng.integers(-5, 0)), 1) if idx % 3 else None,
+            PointMoment(float(rng.integers(1, 9))) if idx % 5 == 0 else None,
+        ))
+    nodes.append((float(x[-1]), RollerSupport(force=10.0), None, None, None))
+    return linked_beam(*nodes)
+
+
+@pytest.fixture
+def make_beam():
+    """linked_beam, the chain of nodes BendingShearCalculator walks"""
+    return linked_beam
+
+
+@pytest.fixture
+def random_beam():
+    """random_linked_beam, a hinge and roller chain of n segments with mixed loads"""
+    return random_linked_beam
@@ -12,3 +12,64 @@ from src.structural_analysis.beam import Beam
 
 def test_beam():
     assert True
+
+
+def make_chain(n):
+    from structural_analysis.beam import Beam, Node
+
+    beam = Beam()
+    nodes = [Node(float(i), 0) for i in range(n)]
+    beam.add_nodes(nodes)
+    beam.add_members(zip(nodes, nodes[1:]))
+    return beam, nodes
+
+
+def test_nodes_are_deduplicated_by_position():
+    from structural_analysis.beam import Beam, Node
+
+    beam = Beam()
+    beam.add_node(Node(0, 0))
+    beam.add_node(Node(0, 0, ry=True))
+    beam.add_nodes([Node(1, 0), Node(0, 0), Node(1, 0)])
+
+    assert list(beam.get_nodes()) == [Node(0, 0), Node(1, 0)]
+    assert beam.node_id(Node(1, 0)) == 1
+
+
+def test_a_node_keeps_every_outgoing_member():
+    from structural_analysis.beam import Beam, Node
+
+    beam = Beam()
+    a, b, c = Node(0, 0), Node(1, 0), Node(0, 1)
+    beam.add_nodes([a, b, c])
+    beam.add_member(a, b)
+    beam.add_member(a, c)
+
+    assert set(beam.beam_model[a]) == {b, c}
+    assert beam.member_nodes.tolist() == [[0, 1], [0, 2]]
+    assert beam.neighbours(a) == [b, c]
+    assert beam.neighbours(c) == [a]
+
+
+def test_adjacency_is_compressed_sparse_rows():
+    beam, nodes = make_chain(5)
+    indptr, neighbours, members = beam.adjacency()
+
+    assert indptr.tolist() == [0, 1, 3, 5, 7, 8]
+    assert neighbours.tolist() == [1, 0, 2, 1, 3, 2, 4, 3]
+    assert members.tolist() == [0, 0, 1, 1, 2, 2, 3, 3]
+
+
+def test_bulk_construction_is_linear():
+    import time
+
+    start = time.perf_counter()
+    make_chain(1_000)
+    small = time.perf_counter() - start
+
+    start = time.perf_counter()
+    beam, _ = make_chain(100_000)
+    large = time.perf_counter() - start
+
+    assert len(beam.get_members()) == 99_999
+    assert large / small < 400
@@ -0,0 +1,39 @@
+import json
+
+from benchmarks import compare, run
+
+
+def test_run_writes_a_result_per_case_and_size():
+    document = run.run(["three_moment_equations", "bending_shear_exact"], sizes=(2, 10, 10_000), repeat=2)
+
+    assert json.loads(json.dumps(document))["schema"] == run.SCHEMA_VERSION
+    # the exact bending engine is capped below 10 000 nodes
+    assert [(row["case"], row["size"]) for row in document["results"]] == [
+        ("three_moment_equations", 2),
+        ("three_moment_equations", 10),
+        ("three_moment_equations", 10_000),
+        ("bending_shear_exact", 2),
+        ("bending_shear_exact", 10),
+    ]
+    assert all(row["min"] > 0 and row["peak_memory"] > 0 for row in document["results"])
+
+
+def test_compare_flags_slowdowns_and_memory_growth(tmp_path):
+    def document(*rows):
+        return {"results": [
+            {"case": case, "size": size, "min": seconds, "peak_memory": memory}
+            for case, size, seconds, memory in rows
+        ]}
+
+    baseline = document(("a", 10, 1.0, 100), ("b", 10, 1.0, 100), ("c", 10, 1.0, 100))
+    current = document(("a", 10, 1.1, 100), ("b", 10, 2.0, 100), ("c", 10, 0.5, 200), ("d", 1, 1, 1))
+
+    rows = compare.compare(baseline, current, threshold=0.25)
+    assert [(row["case"], row["regressed"]) for row in rows] == [
+        ("a", False), ("b", True), ("c", True)
+    ]
+
+    for name, content in (("baseline.json", baseline), ("current.json", current)):
+        (tmp_path / name).write_text(json.dumps(content))
+    assert compare.main([str(tmp_path / "baseline.json"), str(tmp_path / "current.json")]) == 1
+    assert compare.main([str(tmp_path / "baseline.json"), str(tmp_path / "baseline.json")]) == 0
@@ -0,0 +1,319 @@
+import numpy as np
+import pytest
+
+from structural_analysis import (
+    HingeSupport,
+    PointLoad,
+    PointMoment,
+    RollerSupport,
+    TrapezoidalLoad,
+    TriangularLoad,
+    UniformlyDistributedLoad,
+)
+from structural_analysis.bending_shear import (
+    BendingShearCalculator,
+    critical_points,
+    derivative_coefficients,
+    derivative_roots,
+    moment_coefficients,
+    polyval,
+)
+from structural_analysis.profiling import profiler
+
+
+@pytest.fixture
+def simply_supported_beam(make_beam):
+    return make_beam(
+        (0, HingeSupport(vertical_force=31.5, horizontal_force=0), None,
+         UniformlyDistributedLoad(-10, 3), None),
+        (3, None, PointLoad(-20), None, PointMoment(6)),
+        (6, RollerSupport(force=18.5), None, None, None),
+    )
+
+
+def test_moment_coefficients_of_a_cantilever():
+    # fixed support at 0 with a 10 kN load at the free end of a 4 m cantilever
+    coefficients = moment_coefficients([0, 2, 4], [10, 0, -10], [-40, 0, 0], [0, 0, 0])
+    assert polyval(coefficients, 0) == pytest.approx([-40, -20])
+    assert polyval(coefficients, 2) == pytest.approx([-20, 0])
+    assert polyval(derivative_coefficients(coefficients), 1) == pytest.approx([10, 10])
+
+
+def test_numeric_results_match_exact_results(simply_supported_beam):
+    numeric = BendingShearCalculator(simply_supported_beam)
+    exact = BendingShearCalculator(simply_supported_beam, exact=True)
+
+    for numeric_results, exact_results in (
+            (numeric.calculate_bending(), exact.calculate_bending()),
+            (numeric.calculate_shear(), exact.calculate_shear()),
+    ):
+        assert len(numeric_results) == len(exact_results) == 2
+        for n, e in zip(numeric_results, exact_results):
+            assert (n.lower_bound, n.upper_bound) == (e.lower_bound, e.upper_bound)
+            assert n.lower_bound_val == pytest.approx(float(e.lower_bound_val))
+            assert n.upper_bound_val == pytest.approx(float(e.upper_bound_val))
+
+
+def test_numeric_equations_match_exact_equations(simply_supported_beam):
+    numeric = BendingShearCalculator(simply_supported_beam)
+    exact = BendingShearCalculator(simply_supported_beam, exact=True)
+    numeric.calculate_bending()
+    exact.calculate_bending()
+
+    x = np.linspace(0, 3, 7)
+    for n, e in zip(numeric.bending_moments_equations, exact.bending_moments_equations):
+        expected = [float(e.eqn.subs({"x": val})) for val in x]
+        assert np.polyval(n.eqn, x) == pytest.approx(expected)
+
+
+def test_bending_values_of_simply_supported_beam(simply_supported_beam):
+    bending = BendingShearCalculator(simply_supported_beam).calculate_bending()
+    assert bending[0].lower_bound_val == pytest.approx(0)
+    assert bending[0].upper_bound_val == pytest.approx(31.5 * 3 - 45)
+    assert bending[1].upper_bound_val == pytest.approx(0)
+
+
+def reference_bending_equations(beam):
+    """Builds the segment equations the way the quadratic implementation did
+
+       Every earlier load is re-emitted into every later segment with its
+       distance to the start of that segment.
+    """
+    import sympy
+
+    loads = []  # [force, distance] and [udl force, centroid distance]
+    moments = 0
+    equations = []
+
+    for node in beam:
+        if node.next_ is None:
+            break
+        length = node.next_.x - node.x
+
+        force, moment, udl = BendingShearCalculator._node_actions(node)
+        moments += moment
+
+        eqn = f"{moments} + {force} * x + {udl} * x * x / 2"
+        for load in loads:
+            eqn += f" + {load[0]} * ({load[1]} + x)"
+            load[1] += length
+
+        equations.append(sympy.sympify(eqn))
+
+        loads.append([force, length])
+        if udl:
+            loads.append([udl * length, length / 2])
+
+    return equations
+
+
+def test_exact_equations_match_quadratic_implementation(random_beam):
+    beam = random_beam(40)
+    calculator = BendingShearCalculator(beam, exact=True)
+    calculator.calculate_bending()
+
+    expected = reference_bending_equations(beam)
+    assert len(calculator.bending_moments_equations) == len(expected) == 40
+
+    for equation, reference in zip(calculator.bending_moments_equations, expected):
+        for power in range(3):
+            assert float(equation.eqn.coeff("x", power)) == pytest.approx(
+                float(reference.coeff("x", power)), abs=1e-9
+            )
+
+
+def count_node_actions(monkeypatch) -> list:
+    """Counts the nodes the calculator reads, one entry per call of _node_actions"""
+    calls = []
+    node_actions = BendingShearCalculator._node_actions
+
+    def counted(node, reactions=None):
+        calls.append(node.x)
+        return node_actions(node, reactions)
+
+    monkeypatch.setattr(BendingShearCalculator, "_node_actions", staticmethod(counted))
+    return calls
+
+
+def test_exact_equations_do_not_grow_with_the_beam(random_beam):
+    beam = random_beam(200)
+    calculator = BendingShearCalculator(beam, exact=True)
+    with profiler.record() as report:
+        calculator.calculate_bending()
+
+    for equation in calculator.bending_moments_equations:
+        assert len(equation.eqn.as_ordered_terms()) <= 3
+
+    # one sympify and one derivative per segment, timings are left to the benchmarks
+    assert report["bending_shear.sympify"].calls == 200
+    assert report["bending_shear.derivative"].calls == 200
+
+
+@pytest.mark.parametrize("n", [10, 1000])
+def test_numeric_engine_reads_every_node_once(n, random_beam, monkeypatch):
+    calls = count_node_actions(monkeypatch)
+    with profiler.record() as report:
+        BendingShearCalculator(random_beam(n)).calculate_bending()
+
+    # n segments have n + 1 nodes, the coefficients are built in one pass
+    assert len(calls) == n + 1
+    assert report["bending_shear.coefficients"].calls == 1
+
+
+def test_critical_points_find_the_maximum_under_a_udl():
+    # 4 m simply supported span under 10 kN/m, maximum of wL^2/8 at midspan
+    coefficients = moment_coefficients([0, 4], [20, -20], [0, 0], [-10, 0])
+    maximum_x, maximum, minimum_x, minimum = critical_points(coefficients, [4])
+
+    assert maximum_x == pytest.approx([2])
+    assert maximum == pytest.approx([20])
+    assert minimum == pytest.approx([0])
+
+
+def test_critical_points_of_cubics():
+    # x^3 - 3x has a local maximum at -1 and a local minimum at 1
+    roots = derivative_roots(np.array([[1.0], [0.0], [-3.0], [0.0]]))
+    assert sorted(roots[0]) == pytest.approx([-1, 1])
+
+    maximum_x, maximum, minimum_x, minimum = critical_points(
+        np.array([[1.0], [0.0], [-3.0], [0.0]]), [1.5]
+    )
+    assert minimum_x == pytest.approx([1])
+    assert minimum == pytest.approx([-2])
+    assert maximum_x == pytest.approx([0])
+
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_extremes_of_a_simply_supported_beam(exact, make_beam):
+    beam = make_beam(
+        (0, HingeSupport(vertical_force=20.0, horizontal_force=0), None,
+         UniformlyDistributedLoad(-10, 3), None),
+        (3, None, None, UniformlyDistributedLoad(-10, 1), None),
+        (4, RollerSupport(force=20.0), None, None, None),
+    )
+    calculator = BendingShearCalculator(beam, exact=exact)
+
+    segments = calculator.moment_extremes()
+    assert segments[0].maximum_x == pytest.approx(2)
+    assert segments[0].maximum == pytest.approx(20)
+    assert segments[1].maximum_x == pytest.approx(3)
+
+    overall = calculator.global_extremes()
+    assert (overall.maximum_x, overall.maximum) == pytest.approx((2, 20))
+    assert (overall.lower_bound, overall.upper_bound) == (0, 4)
+
+    shear = calculator.global_extremes("shear")
+    assert (shear.maximum_x, shear.maximum) == pytest.approx((0, 20))
+    assert (shear.minimum_x, shear.minimum) == pytest.approx((4, -20))
+
+
+def test_extremes_are_end_values_without_interior_roots(simply_supported_beam):
+    calculator = BendingShearCalculator(simply_supported_beam)
+    bending = calculator.calculate_bending()
+
+    for result, segment in zip(bending, calculator.moment_extremes()):
+        assert segment.maximum == pytest.approx(max(result.lower_bound_val, result.upper_bound_val))
+        assert segment.minimum == pytest.approx(min(result.lower_bound_val, result.upper_bound_val))
+
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_triangular_load_moments(exact, make_beam):
+    # 6 m span with a triangle rising to 12 kN/m, reactions 12 and 24 kN;
+    # M = 12x - x^3 / 3 peaks where the shear 12 - x^2 vanishes
+    beam = make_beam(
+        (0, HingeSupport(vertical_force=12.0, horizontal_force=0), None,
+         TriangularLoad(-12, 6), None),
+        (6, RollerSupport(force=24.0), None, None, None),
+    )
+    calculator = BendingShearCalculator(beam, exact=exact)
+    moment = calculator.bending_moment()
+
+    x = np.linspace(0, 6, 13)
+    assert moment(x) == pytest.approx(12 * x - x ** 3 / 3, abs=1e-9)
+
+    overall = calculator.global_extremes()
+    assert overall.maximum_x == pytest.approx(np.sqrt(12))
+    assert overall.maximum == pytest.approx(12 * np.sqrt(12) - np.sqrt(12) ** 3 / 3)
+    assert calculator.global_extremes("shear").minimum == pytest.approx(-24)
+
+
+def test_trapezoidal_load_over_several_segments(make_beam):
+    # a 2 -> 6 kN/m load from 0 to 4 m that a node at 1 m splits, reactions by statics
+    load = TrapezoidalLoad(-2, -6, 4)
+    rxn_b = (2 * 4 * 2 + 4 * 4 / 2 * 8 / 3) / 6
+    rxn_a = 16 - rxn_b
+    nodes = make_beam(
+        (0, HingeSupport(vertical_force=rxn_a, horizontal_force=0), None, load, None),
+        (1, None, None, None, None),
+        (4, None, None, None, None),
+        (6, RollerSupport(force=rxn_b), None, None, None),
+    )
+    # the load continues over the node at 1 m
+    nodes[1].distributed_load = load
+    moment = BendingShearCalculator(nodes).bending_moment()
+
+    x = np.linspace(0, 4, 9)
+    expected = rxn_a * x - x ** 2 - x ** 3 / 6
+    assert moment(x) == pytest.approx(expected)
+    assert moment(6.0) == pytest.approx(0, abs=1e-9)
+
+
+def test_reactions_from_a_determinate_result(make_beam):
+    from structural_analysis.statically_determinate.solver import (
+        DeterminateResult,
+        SupportReaction,
+    )
+
+    hinge, roller = HingeSupport(), RollerSupport()
+    beam = make_beam(
+        (0, hinge, None, UniformlyDistributedLoad(-10, 3), None),
+        (3, None, PointLoad(-20), None, PointMoment(6)),
+        (6, roller, None, None, None),
+    )
+    result = DeterminateResult(
+        supports=(hinge, roller),
+        reactions=(SupportReaction(vertical=31.5), SupportReaction(vertical=18.5)),
+    )
+
+    calculator = BendingShearCalculator(beam, reactions=result)
+    calculator.calculate_bending()
+    expected = BendingShearCalculator(
+        make_beam(
+            (0, HingeSupport(vertical_force=31.5, horizontal_force=0), None,
+             UniformlyDistributedLoad(-10, 3), None),
+            (3, None, PointLoad(-20), None, PointMoment(6)),
+            (6, RollerSupport(force=18.5), None, None, None),
+        )
+    )
+    expected.calculate_bending()
+
+    assert calculator.moment_coefficients == pytest.approx(expected.moment_coefficients)
+    assert hinge.vertical_force is None
+
+
+@pytest.mark.parametrize("exact", [False, True])
+def test_a_beam_is_read_from_its_nodes_and_members(exact, simply_supported_beam):
+    from structural_analysis.beam import Beam, Node
+    from structural_analysis.columnar import ColumnarBeam
+    from structural_analysis.statically_determinate.solver import StaticallyDeterminateSolver
+
+    a = Node(0, 0, rx=True, ry=True)
+    b = Node(3, 0, point_load=PointLoad(-20), point_moment=PointMoment(6))
+    c = Node(6, 0, ry=True)
+    beam = Beam()
+    beam.add_nodes((a, b, c))
+    beam.add_member(a, b, distributed_load=UniformlyDistributedLoad(-10, 3))
+    beam.add_member(b, c)
+
+    expected = BendingShearCalculator(simply_supported_beam).calculate_bending()
+    for model, reactions in (
+            (beam, None),
+            (ColumnarBeam.from_beam(beam), None),
+            (beam, StaticallyDeterminateSolver(beam).solve()),
+    ):
+        calculator = BendingShearCalculator(model, exact=exact, reactions=reactions)
+        bending = calculator.calculate_bending()
+        assert [(r.lower_bound, r.upper_bound) for r in bending] == [(0, 3), (3, 6)]
+        assert [float(v) for r in bending for v in (r.lower_bound_val, r.upper_bound_val)] == (
+            pytest.approx([v for r in expected for v in (r.lower_bound_val, r.upper_bound_val)])
+        )
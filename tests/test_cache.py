@@ -0,0 +1,87 @@
+import pytest
+
+from structural_analysis import PointLoad, UniformlyDistributedLoad
+from structural_analysis.beam import Beam, Node
+from structural_analysis.cache import ResultsCache, cached, fingerprint
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+
+
+def make_beam(load=-20.0, offset=0.0, reverse=False, modulus_of_elasticity=None):
+    nodes = [
+        Node(0 + offset, 0, rx=True, ry=True),
+        Node(3 + offset, 0, point_load=PointLoad(load)),
+        Node(5 + offset, 0, ry=True),
+    ]
+    pairs = list(zip(nodes, nodes[1:]))
+
+    beam = Beam()
+    beam.add_nodes(reversed(nodes) if reverse else nodes)
+    for start, end in reversed(pairs) if reverse else pairs:
+        beam.add_member(
+            start,
+            end,
+            distributed_load=UniformlyDistributedLoad(-4, 2),
+            modulus_of_elasticity=modulus_of_elasticity,
+        )
+    return beam
+
+
+def test_fingerprint_does_not_depend_on_insertion_order():
+    assert fingerprint(make_beam()) == fingerprint(make_beam(reverse=True))
+    assert fingerprint(make_beam()) == fingerprint(ColumnarBeam.from_beam(make_beam()))
+
+
+def test_fingerprint_tolerance():
+    assert fingerprint(make_beam()) == fingerprint(make_beam(offset=1e-13))
+    assert fingerprint(make_beam()) != fingerprint(make_beam(offset=1e-3))
+    assert fingerprint(make_beam()) != fingerprint(make_beam(load=-21.0))
+
+
+def test_fingerprint_of_large_values():
+    steel = fingerprint(make_beam(modulus_of_elasticity=2e11))
+    assert steel != fingerprint(make_beam(modulus_of_elasticity=2.1e11))
+    assert steel == fingerprint(ColumnarBeam.from_beam(make_beam(modulus_of_elasticity=2e11)))
+
+
+def test_least_recently_used_results_are_evicted():
+    cache = ResultsCache(maxsize=2)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+
+    assert "a" in cache and "c" in cache
+    assert "b" not in cache
+
+
+def test_disk_tier_survives_the_memory_tier(tmp_path):
+    cache = ResultsCache(maxsize=1, directory=tmp_path)
+    cache.put("a", {"value": 1})
+    cache.put("b", {"value": 2})
+
+    assert len(cache) == 1
+    assert cache.get("a") == {"value": 1}
+    assert ResultsCache(directory=tmp_path).get("b") == {"value": 2}
+
+    cache.clear(disk=True)
+    assert "a" not in cache
+
+
+def test_cached_analysis_runs_once_per_equivalent_beam():
+    calls = []
+
+    @cached(cache=ResultsCache(maxsize=4))
+    def analyse(beam):
+        calls.append(beam)
+        return DirectStiffnessSolver(beam).solve()
+
+    first = analyse(make_beam())
+    second = analyse(make_beam(reverse=True))
+    other = analyse(make_beam(load=-30.0))
+
+    assert len(calls) == 2
+    assert second is first
+    assert analyse.cache.hits == 1
+    assert second.reaction(Node(5, 0)) == pytest.approx(first.reaction(Node(5, 0)))
+    assert other.reactions[:, 1].sum() == pytest.approx(30 + 2 * 4 * 2)
@@ -0,0 +1,111 @@
+import csv
+import io
+import itertools
+import json
+
+import pytest
+
+from structural_analysis.cli import analyse, analyse_lines, main, solve_stream
+from structural_analysis.statically_determinate.solver import StaticallyDeterminateSolver
+
+BEAM = {
+    "id": "b1",
+    "supports": [0, 8],
+    "point_loads": [{"force": -10, "x": 2}, {"force": -6, "x": 10}],
+    "distributed_loads": [{"magnitude": -6, "end_magnitude": 2, "start": 3, "length": 4}],
+    "point_moments": [{"magnitude": 12, "x": 5}],
+    "modulus_of_elasticity": 2e8,
+    "moment_of_inertia": 1e-4,
+}
+
+
+def test_reactions_match_the_determinate_solver():
+    rxn_a, rxn_b, _ = StaticallyDeterminateSolver.solve_batch(
+        [[0, 8]],
+        point_loads=[[-10, -6]],
+        point_loads_x=[[2, 10]],
+        udls=[[-6]],
+        udls_start=[[3]],
+        udls_length=[[4]],
+        udls_end=[[2]],
+        point_moments=[[12]],
+    )
+
+    output = analyse(BEAM)
+
+    assert output["id"] == "b1"
+    assert [reaction["vertical"] for reaction in output["reactions"]] == pytest.approx(
+        [rxn_a[0], rxn_b[0]]
+    )
+    # the overhang load hogs the beam over the roller
+    assert output["moment"]["minimum"] == pytest.approx(-12)
+    assert output["moment"]["minimum_x"] == pytest.approx(8)
+    assert output["shear"]["maximum"] == pytest.approx(rxn_a[0])
+    assert output["shear"]["maximum_x"] == pytest.approx(0)
+
+
+def test_deflection_needs_the_section_properties():
+    w, length, e, i = -12, 6, 2e8, 8e-5
+    document = {
+        "supports": [0, length],
+        "distributed_loads": [{"magnitude": w, "start": 0, "length": length}],
+        "point_loads": [{"force": 0, "x": length / 2}],
+    }
+
+    assert analyse(document)["deflection"] is None
+    assert analyse({**document, "modulus_of_elasticity": e})["deflection"] is None
+
+    deflection = analyse({**document, "modulus_of_elasticity": e, "moment_of_inertia": i})[
+        "deflection"
+    ]
+    assert deflection["value"] == pytest.approx(5 * w * length ** 4 / (384 * e * i))
+    assert deflection["x"] == pytest.approx(length / 2)
+
+
+def test_point_moments_need_a_position():
+    with pytest.raises(ValueError):
+        analyse({"supports": [0], "point_moments": [{"magnitude": 4}]})
+
+
+@pytest.mark.parametrize("jobs", [1, 2])
+def test_stream_is_consumed_incrementally(jobs):
+    line = json.dumps(BEAM) + "\n"
+    outputs = solve_stream(itertools.repeat(line), jobs=jobs, chunk_size=3)
+
+    # an endless input still yields results
+    first = list(itertools.islice(outputs, 10))
+    outputs.close()
+
+    assert [output["line"] for output in first] == list(range(1, 11))
+
+
+def test_jsonl_and_csv_files(tmp_path, capsys):
+    source = tmp_path / "beams.jsonl"
+    source.write_text(
+        json.dumps(BEAM) + "\n\n"
+        + json.dumps({"supports": [0], "point_loads": [{"force": -10, "x": 4}]}) + "\n"
+        + "{not json\n"
+    )
+
+    assert main([str(source), "-o", str(tmp_path / "out.jsonl"), "--jobs", "2"]) == 1
+    lines = [json.loads(line) for line in (tmp_path / "out.jsonl").read_text().splitlines()]
+    assert [line["line"] for line in lines] == [1, 3, 4]
+    assert lines[1]["reactions"][0]["moment"] == pytest.approx(-40)
+    assert "JSONDecodeError" in lines[2]["error"]
+    assert "1 beams could not be solved" in capsys.readouterr().err
+
+    assert main([str(source), "-o", str(tmp_path / "out.csv"), "--format", "csv"]) == 1
+    rows = list(csv.DictReader(io.StringIO((tmp_path / "out.csv").read_text())))
+    assert rows[0]["id"] == "b1"
+    assert float(rows[1]["support_1_vertical"]) == pytest.approx(10)
+    assert rows[1]["support_2_vertical"] == ""
+    assert rows[0]["deflection"] and rows[1]["deflection"] == ""
+    assert rows[2]["error"]
+
+
+def test_a_distributed_load_of_negative_length_is_an_error_line():
+    beam = {"supports": [0, 6], "distributed_loads": [{"magnitude": -5, "start": 6, "length": -4}]}
+    (output,) = analyse_lines([(1, json.dumps(beam))])
+
+    assert output["line"] == 1
+    assert "positive length" in output["error"]
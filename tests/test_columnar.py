@@ -0,0 +1,118 @@
+import numpy as np
+import pytest
+
+from structural_analysis import PointLoad, PointMoment, UniformlyDistributedLoad
+from structural_analysis.beam import Beam, Member, Node
+from structural_analysis.columnar import ColumnarBeam, NodeView
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+
+
+@pytest.fixture
+def beam():
+    nodes = [
+        Node(0, 0, rx=True, ry=True),
+        Node(3, 0, point_load=PointLoad(-20)),
+        Node(5, 0, ry=True, point_moment=PointMoment(15)),
+        Node(9, 0, ry=True, rm=True),
+    ]
+    beam = Beam()
+    beam.add_nodes(nodes)
+    beam.add_member(nodes[0], nodes[1], distributed_load=UniformlyDistributedLoad(-4, 3))
+    beam.add_member(nodes[1], nodes[2])
+    beam.add_member(nodes[2], nodes[3], distributed_load=UniformlyDistributedLoad(-6, 2))
+    return beam
+
+
+def test_columns_match_the_object_model(beam):
+    columnar = ColumnarBeam.from_beam(beam)
+
+    assert columnar.x.tolist() == [0, 3, 5, 9]
+    assert columnar.restraints[3].tolist() == [False, True, True]
+    assert columnar.point_loads[1].tolist() == [0, -20]
+    assert columnar.point_moments[2] == 15
+    assert columnar.distributed_loads.tolist() == [-4, 0, -6]
+    assert columnar.distributed_load_length[2] == 2
+    assert columnar.member_nodes.tolist() == [[0, 1], [1, 2], [2, 3]]
+
+
+def test_views_read_rows(beam):
+    columnar = ColumnarBeam.from_beam(beam)
+    node = columnar.get_nodes()[1]
+    member = columnar.get_members()[2]
+
+    assert node == Node(3, 0)
+    assert hash(node) == hash(Node(3, 0))
+    assert node.point_load.vertical_force == pytest.approx(-20)
+    assert (node.rx, node.ry, node.rm) == (False, False, False)
+    assert member.start == Node(5, 0) and member.length == 4
+    assert member.distributed_load.magnitude == -6
+    assert member.distributed_load.start == 5
+    assert member.moment_of_inertia == Member.MOMENT_OF_INERTIA
+
+
+def test_point_loads_of_views_are_not_rounded(beam):
+    columnar = ColumnarBeam.from_beam(beam)
+    columnar.point_loads[1] = (2.5, -7.123456)
+
+    load = columnar.get_nodes()[1].point_load
+    assert (load.horizontal_force, load.vertical_force) == (2.5, -7.123456)
+
+    copy = ColumnarBeam()
+    for node in columnar.get_nodes():
+        copy.add_node(node)
+    assert copy.point_loads.tolist() == columnar.point_loads.tolist()
+
+
+def test_solving_columns_matches_solving_objects(beam):
+    expected = DirectStiffnessSolver(beam).solve()
+    result = DirectStiffnessSolver(ColumnarBeam.from_beam(beam)).solve()
+
+    assert result.displacements == pytest.approx(expected.displacements)
+    assert result.reactions == pytest.approx(expected.reactions)
+    assert result.member_forces == pytest.approx(expected.member_forces)
+    assert result.reaction(Node(9, 0)) == pytest.approx(expected.reaction(Node(9, 0)))
+    assert isinstance(result.nodes[0], NodeView)
+
+
+def test_appending_rows_one_at_a_time(beam):
+    columnar = ColumnarBeam()
+    for node in beam.nodes:
+        columnar.add_node(node)
+    columnar.add_node(Node(3, 0))
+    for member in beam.get_members():
+        columnar.add_member(member.start, member.end, distributed_load=member.distributed_load)
+    columnar.add_member(Node(3, 0), Node(12, 0))
+
+    assert columnar.node_count == 4
+    assert columnar.member_count == 3
+
+    expected = DirectStiffnessSolver(beam).solve()
+    result = DirectStiffnessSolver(columnar).solve()
+    assert result.reactions == pytest.approx(expected.reactions)
+
+
+def test_nodes_and_members_use_slots():
+    assert not hasattr(Node(0, 0), "__dict__")
+    assert not hasattr(Member(Node(0, 0), Node(1, 0)), "__dict__")
+
+
+def test_duplicate_coordinates_are_rejected():
+    with pytest.raises(ValueError):
+        ColumnarBeam.from_arrays([0, 1, 1])
+    with pytest.raises(ValueError):
+        ColumnarBeam.from_arrays([0, 1, 2], member_nodes=[[0, 3]])
+
+
+def test_large_models_are_compact():
+    # timings of models this size are in the columnar_analysis benchmark case
+    n = 200_000
+    restraints = np.zeros((n, 3), dtype=bool)
+    restraints[::10, 1] = True
+    restraints[0, 0] = True
+
+    columnar = ColumnarBeam.from_arrays(np.arange(n, dtype=float), restraints=restraints)
+    columnar.distributed_loads[:] = -1
+    result = DirectStiffnessSolver(columnar).solve()
+
+    assert columnar.nbytes / n < 120
+    assert result.reactions[:, 1].sum() == pytest.approx(n - 1)
@@ -0,0 +1,87 @@
+import numpy as np
+import pytest
+
+from structural_analysis import FixedSupport, HingeSupport, PointLoad, RollerSupport
+from structural_analysis import UniformlyDistributedLoad
+from structural_analysis.beam import Beam, Node
+from structural_analysis.beam_errors import GeometricallyUnstableExternally
+from structural_analysis.bending_shear import BendingShearCalculator
+from structural_analysis.deflection import elastic_curve
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.piecewise import PiecewisePolynomial
+from structural_analysis.query import SolvedBeam
+
+
+EI = 2e4
+
+
+def test_simply_supported_udl():
+    # 4 m span under 10 kN/m: 5wL^4 / 384EI at midspan, wL^3 / 24EI at the ends
+    moment = PiecewisePolynomial([0, 4], [[-5], [20], [0]])
+    curve = elastic_curve(moment, EI, [0, 4])
+
+    assert curve.deflection(2) == pytest.approx(-5 * 10 * 4 ** 4 / (384 * EI))
+    assert curve.slope(0) == pytest.approx(-10 * 4 ** 3 / (24 * EI))
+    assert curve.maximum_deflection() == pytest.approx((2, -5 * 10 * 4 ** 4 / (384 * EI)))
+    assert curve.within(4 / 360)
+    assert not curve.within(1e-6)
+
+
+def test_cantilever_from_the_calculator(make_beam):
+    # 3 m cantilever with 12 kN at the tip: PL^3 / 3EI and PL^2 / 2EI
+    beam = make_beam(
+        (0, FixedSupport(vertical_force=12.0, horizontal_force=0, moment=-36.0), None, None, None),
+        (3, None, PointLoad(-12), None, None),
+    )
+    curve = BendingShearCalculator(beam).elastic_curve(EI)
+
+    assert curve.deflection(3) == pytest.approx(-12 * 27 / (3 * EI))
+    assert curve.slope(3) == pytest.approx(-12 * 9 / (2 * EI))
+    assert curve.maximum_deflection()[0] == pytest.approx(3)
+
+
+def test_calculator_beam_with_an_overhang(make_beam):
+    # supports at 0 and 4, 10 kN at the tip of a 2 m overhang
+    beam = make_beam(
+        (0, HingeSupport(vertical_force=-5.0, horizontal_force=0), None, None, None),
+        (4, RollerSupport(force=15.0), None, None, None),
+        (6, None, PointLoad(-10), None, None),
+    )
+    solved = SolvedBeam.from_calculator(BendingShearCalculator(beam), flexural_rigidity=EI)
+
+    # tip deflection P a^2 (L + a) / 3EI
+    assert solved.deflection_at(6.0) == pytest.approx(-10 * 4 * 6 / (3 * EI))
+    assert solved.deflection_at(np.array([0.0, 4.0])) == pytest.approx([0, 0], abs=1e-12)
+
+
+def test_deflections_match_stiffness_displacements():
+    nodes = [
+        Node(0, 0, rx=True, ry=True),
+        Node(3, 0, point_load=PointLoad(-20)),
+        Node(5, 0, ry=True),
+        Node(9, 0, ry=True, rm=True),
+    ]
+    beam = Beam()
+    beam.add_nodes(nodes)
+    # 200 GPa in kN/m^2
+    beam.add_member(
+        nodes[0], nodes[1], distributed_load=UniformlyDistributedLoad(-4, 2),
+        modulus_of_elasticity=2e8,
+    )
+    beam.add_member(nodes[1], nodes[2], modulus_of_elasticity=2e8, moment_of_inertia=2e-4)
+    beam.add_member(
+        nodes[2], nodes[3], distributed_load=UniformlyDistributedLoad(-6, 4),
+        modulus_of_elasticity=2e8,
+    )
+
+    solver = DirectStiffnessSolver(beam)
+    result = solver.solve()
+    solved = SolvedBeam.from_stiffness(solver, result)
+
+    assert solved.deflection_at(solver.x) == pytest.approx(result.displacements[:, 1], abs=1e-9)
+    assert solved.slope_at(solver.x) == pytest.approx(result.displacements[:, 2], abs=1e-9)
+
+
+def test_unrestrained_curve():
+    with pytest.raises(GeometricallyUnstableExternally):
+        elastic_curve(PiecewisePolynomial([0, 4], [[1]]), EI, [2])
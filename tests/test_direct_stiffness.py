@@ -0,0 +1,213 @@
+import numpy as np
+import pytest
+
+from structural_analysis import (
+    GeometricallyUnstableExternally,
+    LoadCase,
+    LoadCombination,
+    PointLoad,
+    PointMoment,
+    TrapezoidalLoad,
+    TriangularLoad,
+    UniformlyDistributedLoad,
+)
+from structural_analysis.beam import Beam, Node
+from structural_analysis.direct_stiffness.solver import (
+    DirectStiffnessSolver,
+    equivalent_nodal_loads,
+)
+
+
+def make_beam(nodes, udls=None):
+    """Connects consecutive nodes with members, udls are keyed by member index"""
+    udls = udls or {}
+    beam = Beam()
+    for node in nodes:
+        beam.add_node(node)
+    for idx, (start, end) in enumerate(zip(nodes, nodes[1:])):
+        beam.add_member(start, end, distributed_load=udls.get(idx))
+    return beam
+
+
+def test_simply_supported_beam_with_udl():
+    a, b = Node(0, 0, rx=True, ry=True), Node(6, 0, ry=True)
+    result = DirectStiffnessSolver(
+        make_beam([a, b], {0: UniformlyDistributedLoad(-10, 6)})
+    ).solve()
+
+    assert result.reaction(a) == pytest.approx([0, 30, 0])
+    assert result.reaction(b) == pytest.approx([0, 30, 0])
+
+
+def test_cantilever_matches_fixed_end_solver_convention():
+    a = Node(0, 0, rx=True, ry=True, rm=True)
+    b = Node(4, 0, point_load=PointLoad(-10), point_moment=PointMoment(5))
+    beam = make_beam([a, b])
+    member = beam.get_members()[0]
+    result = DirectStiffnessSolver(beam).solve()
+
+    # moment = load.vertical_force * arm - point moment, as in _fixed_end_solver
+    assert result.reaction(a) == pytest.approx([0, 10, -45])
+
+    ei = member.modulus_of_elasticity * member.moment_of_inertia
+    expected_deflection = -10 * 4 ** 3 / (3 * ei) - 5 * 4 ** 2 / (2 * ei)
+    assert result.displacement(b)[1] == pytest.approx(expected_deflection)
+
+
+def test_fixed_fixed_beam_with_udl():
+    a = Node(0, 0, rx=True, ry=True, rm=True)
+    b = Node(6, 0, rx=True, ry=True, rm=True)
+    result = DirectStiffnessSolver(
+        make_beam([a, b], {0: UniformlyDistributedLoad(-10, 6)})
+    ).solve()
+
+    assert result.reaction(a) == pytest.approx([0, 30, -30])
+    assert result.reaction(b) == pytest.approx([0, 30, 30])
+
+
+def test_fixed_fixed_beam_with_triangular_load():
+    # peak 10 kN/m at b: fixed end moments wL^2/30 and wL^2/20, reactions 3wL/20 and 7wL/20
+    a = Node(0, 0, rx=True, ry=True, rm=True)
+    b = Node(6, 0, rx=True, ry=True, rm=True)
+    result = DirectStiffnessSolver(make_beam([a, b], {0: TriangularLoad(-10, 6)})).solve()
+
+    assert result.reaction(a) == pytest.approx([0, 9, -12])
+    assert result.reaction(b) == pytest.approx([0, 21, 18])
+
+
+def test_trapezoidal_load_in_a_load_case_matches_the_member_load():
+    nodes = [Node(0, 0, rx=True, ry=True), Node(4, 0, ry=True), Node(9, 0, ry=True)]
+    loaded = DirectStiffnessSolver(make_beam(nodes, {1: TrapezoidalLoad(-2, -8, 5)})).solve()
+
+    solver = DirectStiffnessSolver(make_beam(nodes))
+    case = LoadCase("tapered")
+    case.add_distributed_load(solver.members[1], TrapezoidalLoad(-2, -8, 5))
+
+    assert solver.solve(case).reactions == pytest.approx(loaded.reactions)
+    assert loaded.reactions[:, 1].sum() == pytest.approx(25)
+
+
+def test_two_span_continuous_beam():
+    w, l = 10, 5
+    nodes = [Node(0, 0, rx=True, ry=True), Node(l, 0, ry=True), Node(2 * l, 0, ry=True)]
+    result = DirectStiffnessSolver(
+        make_beam(nodes, {0: UniformlyDistributedLoad(-w, l), 1: UniformlyDistributedLoad(-w, l)})
+    ).solve()
+
+    assert result.reactions[:, 1] == pytest.approx([3 / 8 * w * l, 10 / 8 * w * l, 3 / 8 * w * l])
+    # hogging moment of wl^2/8 over the middle support
+    assert result.member_forces[0, 5] == pytest.approx(w * l ** 2 / 8)
+
+
+def test_partial_udl_equivalent_loads_match_point_loads():
+    length = np.array([6.0])
+    partial = equivalent_nodal_loads(
+        length, np.zeros(1), np.array([-10.0]), np.array([1.0]), np.array([3.0])
+    )
+    # many small point loads over the loaded part
+    a = np.linspace(1, 3, 20001)
+    p = np.full_like(a, -10 * 2 / 20000)
+    p[[0, -1]] /= 2
+    b = 6 - a
+    assert partial[0, 1] == pytest.approx((p * b ** 2 * (3 * a + b) / 216).sum())
+    assert partial[0, 2] == pytest.approx((p * a * b ** 2 / 36).sum())
+    assert partial[0, 5] == pytest.approx((-p * a ** 2 * b / 36).sum())
+
+
+def test_unrestrained_beam_is_unstable():
+    with pytest.raises(GeometricallyUnstableExternally):
+        DirectStiffnessSolver(make_beam([Node(0, 0, ry=True), Node(4, 0, ry=True)])).solve()
+
+
+def test_long_beam():
+    n = 20000
+    nodes = [Node(float(i), 0, rx=i == 0, ry=i % 10 == 0) for i in range(n + 1)]
+    udls = {i: UniformlyDistributedLoad(-1.0, 1) for i in range(n)}
+    result = DirectStiffnessSolver(make_beam(nodes, udls)).solve()
+
+    assert result.reactions[:, 1].sum() == pytest.approx(n)
+    assert np.abs(result.displacements[::10, 1]).max() == pytest.approx(0, abs=1e-9)
+
+
+@pytest.fixture
+def continuous_beam():
+    nodes = [
+        Node(0, 0, rx=True, ry=True),
+        Node(3, 0),
+        Node(5, 0, ry=True),
+        Node(9, 0, ry=True, rm=True),
+    ]
+    return nodes, make_beam(nodes)
+
+
+@pytest.fixture
+def load_cases(continuous_beam):
+    nodes, beam = continuous_beam
+    members = beam.get_members()
+
+    dead = LoadCase("dead")
+    for member in members:
+        dead.add_distributed_load(member, UniformlyDistributedLoad(-4.0, member.length))
+
+    live = LoadCase("live")
+    live.add_point_load(nodes[1], PointLoad(-20))
+    live.add_point_moment(nodes[1], PointMoment(8))
+    live.add_distributed_load(members[2], UniformlyDistributedLoad(-6.0, 2))
+
+    return dead, live
+
+
+def test_load_cases_match_individual_solves(continuous_beam, load_cases):
+    _, beam = continuous_beam
+    solver = DirectStiffnessSolver(beam)
+    results = solver.solve_load_cases(load_cases)
+
+    for load_case in load_cases:
+        expected = DirectStiffnessSolver(beam).solve(load_case)
+        assert results[load_case.name].reactions == pytest.approx(expected.reactions)
+        assert results[load_case.name].displacements == pytest.approx(expected.displacements)
+        assert results[load_case.name].member_forces == pytest.approx(expected.member_forces)
+
+
+def test_stiffness_matrix_is_factorized_once(continuous_beam, load_cases):
+    _, beam = continuous_beam
+    solver = DirectStiffnessSolver(beam)
+    factor = solver.factorize()
+
+    solver.solve_load_cases(load_cases)
+    solver.solve(load_cases[0])
+
+    assert solver.factorize() is factor
+
+
+def test_combinations_are_superposed(continuous_beam, load_cases):
+    nodes, beam = continuous_beam
+    members = beam.get_members()
+    results = DirectStiffnessSolver(beam).solve_load_cases(load_cases)
+
+    combinations = results.combine(
+        [
+            LoadCombination("uls", {"dead": 1.35, "live": 1.5}),
+            LoadCombination("sls", {"dead": 1.0, "live": 1.0}),
+        ]
+    )
+    assert combinations.names == ("uls", "sls")
+
+    factored = LoadCase("uls")
+    for member in members:
+        factored.add_distributed_load(member, UniformlyDistributedLoad(-4.0 * 1.35, member.length))
+    factored.add_point_load(nodes[1], PointLoad(-20 * 1.5))
+    factored.add_point_moment(nodes[1], PointMoment(8 * 1.5))
+    factored.add_distributed_load(members[2], UniformlyDistributedLoad(-6.0 * 1.5, 2))
+
+    expected = DirectStiffnessSolver(beam).solve(factored)
+    assert combinations["uls"].reactions == pytest.approx(expected.reactions)
+    assert combinations["uls"].member_forces == pytest.approx(expected.member_forces)
+
+
+def test_combination_of_unknown_load_case(continuous_beam, load_cases):
+    _, beam = continuous_beam
+    results = DirectStiffnessSolver(beam).solve_load_cases(load_cases)
+
+    with pytest.raises(ValueError):
+        results.combine([LoadCombination("wind", {"wind": 1.5})])
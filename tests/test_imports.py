@@ -0,0 +1,44 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import structural_analysis
+
+
+def loaded_modules(statement: str) -> set:
+    """Modules loaded by a statement in a fresh interpreter, importing this checkout"""
+    source = os.path.dirname(os.path.dirname(structural_analysis.__file__))
+    environment = {
+        **os.environ,
+        "PYTHONPATH": os.pathsep.join(filter(None, [source, os.environ.get("PYTHONPATH")])),
+    }
+    output = subprocess.run(
+        [sys.executable, "-c", f"{statement}; import sys; print(' '.join(sys.modules))"],
+        check=True, capture_output=True, text=True, env=environment,
+    ).stdout
+    return set(output.split())
+
+
+def test_importing_the_package_loads_no_dependencies():
+    modules = loaded_modules("import structural_analysis")
+
+    assert not {"numpy", "attrs", "sympy", "structural_analysis.load"} & modules
+
+
+def test_only_the_exact_engine_needs_sympy():
+    assert "sympy" not in loaded_modules("import structural_analysis.bending_shear")
+    assert "sympy" not in loaded_modules("import structural_analysis.statically_determinate.solver")
+    assert "sympy" not in loaded_modules("from structural_analysis import Beam, PointLoad")
+
+
+def test_lazy_names_resolve_to_the_module_objects():
+    from structural_analysis.load import PointLoad
+
+    assert structural_analysis.PointLoad is PointLoad
+    assert "HingeSupport" in dir(structural_analysis)
+    assert set(structural_analysis.__all__) <= set(dir(structural_analysis))
+
+    with pytest.raises(AttributeError):
+        structural_analysis.NotAName
@@ -0,0 +1,107 @@
+import numpy as np
+import pytest
+
+from structural_analysis import PointLoad, influence_line
+from structural_analysis.beam import Beam, Node
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.influence_line import DeterminateInfluenceLines, InfluenceLines
+
+X = [float(x) for x in range(11)]
+
+
+def make_beam(restraints, load_at=None):
+    """Beam with a node every metre from 0 to 10, restraints are keyed by x"""
+    beam = Beam()
+    nodes = [
+        Node(x, 0, *restraints.get(x, (False, False, False)),
+             point_load=PointLoad(-1) if x == load_at else None)
+        for x in X
+    ]
+    for node in nodes:
+        beam.add_node(node)
+    for start, end in zip(nodes, nodes[1:]):
+        beam.add_member(start, end)
+    return beam, nodes
+
+
+@pytest.fixture
+def positions():
+    return np.linspace(0, 10, 41)
+
+
+def test_simply_supported_beam_with_overhangs_matches_closed_form(positions):
+    beam, nodes = make_beam({1.0: (True, True, False), 8.0: (False, True, False)})
+    lines = InfluenceLines(DirectStiffnessSolver(beam))
+    closed_form = DeterminateInfluenceLines((1, 8))
+
+    assert lines.reaction(nodes[1], positions) == pytest.approx(closed_form.reaction(0, positions))
+    assert lines.reaction(nodes[8], positions) == pytest.approx(closed_form.reaction(1, positions))
+    for x in (0.5, 4.3, 9.5):
+        assert lines.moment(x, positions) == pytest.approx(closed_form.moment(x, positions), abs=1e-9)
+        assert lines.shear(x, positions) == pytest.approx(closed_form.shear(x, positions), abs=1e-9)
+
+
+def test_cantilever_matches_closed_form(positions):
+    beam, nodes = make_beam({0.0: (True, True, True)})
+    lines = InfluenceLines(DirectStiffnessSolver(beam))
+    closed_form = DeterminateInfluenceLines((0,))
+
+    assert lines.reaction(nodes[0], positions, "moment") == pytest.approx(
+        closed_form.reaction(0, positions, "moment")
+    )
+    assert lines.moment(4.3, positions) == pytest.approx(closed_form.moment(4.3, positions), abs=1e-9)
+    assert lines.shear(4.3, positions) == pytest.approx(closed_form.shear(4.3, positions), abs=1e-9)
+
+
+def test_continuous_beam_matches_resolving_with_unit_loads():
+    restraints = {0.0: (True, True, False), 4.0: (False, True, False), 10.0: (True, True, True)}
+    beam, nodes = make_beam(restraints)
+    lines = InfluenceLines(DirectStiffnessSolver(beam))
+
+    reactions = lines.reactions([nodes[0], nodes[4], nodes[10]], X)
+    fixed_end_moment = lines.reaction(nodes[10], X, "moment")
+    moment = lines.moment(6.5, X)
+
+    for k, x in enumerate(X):
+        loaded_beam, loaded_nodes = make_beam(restraints, load_at=x)
+        result = DirectStiffnessSolver(loaded_beam).solve()
+
+        for row, idx in enumerate((0, 4, 10)):
+            assert reactions[row, k] == pytest.approx(result.reaction(loaded_nodes[idx])[1], abs=1e-9)
+        assert fixed_end_moment[k] == pytest.approx(result.reaction(loaded_nodes[10])[2], abs=1e-9)
+
+        # moment at 6.5 from the end forces at the start of the member from 6 to 7
+        v1, m1 = result.member_forces[6, 1], result.member_forces[6, 2]
+        expected = m1 + v1 * 0.5
+        assert moment[k] == pytest.approx(expected, abs=1e-9)
+
+
+def test_responses_are_solved_once(monkeypatch, positions):
+    beam, nodes = make_beam({0.0: (True, True, False), 10.0: (False, True, False)})
+    lines = InfluenceLines(DirectStiffnessSolver(beam))
+
+    calls = []
+    solve = influence_line.cho_solve_banded
+    monkeypatch.setattr(
+        influence_line, "cho_solve_banded", lambda *args: calls.append(args) or solve(*args)
+    )
+
+    first = lines.moments([2.5, 5.0], positions)
+    second = lines.moments([5.0, 2.5], positions[::8])
+    lines.moment(2.5, positions)
+
+    assert len(calls) == 1
+    assert second[0] == pytest.approx(first[1][::8])
+    assert second[1] == pytest.approx(first[0][::8])
+    # L/4 under a unit load at midspan of a simply supported beam
+    assert lines.moment(5.0, [5.0])[0] == pytest.approx(2.5)
+
+
+def test_invalid_requests(positions):
+    beam, nodes = make_beam({0.0: (True, True, False), 10.0: (False, True, False)})
+    lines = InfluenceLines(DirectStiffnessSolver(beam))
+
+    with pytest.raises(ValueError):
+        lines.moment(5, [12.0])
+    with pytest.raises(ValueError):
+        lines.reaction(nodes[5], positions)
@@ -0,0 +1,72 @@
+import numpy as np
+import pytest
+
+from structural_analysis import PointLoad, PointMoment, UniformlyDistributedLoad
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+
+
+def test_bulk_point_loads_match_single_loads():
+    magnitudes = [-10, 5.5, 12.25, -3]
+    angles = [90.0, 30.0, 45.0, 180.0]
+    table = PointLoad.from_arrays(magnitudes, angles, x=[0, 1, 2, 3])
+
+    for idx, (magnitude, angle) in enumerate(zip(magnitudes, angles)):
+        load = PointLoad(magnitude, angle)
+        assert table.horizontal_force[idx] == pytest.approx(load.horizontal_force)
+        assert table.vertical_force[idx] == pytest.approx(load.vertical_force)
+        assert table[idx].vertical_force == pytest.approx(load.vertical_force)
+
+    assert table[2].x == 2
+    assert len(table[1:3]) == 2
+    assert [load.magnitude for load in table] == magnitudes
+
+
+def test_bulk_moments_and_distributed_loads():
+    moments = PointMoment.from_arrays([10, -5], x=2)
+    udls = UniformlyDistributedLoad.from_arrays([-4, -6], [3, 2], start=[0, 5])
+
+    assert moments[1].magnitude == -5 and moments[1].x == 2
+    assert udls[1].start == 5 and udls[1].length == 2
+    assert udls.total_force_of_udl().tolist() == [-12, -12]
+
+
+def test_bulk_validation_is_vectorized():
+    with pytest.raises(TypeError):
+        PointLoad.from_arrays(["a", "b"])
+    with pytest.raises(ValueError):
+        PointLoad.from_arrays([1, 2], x=[1, -1])
+    with pytest.raises(ValueError):
+        UniformlyDistributedLoad.from_arrays([1, 2], [1, -2])
+    # NaN fails the ge(0) validator of a single load too
+    with pytest.raises(ValueError):
+        UniformlyDistributedLoad.from_arrays([1, 2], [1, np.nan])
+    with pytest.raises(ValueError):
+        PointLoad.from_arrays([1, 2], x=[np.nan, 1])
+    with pytest.raises(TypeError):
+        PointMoment.from_arrays([1 + 2j])
+
+
+def test_tables_load_a_columnar_beam():
+    n = 11
+    restraints = np.zeros((n, 3), dtype=bool)
+    restraints[[0, -1], 1] = True
+    restraints[0, 0] = True
+    beam = ColumnarBeam.from_arrays(np.arange(n, dtype=float), restraints=restraints)
+
+    beam.set_point_loads([5], PointLoad.from_arrays([-20]))
+    beam.set_point_moments([2], PointMoment.from_arrays([10]))
+    beam.set_distributed_loads(np.arange(n - 1), UniformlyDistributedLoad.from_arrays(-1, np.ones(n - 1)))
+
+    reactions = DirectStiffnessSolver(beam).solve().reactions
+    assert reactions[[0, -1], 1].sum() == pytest.approx(30)
+    # the clockwise couple adds 10 / 10 to the right hand reaction
+    assert reactions[-1, 1] == pytest.approx(10 + 5 + 1)
+
+
+def test_bulk_construction_of_a_million_loads():
+    # the time it takes is in the bulk_point_loads benchmark case
+    magnitudes = np.linspace(-100, 100, 1_000_000)
+    table = PointLoad.from_arrays(magnitudes, 60.0, x=np.arange(len(magnitudes), dtype=float))
+
+    assert len(table) == 1_000_000
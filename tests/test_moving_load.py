@@ -0,0 +1,96 @@
+import numpy as np
+import pytest
+
+from structural_analysis import PointLoad
+from structural_analysis.beam import Beam, Node
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.influence_line import DeterminateInfluenceLines, InfluenceLines
+from structural_analysis.moving_load import VehicleTrain, moving_load_envelope
+
+
+def brute_force(lines, train, stations, quantity, step):
+    """Places the vehicle directly on the influence lines at every lead axle position"""
+    start, end = lines.extent
+    sections = lines.moments if quantity == "moment" else lines.shears
+    leads = np.arange(start - train.length, end + train.length + step / 2, step)
+
+    responses = []
+    for direction in (1, -1):
+        for lead in leads:
+            axles = lead - direction * train.offsets
+            on_beam = (axles >= start) & (axles <= end)
+            ordinates = sections(stations, axles[on_beam]) if on_beam.any() else np.zeros((len(stations), 0))
+            responses.append(ordinates @ train.loads[on_beam])
+
+    responses = np.array(responses)
+    return responses.max(axis=0), responses.min(axis=0)
+
+
+@pytest.fixture
+def truck():
+    return VehicleTrain([PointLoad(-40), PointLoad(-100), PointLoad(-60)], [1.5, 2.5], name="truck")
+
+
+def test_two_axles_at_midspan_of_a_simple_span():
+    train = VehicleTrain([PointLoad(-10), PointLoad(-10)], [2])
+    envelope = moving_load_envelope(DeterminateInfluenceLines((0, 10)), train, [5], step=0.5)
+
+    assert envelope.maximum[0] == pytest.approx(40)
+    assert envelope.minimum[0] == pytest.approx(0)
+    assert envelope.maximum_position[0] in (pytest.approx(5), pytest.approx(7))
+
+
+@pytest.mark.parametrize("quantity", ["moment", "shear"])
+def test_determinate_envelope_matches_brute_force(truck, quantity):
+    lines = DeterminateInfluenceLines((2, 10), extent=(0, 12))
+    stations = np.linspace(0, 12, 25)
+    envelope = moving_load_envelope(lines, truck, stations, quantity=quantity, step=0.25)
+
+    maximum, minimum = brute_force(lines, truck, stations, quantity, step=0.25)
+
+    assert envelope.maximum == pytest.approx(maximum, abs=1e-9)
+    assert envelope.minimum == pytest.approx(minimum, abs=1e-9)
+
+
+def test_critical_positions_reproduce_the_extremes(truck):
+    lines = DeterminateInfluenceLines((0, 10))
+    stations = np.linspace(0.5, 9.5, 10)
+    envelope = moving_load_envelope(lines, truck, stations, step=0.5)
+
+    for idx, x in enumerate(stations):
+        axles = envelope.maximum_position[idx] - envelope.maximum_direction[idx] * truck.offsets
+        on_beam = (axles >= 0) & (axles <= 10)
+        response = lines.moment(x, axles[on_beam]) @ truck.loads[on_beam]
+        assert response == pytest.approx(envelope.maximum[idx])
+
+
+def test_continuous_beam_envelope_with_many_vehicles(truck):
+    beam = Beam()
+    nodes = [Node(float(x), 0, ry=x in (0, 8, 16), rx=x == 0) for x in range(17)]
+    for node in nodes:
+        beam.add_node(node)
+    for start, end in zip(nodes, nodes[1:]):
+        beam.add_member(start, end)
+
+    lines = InfluenceLines(DirectStiffnessSolver(beam))
+    tandem = VehicleTrain([PointLoad(-80), PointLoad(-80)], [1.2], name="tandem")
+    stations = np.linspace(0, 16, 17)
+
+    envelope = moving_load_envelope(lines, [truck, tandem], stations, step=0.1)
+    truck_max, truck_min = brute_force(lines, truck, stations, "moment", step=0.1)
+    tandem_max, tandem_min = brute_force(lines, tandem, stations, "moment", step=0.1)
+
+    assert envelope.maximum == pytest.approx(np.maximum(truck_max, tandem_max), abs=1e-6)
+    assert envelope.minimum == pytest.approx(np.minimum(truck_min, tandem_min), abs=1e-6)
+    assert np.all(envelope.maximum_vehicle == np.where(tandem_max > truck_max + 1e-6, 1, 0))
+
+    # hogging governs over the middle support
+    assert envelope.minimum[8] < 0
+    assert envelope.maximum[4] > 0
+
+
+def test_spacings_must_match_axles():
+    with pytest.raises(ValueError):
+        VehicleTrain([PointLoad(-10), PointLoad(-10)], [])
+    with pytest.raises(ValueError):
+        VehicleTrain([PointLoad(-10), PointLoad(-10)], [-1])
@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+
+from structural_analysis.bending_shear import BendingShearCalculator
+from structural_analysis.piecewise import PiecewisePolynomial, shift
+
+
+@pytest.fixture
+def moment():
+    # 4 m simply supported span under 10 kN/m, split at midspan
+    return PiecewisePolynomial([0, 2, 4], [[-5, -5], [20, 0], [0, 20]])
+
+
+def test_evaluation(moment):
+    x = np.array([0, 1, 2, 3, 4])
+    expected = 20 * x - 5 * x ** 2
+
+    assert moment(x) == pytest.approx(expected)
+    assert moment(3) == pytest.approx(15)
+    assert moment.segment([0, 2, 4]).tolist() == [0, 1, 1]
+    with pytest.raises(ValueError):
+        moment(4.5)
+
+
+def test_shift():
+    # x^2 about x = 1 is t^2 + 2t + 1
+    assert shift(np.array([[1.0], [0.0], [0.0]]), 1).ravel().tolist() == [1, 2, 1]
+
+
+def test_derivative_and_integral(moment):
+    shear = moment.derivative()
+    assert shear(np.array([0, 2, 4])) == pytest.approx([20, 0, -20])
+    assert moment.derivative(3)(1) == 0
+
+    # the area of the moment diagram is wL^3 / 12
+    assert moment.definite_integral() == pytest.approx(10 * 4 ** 3 / 12)
+
+    area = moment.integral(constant=1)
+    assert area(0) == pytest.approx(1)
+    assert area(2) == pytest.approx(1 + 20 * 2 - 5 * 8 / 3)
+    assert area.derivative()(np.linspace(0, 4, 9)) == pytest.approx(moment(np.linspace(0, 4, 9)))
+
+
+def test_superposition_over_different_breakpoints(moment):
+    # a 20 kN load at 1 m on the same span
+    point_load = PiecewisePolynomial([0, 1, 4], [[15, -5], [0, 15]])
+    total = 1.5 * moment + point_load
+
+    x = np.linspace(0, 4, 17)
+    assert total(x) == pytest.approx(1.5 * moment(x) + point_load(x))
+    assert total.breakpoints.tolist() == [0, 1, 2, 4]
+    assert (moment - moment)(x) == pytest.approx(np.zeros_like(x))
+
+    with pytest.raises(ValueError):
+        moment + PiecewisePolynomial([0, 5], [[1]])
+
+
+def test_slices_are_views(moment):
+    second = moment[1:]
+    assert second.breakpoints.tolist() == [2, 4]
+    assert np.shares_memory(second.coefficients, moment.coefficients)
+    assert second(3) == moment(3)
+
+    assert len(moment.between(0.5, 1.5)) == 1
+    assert len(moment.between(0.5, 2.5)) == 2
+
+
+def test_calculator_results_as_a_piecewise_polynomial(random_beam):
+    calculator = BendingShearCalculator(random_beam(30))
+    bending = calculator.calculate_bending()
+    moment = calculator.bending_moment()
+
+    assert len(moment) == len(bending)
+    assert moment(np.array([result.lower_bound for result in bending])) == pytest.approx(
+        [result.lower_bound_val for result in bending], abs=0.01
+    )
+    assert calculator.shear_force()(1.0) == pytest.approx(moment.derivative()(1.0))
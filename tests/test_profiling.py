@@ -0,0 +1,120 @@
+import json
+import tracemalloc
+
+import numpy as np
+import pytest
+
+from structural_analysis.bending_shear import BendingShearCalculator
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.profiling import _NULL_STAGE, Profiler, profiled, profiler, stage
+
+
+@pytest.fixture(autouse=True)
+def clean_profiler():
+    profiler.disable()
+    profiler.reset()
+    yield
+    profiler.disable()
+    profiler.reset()
+
+
+def continuous_beam(n=50):
+    restraints = np.zeros((n, 3), dtype=bool)
+    restraints[::5, 1] = True
+    restraints[0, 0] = True
+    beam = ColumnarBeam.from_arrays(np.arange(n, dtype=float), restraints=restraints)
+    beam.distributed_loads[:] = -1
+    return beam
+
+
+def test_nothing_is_recorded_while_disabled():
+    DirectStiffnessSolver(continuous_beam()).solve()
+
+    assert profiler.aggregate == {}
+
+
+def test_a_recording_reports_every_stiffness_stage():
+    with profiler.record() as report:
+        DirectStiffnessSolver(continuous_beam()).solve()
+
+    assert set(report) == {
+        "stiffness.setup",
+        "stiffness.load_vectors",
+        "stiffness.assemble",
+        "stiffness.factorize",
+        "stiffness.analyse",
+    }
+    assert all(stats.calls == 1 and stats.seconds > 0 for stats in report.values())
+    assert not profiler.enabled
+    assert "stiffness.factorize" in str(report)
+
+
+def test_exact_bending_stages_count_every_segment(random_beam):
+    # 13 nodes, 12 segments
+    beam = random_beam(12)
+
+    with profiler.record() as report:
+        calculator = BendingShearCalculator(beam, exact=True)
+        calculator.calculate_bending()
+        calculator.calculate_shear()
+
+    assert report["bending_shear.sympify"].calls == 12
+    assert report["bending_shear.derivative"].calls == 12
+    assert report["bending_shear.evaluate"].calls == 2
+
+
+def test_reports_are_per_recording_and_aggregates_accumulate():
+    for _ in range(3):
+        with profiler.record() as report:
+            DirectStiffnessSolver(continuous_beam()).solve()
+
+    assert report["stiffness.setup"].calls == 1
+    assert profiler.aggregate["stiffness.setup"].calls == 3
+    assert sum(profiler.aggregate["stiffness.setup"].histogram) == 3
+
+
+def test_memory_is_recorded_on_request():
+    with profiler.record(memory=True) as report:
+        DirectStiffnessSolver(continuous_beam(2_000)).solve()
+
+    assert report["stiffness.analyse"].allocated_bytes > 0
+
+
+def test_memory_recording_inside_an_enabled_profiler_stops_tracing():
+    profiler.enable()
+    with profiler.record(memory=True):
+        assert tracemalloc.is_tracing()
+
+    assert profiler.enabled and not profiler.memory
+    assert not tracemalloc.is_tracing()
+
+
+def test_dump_and_prometheus_exposition(tmp_path):
+    local = Profiler()
+    local.enable()
+    with local.stage("solve"):
+        pass
+    local.disable()
+
+    path = tmp_path / "stages.json"
+    assert json.loads(local.dump(str(path)))["solve"]["calls"] == 1
+    assert json.loads(path.read_text())["solve"]["calls"] == 1
+
+    exposition = local.prometheus()
+    assert 'structural_analysis_stage_seconds_count{stage="solve"} 1' in exposition
+    assert 'structural_analysis_stage_seconds_bucket{stage="solve",le="+Inf"} 1' in exposition
+
+
+def test_disabled_hooks_are_no_ops():
+    @profiled("noop")
+    def noop():
+        pass
+
+    # the disabled hooks hand out one shared object instead of timing anything
+    assert stage("noop") is _NULL_STAGE
+    assert Profiler().stage("noop") is _NULL_STAGE
+    with stage("noop"):
+        noop()
+
+    assert profiler.aggregate == {}
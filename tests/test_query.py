@@ -0,0 +1,108 @@
+import time
+
+import numpy as np
+import pytest
+
+from structural_analysis import PointLoad, TrapezoidalLoad, UniformlyDistributedLoad
+from structural_analysis.beam import Beam, Node
+from structural_analysis.bending_shear import BendingShearCalculator, NotSolvedError
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.query import SolvedBeam
+
+
+def simply_supported(udl_start=0.0, udl_length=8.0):
+    """8 m span, 20 kN at 2 m and a 5 kN/m udl"""
+    nodes = [Node(0, 0, rx=True, ry=True), Node(2, 0, point_load=PointLoad(-20)), Node(8, 0, ry=True)]
+    beam = Beam()
+    beam.add_nodes(nodes)
+    beam.add_member(nodes[0], nodes[1])
+    beam.add_member(
+        nodes[1], nodes[2], distributed_load=UniformlyDistributedLoad(-5, udl_length)
+    )
+    # the udl is placed relative to the start of its member
+    beam.get_members()[1].distributed_load.start = 2 + udl_start
+    return beam
+
+
+def test_queries_of_a_stiffness_result_match_statics():
+    solver = DirectStiffnessSolver(simply_supported(udl_start=1, udl_length=3))
+    solved = SolvedBeam.from_stiffness(solver, solver.solve())
+
+    # udl of 15 kN centred at 4.5 m, reactions by statics
+    rxn_b = (20 * 2 + 15 * 4.5) / 8
+    rxn_a = 35 - rxn_b
+
+    x = np.array([0, 1, 2, 3, 4, 5, 6, 8])
+    expected = rxn_a * x - 20 * np.clip(x - 2, 0, None) - 5 * (
+        np.clip(x - 3, 0, 3) ** 2 / 2 + 3 * np.clip(x - 6, 0, None)
+    )
+
+    assert solved.moment_at(x) == pytest.approx(expected, abs=1e-6)
+    assert solved.moment_at(4.0) == pytest.approx(expected[4], abs=1e-6)
+    assert solved.shear_at(0.5) == pytest.approx(rxn_a)
+    assert solved.shear_at(7.5) == pytest.approx(-rxn_b)
+    assert len(solved.breakpoints) == 5
+
+
+def test_queries_of_a_calculator_match_its_results(random_beam):
+    calculator = BendingShearCalculator(random_beam(30))
+    bending = calculator.calculate_bending()
+    solved = SolvedBeam.from_calculator(calculator)
+
+    lower = np.array([result.lower_bound for result in bending])
+    assert solved.moment_at(lower) == pytest.approx(
+        [result.lower_bound_val for result in bending], abs=0.01
+    )
+    assert solved.moment_at(bending[-1].upper_bound) == pytest.approx(
+        bending[-1].upper_bound_val, abs=0.01
+    )
+    # the scalar path and the vectorized path agree
+    x = np.linspace(0, bending[-1].upper_bound, 101)
+    assert solved.shear_at(x) == pytest.approx([solved.shear_at(float(val)) for val in x])
+
+
+def test_out_of_range_and_missing_quantities():
+    solved = SolvedBeam([0, 1, 3], [[0, 0], [1, -1], [0, 1]], [[1, -1], [0, 0]])
+
+    assert solved.moment_at(3) == pytest.approx(-1)
+    assert solved.segment([0, 1, 2.9, 3]).tolist() == [0, 1, 1, 1]
+    with pytest.raises(ValueError):
+        solved.moment_at(3.5)
+    with pytest.raises(ValueError):
+        solved.moment_at(np.array([-1.0, 1.0]))
+    with pytest.raises(NotSolvedError):
+        solved.deflection_at(1)
+    with pytest.raises(ValueError):
+        SolvedBeam([0, 1, 1], [[0, 0]], [[0, 0]])
+
+
+def test_a_million_queries_are_vectorized(random_beam):
+    calculator = BendingShearCalculator(random_beam(1000))
+    calculator.calculate_bending()
+    solved = SolvedBeam.from_calculator(calculator)
+    x = np.random.default_rng(0).uniform(0, solved.breakpoints[-1], 1_000_000)
+
+    start = time.perf_counter()
+    moments = solved.moment_at(x)
+    elapsed = time.perf_counter() - start
+
+    assert moments.shape == x.shape
+    assert elapsed < 2
+
+
+def test_queries_of_a_triangular_load():
+    # a triangle rising to 12 kN/m over a 6 m span, given as one piece per member
+    nodes = [Node(0, 0, rx=True, ry=True), Node(3, 0), Node(6, 0, ry=True)]
+    beam = Beam()
+    beam.add_nodes(nodes)
+    beam.add_member(nodes[0], nodes[1], distributed_load=TrapezoidalLoad(0.0, -6, 3))
+    beam.add_member(nodes[1], nodes[2], distributed_load=TrapezoidalLoad(-6, -12, 3))
+
+    solver = DirectStiffnessSolver(beam)
+    solved = SolvedBeam.from_stiffness(solver, solver.solve())
+
+    x = np.linspace(0, 6, 13)
+    assert solved.moment_at(x) == pytest.approx(12 * x - x ** 3 / 3, abs=1e-6)
+    assert solved.shear_at(x) == pytest.approx(12 - x ** 2, abs=1e-6)
+    assert isinstance(ColumnarBeam.from_beam(beam).get_members()[1].distributed_load, TrapezoidalLoad)
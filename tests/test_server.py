@@ -0,0 +1,179 @@
+import asyncio
+import json
+
+import pytest
+
+from structural_analysis.server import AnalysisServer, Overloaded, parse_beam
+
+SIMPLY_SUPPORTED = {
+    "supports": [0, 6],
+    "point_loads": [{"force": -12, "x": 2}],
+    "distributed_loads": [{"magnitude": 0, "end_magnitude": -12, "start": 0, "length": 6}],
+}
+CANTILEVER = {
+    "supports": [0],
+    "point_loads": [{"force": -10, "x": 4, "horizontal": 3}],
+    "point_moments": [{"magnitude": 5}],
+}
+
+
+async def request(address, method: str, path: str, document=None) -> tuple:
+    """Sends one HTTP request over a TCP address or a Unix socket path"""
+    if isinstance(address, str):
+        reader, writer = await asyncio.open_unix_connection(address)
+    else:
+        reader, writer = await asyncio.open_connection(*address)
+
+    body = b"" if document is None else json.dumps(document).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nContent-Length: {len(body)}\r\nConnection: close\r\n\r\n"
+        .encode() + body
+    )
+    status = int((await reader.readline()).split()[1])
+    response = (await reader.read()).split(b"\r\n\r\n", 1)[1]
+    writer.close()
+
+    return status, json.loads(response)
+
+
+def test_parse_beam_rejects_invalid_documents():
+    assert parse_beam(CANTILEVER)[0] == "fixed"
+    for document in (
+            [], {"supports": []}, {"supports": [0, 0]}, {"supports": ["a"]},
+            {"supports": [0, 4], "point_loads": [{"force": -1}]},
+            {"supports": [0, float("inf")]},
+            {"supports": [0, 4], "point_loads": [{"force": float("nan"), "x": 1}]},
+            {"supports": [0, 4], "distributed_loads": [
+                {"magnitude": -1, "start": 4, "length": -2}
+            ]},
+            {"supports": [0, 4], "distributed_loads": [{"magnitude": -1, "start": 0, "length": 0}]},
+    ):
+        with pytest.raises(ValueError):
+            parse_beam(document)
+
+
+def test_requests_are_batched_into_the_vectorized_solver():
+    async def run():
+        async with AnalysisServer(processes=0, max_delay=0.05) as server:
+            await server.start()
+            results = await asyncio.gather(
+                *(server.solve(SIMPLY_SUPPORTED) for _ in range(20)), server.solve(CANTILEVER)
+            )
+            return results, server.metrics()
+
+    results, metrics = asyncio.run(run())
+
+    # a triangle rising to 12 kN/m at the roller puts 12 and 24 kN on the supports
+    hinge, roller = results[0]["reactions"]
+    assert (hinge["vertical"], roller["vertical"]) == pytest.approx((12 + 8, 24 + 4))
+
+    (fixed,) = results[-1]["reactions"]
+    assert (fixed["horizontal"], fixed["vertical"], fixed["moment"]) == pytest.approx(
+        (-3, 10, -40 - 5)
+    )
+
+    assert metrics["solved"] == 21
+    assert metrics["batches"] == 2
+    assert metrics["stages"]["server.latency"]["calls"] == 21
+
+
+def test_http_over_tcp_with_worker_processes():
+    async def run():
+        async with AnalysisServer(processes=1) as server:
+            address = await server.start()
+            solved = await request(address, "POST", "/solve", {"beams": [SIMPLY_SUPPORTED] * 3})
+            invalid = await request(address, "POST", "/solve", {"supports": []})
+            # json.dumps writes a NaN literal, which the server must not solve
+            not_finite = await request(
+                address, "POST", "/solve", {"supports": [0, 6], "point_moments": [
+                    {"magnitude": float("nan")}
+                ]}
+            )
+            missing = await request(address, "GET", "/nowhere")
+            metrics = await request(address, "GET", "/metrics")
+            return solved, invalid, not_finite, missing, metrics
+
+    solved, invalid, not_finite, missing, metrics = asyncio.run(run())
+
+    assert solved[0] == 200
+    assert len(solved[1]["results"]) == 3
+    assert solved[1]["results"][2]["reactions"][1]["vertical"] == pytest.approx(28)
+    assert invalid[0] == 400
+    assert not_finite[0] == 400
+    assert missing[0] == 404
+    assert metrics[1]["requests"] == 3
+    assert metrics[1]["invalid"] == 2
+
+
+def test_unix_socket_and_backpressure(tmp_path):
+    async def run():
+        async with AnalysisServer(processes=0, max_pending=2, max_delay=0.05) as server:
+            path = await server.start(path=str(tmp_path / "analysis.sock"))
+            health = await request(path, "GET", "/health")
+
+            # the batcher takes the first beam, two more fill the queue
+            first = asyncio.ensure_future(server.solve(CANTILEVER))
+            await asyncio.sleep(0)
+            queued = [asyncio.ensure_future(server.solve(CANTILEVER)) for _ in range(2)]
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded):
+                await server.solve(CANTILEVER)
+
+            await asyncio.gather(first, *queued)
+            return health, server.metrics()
+
+    health, metrics = asyncio.run(run())
+
+    assert health == (200, {"status": "ok"})
+    assert metrics["rejected"] == 1
+    assert metrics["solved"] == 3
+
+
+def test_invalid_content_length():
+    async def run():
+        async with AnalysisServer(processes=0) as server:
+            address = await server.start()
+            responses = []
+            for length in ("abc", "-5", "1_0"):
+                reader, writer = await asyncio.open_connection(*address)
+                writer.write(
+                    f"POST /solve HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode()
+                )
+                responses.append((await reader.read()).split(b"\r\n", 1)[0])
+                writer.close()
+            return responses
+
+    assert asyncio.run(run()) == [b"HTTP/1.1 400 Bad Request"] * 3
+
+
+def test_a_list_of_beams_is_queued_all_or_nothing():
+    async def run():
+        async with AnalysisServer(processes=0, max_pending=3, max_delay=0.05) as server:
+            address = await server.start()
+            invalid = await request(
+                address, "POST", "/solve", {"beams": [CANTILEVER, {"supports": []}, CANTILEVER]}
+            )
+            pending_after_invalid = server.metrics()["pending"]
+
+            # the batcher takes the first beam and one more waits, leaving room for two
+            first = asyncio.ensure_future(server.solve(CANTILEVER))
+            await asyncio.sleep(0)
+            waiting = asyncio.ensure_future(server.solve(CANTILEVER))
+            await asyncio.sleep(0)
+            with pytest.raises(Overloaded):
+                await server.solve_many([CANTILEVER] * 3)
+            pending_after_overload = server.metrics()["pending"]
+
+            too_many = await request(address, "POST", "/solve", {"beams": [CANTILEVER] * 4})
+            await asyncio.gather(first, waiting)
+            pending = (pending_after_invalid, pending_after_overload)
+            return invalid, pending, too_many, server.metrics()
+
+    invalid, pending, too_many, metrics = asyncio.run(run())
+
+    assert invalid[0] == 400
+    assert invalid[1]["error"].startswith("beam 1: supports")
+    assert pending == (0, 1)
+    assert too_many[0] == 400
+    assert metrics["beams"] == metrics["solved"] == 2
+    assert metrics["rejected"] == 1
@@ -0,0 +1,101 @@
+import functools
+
+import numpy as np
+import pytest
+
+from structural_analysis import UniformlyDistributedLoad
+from structural_analysis.beam import Beam, Node
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.shared import SharedModel, attached
+from structural_analysis.sweep import sweep
+
+
+def continuous_beam() -> ColumnarBeam:
+    restraints = np.zeros((31, 3), dtype=bool)
+    restraints[::10, 1] = True
+    restraints[0, 0] = True
+
+    beam = ColumnarBeam.from_arrays(np.arange(31, dtype=float), restraints=restraints)
+    beam.distributed_loads[:] = -10
+    return beam
+
+
+def midspan_moment(scale, *, model):
+    """Scalar sweep function reading the beam and a result array from shared memory"""
+    shared = attached(model)
+    result = DirectStiffnessSolver(shared.beam).solve()
+
+    return {"moment": scale * result.member_forces[5, 2], "offset": shared.results["offset"][0]}
+
+
+def test_model_round_trips_without_copying():
+    beam = continuous_beam()
+
+    with SharedModel.publish(beam, {"offset": np.arange(4.0)}) as model:
+        other = SharedModel.attach(model.name)
+        for name in (*beam._nodes, *beam._members):
+            assert np.array_equal(getattr(other.beam, name), getattr(beam, name))
+            assert getattr(other.beam, name).dtype == getattr(beam, name).dtype
+            assert not getattr(other.beam, name).flags.owndata
+        assert other.results["offset"].tolist() == [0, 1, 2, 3]
+
+        with pytest.raises(ValueError):
+            other.beam.x[0] = 1
+
+        expected = DirectStiffnessSolver(beam).solve()
+        actual = DirectStiffnessSolver(other.beam).solve()
+        assert actual.member_forces == pytest.approx(expected.member_forces)
+
+        # the result keeps the shared beam alive
+        with pytest.raises(BufferError):
+            other.close()
+        del actual
+        other.close()
+
+    with pytest.raises(FileNotFoundError):
+        SharedModel.attach(model.name)
+
+
+def test_closing_while_views_are_alive_raises():
+    with pytest.raises(BufferError):
+        with SharedModel.publish(continuous_beam()) as model:
+            x = model.beam.x
+
+    # the block stays mapped as long as the view needs it
+    assert x.sum() == sum(range(31))
+
+    del x
+    model.close()
+    with pytest.raises(FileNotFoundError):
+        SharedModel.attach(model.name)
+
+
+def test_beam_graphs_are_published_as_columns():
+    nodes = [Node(0, 0, rx=True, ry=True), Node(4, 0, ry=True), Node(8, 0, ry=True)]
+    beam = Beam()
+    for node in nodes:
+        beam.add_node(node)
+    beam.add_member(nodes[0], nodes[1], distributed_load=UniformlyDistributedLoad(-10, 4))
+    beam.add_member(nodes[1], nodes[2])
+
+    with SharedModel.publish(beam) as model:
+        assert model.beam.node_count == 3
+        assert model.beam.distributed_loads.tolist() == [-10, 0]
+
+
+def test_pool_workers_attach_by_name():
+    beam = continuous_beam()
+    expected = DirectStiffnessSolver(beam).solve().member_forces[5, 2]
+
+    with SharedModel.publish(beam, {"offset": np.array([7.0])}) as model:
+        result = sweep(
+            functools.partial(midspan_moment, model=model.name),
+            {"scale": [1.0, 2.0, 3.0]},
+            vectorized=False,
+            processes=2,
+            chunksize=1,
+        )
+
+    assert result["moment"] == pytest.approx(expected * np.array([1, 2, 3]))
+    assert result["offset"].tolist() == [7, 7, 7]
@@ -0,0 +1,215 @@
+from types import SimpleNamespace
+
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from structural_analysis import (
+    FixedSupport,
+    HingeSupport,
+    PointLoad,
+    PointMoment,
+    RollerSupport,
+    TrapezoidalLoad,
+    TriangularLoad,
+    StaticallyIndeterminateExternally,
+    UniformlyDistributedLoad,
+)
+from structural_analysis.beam import Beam, Node
+from structural_analysis.columnar import ColumnarBeam
+from structural_analysis.statically_determinate.solver import (
+    StaticallyDeterminateSolver,
+    display_results,
+)
+
+
+def make_beam(supports, point_loads=(), distributed_loads=(), point_moments=()):
+    """Exposes loads and supports the way a Beam hands them to the solver"""
+    information = {
+        "supports": supports,
+        "point_loads": point_loads,
+        "distributed_loads": distributed_loads,
+        "point_moments": point_moments,
+    }
+    return SimpleNamespace(
+        is_geometrically_stable=lambda: True,
+        classify_beam=lambda: "determinate",
+        get_beam_information=lambda: information,
+    )
+
+
+def place(load, x):
+    if isinstance(load, (UniformlyDistributedLoad, TrapezoidalLoad)):
+        load.start = x
+    else:
+        load.x, load.y = x, 0
+    return load
+
+
+@pytest.fixture
+def batch():
+    rng = np.random.default_rng(1)
+    n_beams, n_loads = 25, 3
+    return {
+        "span": rng.uniform(4, 10, n_beams),
+        "point_loads": rng.integers(-50, 0, (n_beams, n_loads)).astype(float),
+        "point_loads_x": rng.uniform(0, 4, (n_beams, n_loads)).round(2),
+        "udls": rng.integers(-10, 0, (n_beams, 1)).astype(float),
+        "udls_start": rng.uniform(0, 2, (n_beams, 1)).round(2),
+        "udls_length": rng.uniform(0.5, 2, (n_beams, 1)).round(2),
+        "point_moments": rng.integers(-30, 30, (n_beams, 1)).astype(float),
+    }
+
+
+def beam_from_batch(batch, i, supports):
+    return make_beam(
+        supports,
+        point_loads=[
+            place(PointLoad(p), x)
+            for p, x in zip(batch["point_loads"][i], batch["point_loads_x"][i])
+        ],
+        distributed_loads=[
+            place(UniformlyDistributedLoad(w, l), s)
+            for w, s, l in zip(batch["udls"][i], batch["udls_start"][i], batch["udls_length"][i])
+        ],
+        point_moments=[place(PointMoment(m), 1) for m in batch["point_moments"][i]],
+    )
+
+
+def test_hinge_roller_batch_matches_solver(batch):
+    supports_x = np.stack([np.zeros_like(batch["span"]), batch["span"]], axis=1)
+    loads = {k: v for k, v in batch.items() if k != "span"}
+
+    rxn_a, rxn_b, horizontal = StaticallyDeterminateSolver.solve_batch(supports_x, **loads)
+
+    for i, span in enumerate(batch["span"]):
+        hinge = HingeSupport(x=0, y=0)
+        roller = RollerSupport(x=span, y=0)
+        result = StaticallyDeterminateSolver(beam_from_batch(batch, i, (hinge, roller))).solve()
+
+        assert rxn_a[i] == pytest.approx(result.reaction(hinge).vertical)
+        assert rxn_b[i] == pytest.approx(result.reaction(roller).vertical)
+        assert horizontal[i] == pytest.approx(result.reaction(hinge).horizontal)
+
+
+def test_fixed_end_batch_matches_solver(batch):
+    loads = {k: v for k, v in batch.items() if k != "span"}
+    supports_x = np.zeros(len(batch["span"]))
+
+    moment, vertical, horizontal = StaticallyDeterminateSolver.solve_batch(supports_x, **loads)
+
+    for i in range(len(supports_x)):
+        fixed = FixedSupport(x=0, y=0)
+        result = StaticallyDeterminateSolver(beam_from_batch(batch, i, (fixed,))).solve()
+        reaction = result.reaction(fixed)
+
+        assert moment[i] == pytest.approx(reaction.moment)
+        assert vertical[i] == pytest.approx(reaction.vertical)
+        assert horizontal[i] == pytest.approx(reaction.horizontal)
+
+
+def test_batch_without_some_load_types():
+    rxn_a, rxn_b, horizontal = StaticallyDeterminateSolver.solve_batch(
+        [[0, 4], [0, 8]], point_loads=[[-10], [-20]], point_loads_x=[[2], [2]]
+    )
+    assert rxn_a == pytest.approx([5, 15])
+    assert rxn_b == pytest.approx([5, 5])
+    assert horizontal == pytest.approx([0, 0])
+
+
+def test_triangular_and_trapezoidal_loads():
+    # 6 m span, triangle rising to 12 kN/m at the roller: 36 kN at 4 m from the hinge
+    hinge, roller = HingeSupport(x=0, y=0), RollerSupport(x=6, y=0)
+    result = StaticallyDeterminateSolver(
+        make_beam((hinge, roller), distributed_loads=[place(TriangularLoad(-12, 6), 0)])
+    ).solve()
+    assert [reaction.vertical for reaction in result.reactions] == pytest.approx([12, 24])
+
+    # cantilever with 2 -> 4 kN/m over 3 m: 9 kN at 5 / 3 m
+    fixed = FixedSupport(x=0, y=0)
+    reaction = StaticallyDeterminateSolver(
+        make_beam((fixed,), distributed_loads=[place(TrapezoidalLoad(-2, -4, 3), 0)])
+    ).solve().reaction(fixed)
+    assert reaction.vertical == pytest.approx(9)
+    assert reaction.moment == pytest.approx(-9 * 5 / 3)
+
+
+def test_batch_linearly_varying_loads_match_solver():
+    hinge, roller = HingeSupport(x=0, y=0), RollerSupport(x=8, y=0)
+    load = place(TrapezoidalLoad(-6, 2, 4), 3)
+    beam = make_beam((hinge, roller), distributed_loads=[load])
+    result = StaticallyDeterminateSolver(beam).solve()
+
+    rxn_a, rxn_b, _ = StaticallyDeterminateSolver.solve_batch(
+        [[0, 8]], udls=[[-6]], udls_end=[[2]], udls_start=[[3]], udls_length=[[4]]
+    )
+    assert rxn_a == pytest.approx([result.reaction(hinge).vertical])
+    assert rxn_b == pytest.approx([result.reaction(roller).vertical])
+
+
+def test_solving_leaves_the_supports_untouched():
+    hinge, roller = HingeSupport(x=0, y=0), RollerSupport(x=6, y=0)
+    beams = [
+        make_beam((hinge, roller), point_loads=[place(PointLoad(-6 * i), 2)]) for i in range(1, 9)
+    ]
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(pool.map(lambda beam: StaticallyDeterminateSolver(beam).solve(), beams))
+
+    assert (hinge.vertical_force, roller.force) == (None, None)
+    assert [result.reaction(hinge).vertical for result in results] == pytest.approx(
+        [4 * i for i in range(1, 9)]
+    )
+    with pytest.raises(KeyError):
+        results[0].reaction(HingeSupport(x=0, y=0))
+
+    results[2].apply()
+    assert (hinge.vertical_force, roller.force) == pytest.approx((12, 6))
+
+
+def test_a_beam_is_solved_from_its_restraints():
+    a, b, c = Node(0, 0, rx=True, ry=True), Node(2, 0, point_load=PointLoad(-12)), Node(6, 0)
+    c.ry = True
+    beam = Beam()
+    beam.add_nodes((a, b, c))
+    beam.add_member(a, b)
+    beam.add_member(b, c, distributed_load=UniformlyDistributedLoad(-5, 4))
+
+    # 12 kN at 2 m and 20 kN centred at 4 m of a 6 m span
+    expected = (8 + 20 / 3, 4 + 40 / 3)
+    for model in (beam, ColumnarBeam.from_beam(beam)):
+        hinge, roller = StaticallyDeterminateSolver(model).solve().reactions
+        assert (hinge.vertical, roller.vertical) == pytest.approx(expected)
+        assert hinge.horizontal == pytest.approx(0)
+
+    fixed, free = Node(0, 0, rx=True, ry=True, rm=True), Node(4, 0, point_moment=PointMoment(5))
+    cantilever = Beam()
+    cantilever.add_nodes((fixed, free))
+    cantilever.add_member(fixed, free, distributed_load=UniformlyDistributedLoad(-2, 4))
+
+    (reaction,) = StaticallyDeterminateSolver(cantilever).solve().reactions
+    assert (reaction.vertical, reaction.moment) == pytest.approx((8, -16 - 5))
+
+    beam.nodes[1].ry = True
+    with pytest.raises(StaticallyIndeterminateExternally):
+        StaticallyDeterminateSolver(beam)
+
+
+def test_display_results(capsys):
+    hinge, roller, fixed = HingeSupport(x=0, y=0), RollerSupport(x=6, y=0), FixedSupport(x=0, y=0)
+    point_loads = [place(PointLoad(-6), 2)]
+
+    display_results(StaticallyDeterminateSolver(make_beam((hinge, roller), point_loads)).solve())
+    display_results(
+        StaticallyDeterminateSolver(make_beam((fixed,), point_loads)).solve(), names=["F"]
+    )
+
+    assert capsys.readouterr().out.splitlines() == [
+        "Ay = 4.00 \u2191",
+        "Ax = 0.00 \u2192",
+        "By = 2.00 \u2191",
+        "Fm = 12.00 \u21BA",
+        "Fy = 6.00 \u2191",
+        "Fx = 0.00 \u2192",
+    ]
@@ -0,0 +1,61 @@
+import numpy as np
+import pytest
+
+from structural_analysis.sweep import hinge_roller_reactions, sweep
+
+
+def simply_supported(span, load):
+    """Scalar sweep function, a point load at midspan"""
+    return {"rxn_a": -load / 2, "moment": -load * span / 4}
+
+
+def test_grid_layout_and_values():
+    spans = np.array([4.0, 6.0, 8.0])
+    loads = -1 * np.arange(1, 5, dtype=float)
+
+    result = sweep(
+        hinge_roller_reactions,
+        {"support_b_x": spans, "point_load": loads, "point_load_x": 2.0},
+        processes=0,
+        chunksize=5,
+    )
+
+    assert result.shape == (3, 4, 1)
+    assert result["rxn_b"][:, :, 0] == pytest.approx(-loads * 2 / spans[:, None])
+    assert result["rxn_a"] + result["rxn_b"] == pytest.approx(-loads[None, :, None] * np.ones((3, 1, 1)))
+    assert result.point((1, 2, 0)) == {"support_b_x": 6.0, "point_load": -3.0, "point_load_x": 2.0}
+
+
+def test_process_pool_matches_in_process():
+    parameters = {
+        "support_b_x": np.linspace(4, 12, 50),
+        "udl": -1 * np.linspace(1, 10, 40),
+        "udl_length": 4.0,
+    }
+    progress = []
+
+    pooled = sweep(
+        hinge_roller_reactions, parameters, processes=2, chunksize=300,
+        progress=lambda done, total: progress.append((done, total)),
+    )
+    local = sweep(hinge_roller_reactions, parameters, processes=0)
+
+    assert pooled["rxn_a"] == pytest.approx(local["rxn_a"])
+    assert [total for _, total in progress] == [2000] * 7
+    assert progress[-1][0] == 2000
+
+
+def test_scalar_functions_are_called_per_point():
+    result = sweep(
+        simply_supported, {"span": [2.0, 4.0], "load": [-10.0]}, vectorized=False, processes=2,
+        chunksize=1,
+    )
+
+    assert result["moment"][:, 0] == pytest.approx([5, 10])
+
+
+def test_invalid_parameters():
+    with pytest.raises(ValueError):
+        sweep(hinge_roller_reactions, {"support_b_x": []})
+    with pytest.raises(ValueError):
+        sweep(hinge_roller_reactions, {"support_b_x": [[1, 2]]})
@@ -0,0 +1,229 @@
+import math
+
+import pytest
+
+from structural_analysis import Beam, PointLoad, TriangularLoad, UniformlyDistributedLoad
+from structural_analysis.beam import Node
+from structural_analysis.direct_stiffness.solver import DirectStiffnessSolver
+from structural_analysis.query import SolvedBeam
+from structural_analysis.statically_indeterminate.three_moment.solver import (
+    ThreeMomentSolver,
+    linear_load_terms,
+    point_load_terms,
+    point_moment_terms,
+    solve_three_moment_equations,
+    solve_tridiagonal,
+    udl_terms,
+)
+
+
+def test_solve_tridiagonal():
+    # 2x - y = 1, -x + 2y - z = 0, -y + 2z = 1  ->  x = y = z = 1
+    solution = solve_tridiagonal([0, -1, -1], [2, 2, 2], [-1, -1, 0], [1, 0, 1])
+    assert solution == pytest.approx([1, 1, 1])
+
+
+def test_solve_tridiagonal_rejects_mismatched_lengths():
+    with pytest.raises(ValueError):
+        solve_tridiagonal([0, 1], [1, 2, 3], [1, 0], [1, 2, 3])
+
+
+def test_point_load_terms_at_midspan():
+    p, l = 10, 4
+    left, right = point_load_terms(-p, l / 2, l / 2)
+    assert left == pytest.approx(3 * p * l ** 2 / 8)
+    assert right == pytest.approx(3 * p * l ** 2 / 8)
+
+
+def test_udl_terms_over_full_span():
+    w, l = 10, 6
+    left, right = udl_terms(-w, 0, l, l)
+    assert left == pytest.approx(w * l ** 3 / 4)
+    assert right == pytest.approx(w * l ** 3 / 4)
+
+
+def test_partial_udls_add_up_to_full_span():
+    w, l = 10, 6
+    first = udl_terms(-w, 0, 2.5, l)
+    second = udl_terms(-w, 2.5, l, l)
+    full = udl_terms(-w, 0, l, l)
+    assert first[0] + second[0] == pytest.approx(full[0])
+    assert first[1] + second[1] == pytest.approx(full[1])
+
+
+def test_point_moment_terms_at_midspan():
+    c, l = 12, 4
+    left, right = point_moment_terms(c, l / 2, l / 2)
+    assert left == pytest.approx(c * l / 4)
+    assert right == pytest.approx(-c * l / 4)
+
+
+@pytest.mark.parametrize(
+    "n, expected",
+    [
+        (2, [0, -1 / 8, 0]),
+        (3, [0, -1 / 10, -1 / 10, 0]),
+        (4, [0, -3 / 28, -2 / 28, -3 / 28, 0]),
+    ],
+)
+def test_equal_spans_with_udl(n, expected):
+    w, l = 10, 5
+    term = w * l ** 3 / 4
+    moments = solve_three_moment_equations([l] * n, [term] * n, [term] * n)
+    assert moments == pytest.approx([m * w * l ** 2 for m in expected])
+
+
+def test_fixed_ends():
+    w, l = 10, 5
+    term = w * l ** 3 / 4
+
+    fixed_fixed = solve_three_moment_equations(
+        [l], [term], [term], fixed_start=True, fixed_end=True
+    )
+    assert fixed_fixed == pytest.approx([-w * l ** 2 / 12] * 2)
+
+    propped = solve_three_moment_equations([l], [term], [term], fixed_start=True)
+    assert propped == pytest.approx([-w * l ** 2 / 8, 0])
+
+
+def test_overhang_moments_are_kept_at_the_ends():
+    moments = solve_three_moment_equations([4, 4], [0, 0], [0, 0], ma=-8, mc=-8)
+    assert moments[0] == -8
+    assert moments[-1] == -8
+    # 4 * -8 + 2 * 8 * mb + 4 * -8 = 0
+    assert moments[1] == pytest.approx(4)
+
+
+def test_many_spans_satisfy_every_equation():
+    n = 200
+    lengths = [3 + math.sin(i) for i in range(n)]
+    left_terms = [10 * l ** 3 / 4 + i for i, l in enumerate(lengths)]
+    right_terms = [10 * l ** 3 / 4 - i for i, l in enumerate(lengths)]
+
+    moments = solve_three_moment_equations(
+        lengths, left_terms, right_terms, ma=-5, fixed_end=True
+    )
+
+    assert len(moments) == n + 1
+    for i in range(1, n):
+        lhs = (
+            lengths[i - 1] * moments[i - 1]
+            + 2 * (lengths[i - 1] + lengths[i]) * moments[i]
+            + lengths[i] * moments[i + 1]
+        )
+        assert lhs == pytest.approx(-(left_terms[i - 1] + right_terms[i]))
+
+    lhs = lengths[-1] * moments[-2] + 2 * lengths[-1] * moments[-1]
+    assert lhs == pytest.approx(-left_terms[-1])
+
+
+def test_triangular_load_terms():
+    # peak w at the right support: 8wL^3/60 from the left and 7wL^3/60 from the right
+    w, l = 6, 5
+    assert linear_load_terms(0, -w, 0, l, l) == pytest.approx((8 * w * l ** 3 / 60, 7 * w * l ** 3 / 60))
+    assert linear_load_terms(-4, -4, 1, 3, l) == pytest.approx(udl_terms(-4, 1, 3, l))
+
+
+def test_linear_load_terms_match_many_udls():
+    l, n = 7, 2000
+    edges = [1 + 4 * i / n for i in range(n + 1)]
+
+    staircase = [0.0, 0.0]
+    for start, end in zip(edges, edges[1:]):
+        middle = (start + end) / 2
+        for idx, term in enumerate(udl_terms(-2 - (middle - 1), start, end, l)):
+            staircase[idx] += term
+
+    assert linear_load_terms(-2, -6, 1, 5, l) == pytest.approx(staircase, rel=1e-5)
+
+
+def continuous_beam(supports_x, loads_x=(), fixed_start=False, w=-10.0, overhang=0.0):
+    """Horizontal beam with a udl everywhere, point loads of -20 and an optional right overhang"""
+    nodes = {
+        x: Node(x, 0, rx=x == supports_x[0], ry=True, rm=fixed_start and x == supports_x[0])
+        for x in supports_x
+    }
+    for x in loads_x:
+        nodes[x] = Node(x, 0, point_load=PointLoad(-20))
+    if overhang:
+        end = supports_x[-1] + overhang
+        nodes[end] = Node(end, 0, point_load=PointLoad(-20))
+
+    ordered = [nodes[x] for x in sorted(nodes)]
+    beam = Beam()
+    for node in ordered:
+        beam.add_node(node)
+    for start, end in zip(ordered, ordered[1:]):
+        beam.add_member(start, end, distributed_load=UniformlyDistributedLoad(w, end.x - start.x))
+
+    return beam
+
+
+def test_three_equal_spans_with_udl():
+    w, l = 10, 5
+    result = ThreeMomentSolver(continuous_beam([0, l, 2 * l, 3 * l], w=-w)).solve()
+
+    assert result.support_moments == pytest.approx([0, -w * l ** 2 / 10, -w * l ** 2 / 10, 0])
+    assert len(result.spans) == 3
+    assert [node.x for node in result.spans[1].nodes] == [l, 2 * l]
+    assert result.spans[1].nodes[0].point_moment.magnitude == pytest.approx(-w * l ** 2 / 10)
+
+
+def test_propped_cantilever():
+    w, l = 10, 6
+    result = ThreeMomentSolver(continuous_beam([0, l], fixed_start=True, w=-w)).solve()
+
+    assert result.support_moments == pytest.approx([-w * l ** 2 / 8, 0])
+
+
+def test_loads_on_an_overhang():
+    w, l, a = 10, 4, 1.5
+    result = ThreeMomentSolver(continuous_beam([0, l, 2 * l], w=-w, overhang=a)).solve()
+
+    # the tip load and the udl on the overhang hog the beam over the last support
+    mc = -20 * a - w * a ** 2 / 2
+    assert result.support_moments == pytest.approx([0, -w * l ** 2 / 8 - mc / 4, mc])
+
+
+def test_triangular_load_on_an_overhang():
+    w, l, a = 9, 4, 3
+    nodes = [Node(0, 0, rx=True, ry=True), Node(l, 0, ry=True), Node(l + a, 0)]
+    beam = Beam()
+    for node in nodes:
+        beam.add_node(node)
+    beam.add_member(nodes[0], nodes[1])
+    beam.add_member(nodes[1], nodes[2], distributed_load=TriangularLoad(-w, a))
+
+    result = ThreeMomentSolver(beam).solve()
+
+    # the resultant w a / 2 acts 2a / 3 from the support
+    assert result.support_moments == pytest.approx([0, -w * a ** 2 / 3])
+
+
+@pytest.mark.parametrize("fixed_start, overhang", [(False, 0.0), (True, 0.0), (False, 1.5)])
+def test_support_moments_match_the_stiffness_method(fixed_start, overhang):
+    beam = continuous_beam(
+        [0, 4, 10, 13], loads_x=(1.5, 7, 12), fixed_start=fixed_start, overhang=overhang
+    )
+    result = ThreeMomentSolver(beam).solve()
+
+    solver = DirectStiffnessSolver(beam)
+    solved = SolvedBeam.from_stiffness(solver, solver.solve())
+    # just inside the spans, away from the jumps of the point moments of a fixed end
+    expected = [solved.moment_at(x) for x in (1e-9, 4, 10, 13 - 1e-9)]
+
+    assert result.support_moments == pytest.approx(expected, abs=1e-6)
+    assert (result.support_moments[0] != 0) == fixed_start
+    assert (result.support_moments[-1] != 0) == bool(overhang)
+
+
+def test_solving_leaves_the_beam_untouched():
+    beam = continuous_beam([0, 4, 8])
+    ThreeMomentSolver(beam).solve()
+
+    assert all(node.point_moment is None for node in beam.nodes)
+
+
+def test_a_single_support_is_rejected():
+    with pytest.raises(ValueError):
+        ThreeMomentSolver(continuous_beam([0], loads_x=(2,))).solve()